@@ -0,0 +1,99 @@
+"""Image loading with and without the packed asset bundle.
+
+Each mode runs in a fresh process: it loads the first period icon (what the
+first frame needs), then the other three and the window icon (what the
+deferred startup warms), and reports the time taken, the read() calls and
+bytes read from /proc/self/io, and the bytes decoded before scaling. Also
+compares what a frozen build has to ship. Linux only.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+SRC = os.path.join(ROOT, "src")
+
+CHILD = r"""
+import json, os, sys, time
+os.environ["QT_QPA_PLATFORM"] = "offscreen"
+sys.path.insert(0, sys.argv[1])
+use_bundle = sys.argv[2] == "bundle"
+from PyQt6.QtGui import QIcon
+from PyQt6.QtWidgets import QApplication
+import ModernShutdownScheduler as mss
+app = QApplication([])
+
+
+def io():
+    with open("/proc/self/io") as f:
+        fields = dict(line.split(": ") for line in f.read().splitlines())
+    return int(fields["syscr"]), int(fields["rchar"])
+
+
+def phase(fn):
+    reads, read_bytes = io()
+    start = time.perf_counter()
+    fn()
+    took = time.perf_counter() - start
+    after_reads, after_bytes = io()
+    # The /proc read itself counts as one call.
+    return {"ms": took * 1e3, "reads": after_reads - reads - 1, "read_bytes": after_bytes - read_bytes}
+
+
+state = {}
+
+
+def first():
+    state["bundle"] = mss.load_asset_bundle() if use_bundle else None
+    state["icons"] = mss.PeriodIconCache(bundle=state["bundle"])
+    state["icons"].pixmap("day", 1.0)
+
+
+def rest():
+    for period in ("morning", "evening", "night"):
+        state["icons"].pixmap(period, 1.0)
+    bundle = state["bundle"]
+    if bundle is None:
+        QIcon(mss.resource_path("assets/icons/icon.ico")).pixmap(32)
+    else:
+        icon = QIcon()
+        for size in bundle.sizes("app-icon"):
+            icon.addPixmap(mss.QPixmap.fromImage(mss.QImage.fromData(bundle.blob("app-icon", size).tobytes(), mss.ENTRY_FORMAT)))
+        icon.pixmap(32)
+
+
+result = {"first": phase(first), "rest": phase(rest), "decoded": state["icons"].decoded_source_bytes}
+print(json.dumps(result))
+"""
+
+
+def run(mode):
+    proc = subprocess.run([sys.executable, "-c", CHILD, SRC, mode], cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr)
+    return json.loads(proc.stdout.splitlines()[-1])
+
+
+def tree_size(path):
+    return sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(path) for f in files)
+
+
+def main(repeat=5):
+    from asset_bundle import BUNDLE_PATH, MANIFEST
+    print(f"{'':14} {'phase':14} {'time':>8} {'reads':>6} {'bytes read':>11} {'files':>6}")
+    for mode, files in (("loose files", (1, len(MANIFEST) - 1)), ("bundle", (1, 0))):
+        runs = [run("bundle" if mode == "bundle" else "files") for _ in range(repeat)]
+        for (key, label), count in zip((("first", "first icon"), ("rest", "other icons")), files):
+            best = min(runs, key=lambda r: r[key]["ms"])[key]
+            print(f"{mode:14} {label:14} {best['ms']:6.2f}ms {best['reads']:6d} {best['read_bytes']:11d} {count:6d}")
+        print(f"{mode:14} {'decoded':14} {runs[0]['decoded'] / 1024:6.0f} KB before scaling")
+    shipped = tree_size(os.path.join(ROOT, "assets"))
+    bundle = os.path.getsize(os.path.join(ROOT, BUNDLE_PATH))
+    print(f"frozen build data: assets/ {(shipped - bundle) / 1024:.0f} KB -> {BUNDLE_PATH} {bundle / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, SRC)
+    main()
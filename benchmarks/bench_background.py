@@ -0,0 +1,175 @@
+"""Per-frame cost of the time-of-day background, offscreen.
+
+Drags across a full day one minute per frame (60 fps) and times, per frame,
+the color update plus a synchronous repaint of the whole window for:
+
+  stylesheet  the old path: colored sheets on the central widget and two
+              labels (interned by LegacyStyles below), background drawn by
+              the stylesheet engine
+  instant     BackgroundWidget switching colors at once; "bg paint" below it
+              is the widget's own paint without the children on top
+  fading      BackgroundWidget fading, retargeted every frame as during a drag
+
+Then runs one complete fade and reports how many frames and gradients it
+cost.
+
+    python benchmarks/bench_background.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("XDG_STATE_HOME", tempfile.mkdtemp(prefix="mss-bench-"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from PyQt6.QtGui import QImage, QPainter  # noqa: E402
+from PyQt6.QtWidgets import QApplication, QStyle, QStyleOption, QWidget  # noqa: E402
+
+import ModernShutdownScheduler as mss  # noqa: E402
+from shutdown_backend import FakeShutdownBackend  # noqa: E402
+
+FRAME_MS = 16
+# The colored sheets update_background_color used to apply.
+LEGACY_CENTRAL = "background: {0}; border-radius: 32px; color: {1};"
+LEGACY_APP_NAME = "font-size: 24px; font-weight: bold; color: {0}; margin-bottom: 16px;"
+LEGACY_TIME_VALUE = "font-size: 18px; font-weight: 600; color: {0}; margin-bottom: 8px;"
+
+
+# The stylesheet interning the painted background replaced, kept as the
+# baseline: a sheet is formatted once per color and only applied when it
+# differs from the widget's current one.
+class LegacyStyles:
+    def __init__(self):
+        self._sheets = {}
+        self._applied = {}
+        self.applied_count = 0
+
+    def apply(self, widget, template, *colors):
+        key = (template, colors)
+        sheet = self._sheets.get(key)
+        if sheet is None:
+            sheet = self._sheets[key] = template.format(*colors)
+        if self._applied.get(id(widget)) is sheet:
+            return
+        widget.setStyleSheet(sheet)
+        self._applied[id(widget)] = sheet
+        self.applied_count += 1
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def start_app(app):
+    state_path = os.path.join(tempfile.mkdtemp(prefix="mss-bench-state-"), "state.dat")
+    window = mss.ShutdownApp(FakeShutdownBackend(), state_path=state_path)
+    window.show()
+    while not window.startup_complete:
+        app.processEvents()
+    app.processEvents()
+    return window
+
+
+def entries(window):
+    return [window.color_palette.entry(minute) for minute in range(mss.MINUTES_IN_DAY)]
+
+
+def run_stylesheet(window, day):
+    central = window.centralWidget()
+
+    def styled_paint(event):
+        option = QStyleOption()
+        option.initFrom(central)
+        painter = QPainter(central)
+        central.style().drawPrimitive(QStyle.PrimitiveElement.PE_Widget, option, painter, central)
+
+    central.paintEvent = styled_paint
+    styles = LegacyStyles()
+    times = []
+    for entry in day:
+        start = time.perf_counter()
+        styles.apply(central, LEGACY_CENTRAL, entry.bg_str, entry.text_str)
+        styles.apply(window.app_name_label, LEGACY_APP_NAME, entry.text_str)
+        styles.apply(window.time_value_label, LEGACY_TIME_VALUE, entry.text_str)
+        window.time_input.set_text_color(entry.text)
+        window.time_input.set_accent(entry.slider)
+        central.repaint()
+        times.append(time.perf_counter() - start)
+    return times, f"{styles.applied_count} sheets applied"
+
+
+def run_painted(window, day, animate):
+    background = window.background
+    built = background.brushes_built
+    times = []
+    for entry in day:
+        start = time.perf_counter()
+        background.set_theme(entry.bg, entry.text, entry.slider, animate)
+        if animate:
+            background._animation.setCurrentTime(FRAME_MS)
+        background.repaint()
+        times.append(time.perf_counter() - start)
+    return times, f"{background.brushes_built - built} gradients built"
+
+
+def background_only(window, day):
+    """The background's own paint, without the children on top of it."""
+    background = window.background
+    image = QImage(background.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    times = []
+    for entry in day:
+        background.set_theme(entry.bg, entry.text, entry.slider, animate=False)
+        start = time.perf_counter()
+        background.render(image, flags=QWidget.RenderFlag(0))
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def full_fade(app, window, day):
+    """Night to day in one step, left to play out on the real event loop."""
+    background = window.background
+    background.set_theme(day[0].bg, day[0].text, day[0].slider, animate=False)
+    app.processEvents()
+    paints, built = background.paint_count, background.brushes_built
+    noon = day[12 * 60]
+    start = time.perf_counter()
+    background.set_theme(noon.bg, noon.text, noon.slider)
+    while background.is_animating():
+        app.processEvents()
+        time.sleep(0.001)
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+    return background.paint_count - paints, background.brushes_built - built, elapsed
+
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"{'case':12} {'frames':>7} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for name in ("instant", "fading", "stylesheet"):
+        window = start_app(app)
+        day = entries(window)
+        if name == "stylesheet":
+            times, note = run_stylesheet(window, day)
+        else:
+            times, note = run_painted(window, day, animate=name == "fading")
+        times = sorted(t * 1000 for t in times)
+        print(f"{name:12} {len(times):7d} {percentile(times, 0.5):8.3f} {percentile(times, 0.95):8.3f} "
+              f"{times[-1]:8.3f}  {note}")
+        if name == "instant":
+            times = sorted(t * 1000 for t in background_only(window, day))
+            print(f"{'  bg paint':12} {len(times):7d} {percentile(times, 0.5):8.3f} "
+                  f"{percentile(times, 0.95):8.3f} {times[-1]:8.3f}")
+        if name == "fading":
+            paints, built, elapsed = full_fade(app, window, day)
+            print(f"one {mss.BACKGROUND_FADE_MS} ms fade: {paints} background paints, {built} gradients built "
+                  f"in {elapsed * 1000:.0f} ms")
+        window.close()
+        app.processEvents()
+
+
+if __name__ == "__main__":
+    main()
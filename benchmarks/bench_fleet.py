@@ -0,0 +1,74 @@
+"""Fleet throughput against host count.
+
+Starts stand-in agents (fleet_agent.py --stand-in) in a separate process on
+ephemeral ports, each answering after about 20 ms, then times a status run
+across growing slices of them: once with fresh connections and once more on
+the pooled connections, and once with one request in flight at a time to
+show what bounded concurrency buys. Linux or macOS.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SRC = os.path.join(ROOT, "src")
+sys.path.insert(0, SRC)
+
+from fleet import TOKEN_ENV_VAR, FleetController, read_hosts  # noqa: E402
+
+HOST_COUNTS = (10, 50, 100, 200, 500)
+LATENCY = 0.02
+TOKEN = "bench"
+
+
+async def timed_run(controller):
+    start = time.perf_counter()
+    results = await controller.status()
+    elapsed = time.perf_counter() - start
+    assert all(r.reachable for r in results), [r for r in results if not r.reachable][:3]
+    return elapsed
+
+
+async def measure(addresses):
+    pooled = FleetController(addresses, TOKEN)
+    cold = await timed_run(pooled)
+    warm = await timed_run(pooled)
+    connects = pooled.connect_count()
+    pooled.close()
+    serial = None
+    if len(addresses) <= 100:
+        controller = FleetController(addresses, TOKEN, concurrency=1)
+        serial = await timed_run(controller)
+        controller.close()
+    return cold, warm, connects, serial
+
+
+def main():
+    env = dict(os.environ, **{TOKEN_ENV_VAR: TOKEN})
+    with tempfile.TemporaryDirectory() as tmp:
+        hosts_file = os.path.join(tmp, "hosts.txt")
+        agent = subprocess.Popen(
+            [sys.executable, os.path.join(SRC, "fleet_agent.py"), "--stand-in", str(max(HOST_COUNTS)),
+             "--port", "0", "--latency", str(LATENCY), "--hosts-out", hosts_file],
+            env=env, stdout=subprocess.PIPE, text=True,
+        )
+        try:
+            agent.stdout.readline()
+            hosts = read_hosts(hosts_file)
+            print(f"stand-in latency {LATENCY * 1e3:.0f} ms, concurrency 64")
+            print(f"{'hosts':>6} {'cold':>9} {'pooled':>9} {'hosts/s':>9} {'connects':>9} {'one at a time':>14}")
+            for count in HOST_COUNTS:
+                cold, warm, connects, serial = asyncio.run(measure(hosts[:count]))
+                serial_text = f"{serial * 1e3:12.0f}ms" if serial is not None else f"{'-':>14}"
+                print(f"{count:6d} {cold * 1e3:7.0f}ms {warm * 1e3:7.0f}ms {count / warm:9.0f} {connects:9d} {serial_text}")
+        finally:
+            agent.terminate()
+            agent.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Overhead of the hot-path instrumentation (hot_paths.py).
+
+First times a no-op method plain and wrapped, which is the fixed cost the
+wrapper adds to every call. Then sweeps update_time_label over a day of
+slider values and drags the timeline in the real window three times:
+profiling off, on, and off again after restore(). "Off" must run the very
+same functions as a build without instrumentation.
+
+    python benchmarks/bench_hot_paths.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("XDG_STATE_HOME", tempfile.mkdtemp(prefix="mss-bench-"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+import ModernShutdownScheduler as mss  # noqa: E402
+from hot_paths import HotPathRecorder  # noqa: E402
+from shutdown_backend import FakeShutdownBackend  # noqa: E402
+
+CALLS = 1_000_000
+MINUTES = range(1, mss.MINUTES_IN_DAY + 1)
+REPEATS = 3
+
+
+class Target:
+    def noop(self):
+        pass
+
+
+def per_call_ns(fn, calls=CALLS):
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter_ns() - start) / calls
+
+
+def wrapper_overhead():
+    plain = min(per_call_ns(Target().noop) for _ in range(REPEATS))
+    recorder = HotPathRecorder()
+    recorder.instrument(Target, ("noop",))
+    wrapped = min(per_call_ns(Target().noop) for _ in range(REPEATS))
+    recorder.restore()
+    return plain, wrapped
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))]
+
+
+def run_window(app, recorder):
+    state_path = os.path.join(tempfile.mkdtemp(prefix="mss-bench-state-"), "state.dat")
+    window = mss.ShutdownApp(FakeShutdownBackend(), state_path=state_path, hot_paths=recorder)
+    window.show()
+    while not window.startup_complete:
+        app.processEvents()
+    window.time_input.blockSignals(True)
+    sweep = []
+    for value in MINUTES:
+        start = time.perf_counter()
+        window.time_input.setValue(value)
+        window.update_time_label(value)
+        sweep.append(time.perf_counter() - start)
+    window.time_input.blockSignals(False)
+    window.time_input.setValue(1)
+    app.processEvents()
+    start = time.perf_counter()
+    for value in MINUTES:
+        window.time_input.setValue(value)
+        app.processEvents()
+    drag = time.perf_counter() - start
+    window.close()
+    app.processEvents()
+    return sorted(t * 1e6 for t in sweep), drag * 1000
+
+
+def main():
+    plain, wrapped = wrapper_overhead()
+    print(f"no-op method: {plain:.0f} ns plain, {wrapped:.0f} ns wrapped (+{wrapped - plain:.0f} ns per call)")
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    original = mss.ShutdownApp.render
+    print(f"{'profiling':12} {'sweep p50':>10} {'sweep p95':>10} {'drag':>10}")
+    for name in ("off", "on", "off again"):
+        recorder = mss.enable_hot_path_profiling() if name == "on" else None
+        if recorder is None:
+            assert mss.ShutdownApp.render is original, "hot paths still wrapped"
+        sweep, drag = run_window(app, recorder)
+        print(f"{name:12} {percentile(sweep, 0.5):8.1f}us {percentile(sweep, 0.95):8.1f}us {drag:8.1f}ms")
+        if recorder is not None:
+            calls = sum(recorder.stats(f"{cls.__name__}.{method}").count
+                        for cls, methods in mss.HOT_PATHS for method in methods)
+            print(f"{'':12} {calls} timed calls recorded")
+            recorder.restore()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Cost of the idle detector.
+
+Replays a scripted working day on a virtual clock and compares how many
+samples adaptive sampling takes against fixed-interval polling and how late
+each notices the idle period. Then times real samples from /proc (Linux)
+and counts the memory blocks they leave behind.
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from idle_detector import IdleDetector, ProcMetricsSource, SyntheticMetricsSource  # noqa: E402
+
+IDLE_MINUTES = 30
+MB = 1024 * 1024
+# (seconds, cpu fraction, disk bytes/s, network bytes/s)
+WORKDAY = (
+    (3 * 3600, 0.85, 20 * MB, 2 * MB),   # heavy build
+    (1800, 0.15, 0, 0),                  # just above the CPU threshold
+    (600, 0.02, 0, 0),                   # short break, too short to count
+    (1200, 0.05, 8 * MB, 0),             # backup writing to disk
+    (2 * 3600, 0.60, 0, 5 * MB),         # download
+    (0, 0.03, 10 * 1024, 1024),          # idle from here on
+)
+IDLE_STARTS = sum(seconds for seconds, *_ in WORKDAY[:-1])
+
+
+def replay(min_interval, max_interval):
+    detector = IdleDetector(SyntheticMetricsSource(WORKDAY, start=0.0), IDLE_MINUTES * 60,
+                            min_interval=min_interval, max_interval=max_interval, clock=lambda: now)
+    now = 0.0
+    detector.sample(now)
+    while True:
+        now += detector.interval
+        if detector.sample(now):
+            return detector.sample_count, now - (IDLE_STARTS + IDLE_MINUTES * 60)
+
+
+def main():
+    print(f"simulated day: {IDLE_STARTS / 3600:.1f} h of activity, then idle; threshold {IDLE_MINUTES} min")
+    print(f"{'strategy':28} {'samples':>8} {'detected late by':>17}")
+    for name, low, high in (
+        ("fixed 1 s polling", 1.0, 1.0),
+        ("fixed 5 s polling", 5.0, 5.0),
+        ("adaptive 5 s .. 60 s", 5.0, 60.0),
+    ):
+        samples, late = replay(low, high)
+        print(f"{name:28} {samples:8d} {late:15.1f} s")
+
+    if not os.path.exists("/proc/stat"):
+        return
+    detector = IdleDetector(ProcMetricsSource(), IDLE_MINUTES * 60)
+    for _ in range(10):
+        detector.sample()
+    count = 2000
+    start = time.perf_counter()
+    for _ in range(count):
+        detector.sample()
+    per_sample = (time.perf_counter() - start) / count
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(count):
+        detector.sample()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    leaked = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+    print(f"/proc sample: {per_sample * 1e6:.1f} us, {leaked} blocks retained after {count} samples")
+    print(f"at one sample per 5 s that is {per_sample * 720 * 1e3:.2f} ms of CPU per hour")
+    detector.source.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Second launches against a running window.
+
+Starts one window (offscreen, fake backend) and times, in fresh processes,
+headless commands and a bare second launch while that window owns the
+instance socket, against the same commands with no window running. Also
+reports the in-process cost of one forwarded round trip. Linux only.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SRC = os.path.join(ROOT, "src")
+SCRIPT = os.path.join(SRC, "ModernShutdownScheduler.py")
+sys.path.insert(0, SRC)
+
+CASES = [
+    ("--status", ["--status"]),
+    ("schedule --in 90m", ["schedule", "--in", "90m"]),
+    ("--cancel", ["--cancel"]),
+]
+
+
+def timed_run(args, env, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, SCRIPT, *args], env=env, capture_output=True, text=True)
+        times.append(time.perf_counter() - start)
+        if proc.returncode not in (0, 1):
+            raise RuntimeError(f"{args!r} failed:\n{proc.stderr}")
+    return statistics.median(times)
+
+
+def wait_for(path, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while not os.path.exists(path):
+        if time.perf_counter() > deadline:
+            raise RuntimeError(f"{path} did not appear")
+        time.sleep(0.02)
+
+
+def main(repeat=5):
+    with tempfile.TemporaryDirectory() as state:
+        env = dict(os.environ, QT_QPA_PLATFORM="offscreen", XDG_STATE_HOME=state, SHUTDOWN_SCHEDULER_BACKEND="fake")
+        os.environ.update(env)
+        from single_instance import forward_command, instance_paths
+
+        alone = {name: timed_run(args, env, repeat) for name, args in CASES}
+        window = subprocess.Popen([sys.executable, SCRIPT], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_for(instance_paths("fake")[2])
+            forwarded = {name: timed_run(args, env, repeat) for name, args in CASES}
+            second_gui = timed_run([], env, repeat)
+            start = time.perf_counter()
+            for _ in range(100):
+                assert forward_command("fake", ["--status"]) is not None
+            round_trip = (time.perf_counter() - start) / 100
+            assert window.poll() is None, "the first window exited"
+        finally:
+            window.terminate()
+            window.wait()
+
+    print(f"{'case':22} {'no window':>10} {'forwarded':>10}")
+    for name, _ in CASES:
+        print(f"{name:22} {alone[name] * 1e3:8.1f}ms {forwarded[name] * 1e3:8.1f}ms")
+    print(f"{'second window launch':22} {'-':>10} {second_gui * 1e3:8.1f}ms")
+    print(f"forward round trip (in process): {round_trip * 1e3:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from palette import (  # noqa: E402
+    BLUE_COLOR, COLOR_TRANSITION_MINUTES, DAY_COLOR, EVENING_COLOR, MORNING_COLOR,
+    NIGHT_COLOR, ORANGE_COLOR, RED_COLOR, Palette, interpolate_color,
+)
+
+
+# The if/elif chains the palette table replaced, kept as the baseline.
+def legacy_smooth_colors(time_obj):
+    total_minutes = time_obj.hour * 60 + time_obj.minute
+    morning_start = 5 * 60
+    morning_end = 5 * 60 + COLOR_TRANSITION_MINUTES
+    day_start = 8 * 60
+    day_end = 8 * 60 + COLOR_TRANSITION_MINUTES
+    evening_start = 19 * 60
+    evening_end = 19 * 60 + COLOR_TRANSITION_MINUTES
+    night_start = 22 * 60
+    night_end = 22 * 60 + COLOR_TRANSITION_MINUTES
+    if total_minutes < morning_start:
+        return NIGHT_COLOR, (255, 255, 255)
+    elif total_minutes < morning_end:
+        progress = (total_minutes - morning_start) / COLOR_TRANSITION_MINUTES
+        return interpolate_color(NIGHT_COLOR, MORNING_COLOR, progress), interpolate_color((255, 255, 255), (50, 50, 50), progress)
+    elif total_minutes < day_start:
+        return MORNING_COLOR, (50, 50, 50)
+    elif total_minutes < day_end:
+        progress = (total_minutes - day_start) / COLOR_TRANSITION_MINUTES
+        return interpolate_color(MORNING_COLOR, DAY_COLOR, progress), (50, 50, 50)
+    elif total_minutes < evening_start:
+        return DAY_COLOR, (50, 50, 50)
+    elif total_minutes < evening_end:
+        progress = (total_minutes - evening_start) / COLOR_TRANSITION_MINUTES
+        return interpolate_color(DAY_COLOR, EVENING_COLOR, progress), interpolate_color((50, 50, 50), (255, 255, 255), progress)
+    elif total_minutes < night_start:
+        return EVENING_COLOR, (255, 255, 255)
+    elif total_minutes < night_end:
+        progress = (total_minutes - night_start) / COLOR_TRANSITION_MINUTES
+        return interpolate_color(EVENING_COLOR, NIGHT_COLOR, progress), (255, 255, 255)
+    return NIGHT_COLOR, (255, 255, 255)
+
+
+def legacy_slider_color(time_obj):
+    total_minutes = time_obj.hour * 60 + time_obj.minute
+    morning_start = 5 * 60; morning_end = 5 * 60 + COLOR_TRANSITION_MINUTES
+    day_start = 8 * 60; day_end = 8 * 60 + COLOR_TRANSITION_MINUTES
+    evening_start = 19 * 60; evening_end = 19 * 60 + COLOR_TRANSITION_MINUTES
+    night_start = 22 * 60; night_end = 22 * 60 + COLOR_TRANSITION_MINUTES
+    if total_minutes < morning_start:
+        return (100, 100, 200)
+    elif total_minutes < morning_end:
+        return interpolate_color((100, 100, 200), ORANGE_COLOR, (total_minutes - morning_start) / COLOR_TRANSITION_MINUTES)
+    elif total_minutes < day_start:
+        return ORANGE_COLOR
+    elif total_minutes < day_end:
+        return interpolate_color(ORANGE_COLOR, BLUE_COLOR, (total_minutes - day_start) / COLOR_TRANSITION_MINUTES)
+    elif total_minutes < evening_start:
+        return BLUE_COLOR
+    elif total_minutes < evening_end:
+        return interpolate_color(BLUE_COLOR, RED_COLOR, (total_minutes - evening_start) / COLOR_TRANSITION_MINUTES)
+    elif total_minutes < night_start:
+        return RED_COLOR
+    elif total_minutes < night_end:
+        return interpolate_color(RED_COLOR, (100, 100, 200), (total_minutes - night_start) / COLOR_TRANSITION_MINUTES)
+    return (100, 100, 200)
+
+
+def legacy_event(time_obj):
+    # update_time_label: get_smooth_colors twice plus the slider color.
+    legacy_smooth_colors(time_obj)
+    legacy_smooth_colors(time_obj)
+    legacy_slider_color(time_obj)
+
+
+def main():
+    palette = Palette()
+    midnight = datetime(2024, 1, 1)
+    times = [midnight + timedelta(minutes=m) for m in range(24 * 60)]
+
+    for t in times:
+        entry = palette.at(t)
+        assert (entry.bg, entry.text) == legacy_smooth_colors(t), t
+        assert entry.slider == legacy_slider_color(t), t
+
+    custom = Palette(background=[(m * 60, (m * 10, 0, 0), ((m + 1) * 10, 0, 0)) for m in range(24)])
+
+    cases = [
+        ("legacy if/elif chain", lambda: [legacy_event(t) for t in times]),
+        ("palette lookup", lambda: [palette.at(t) for t in times]),
+        ("palette lookup, 24 keyframes", lambda: [custom.at(t) for t in times]),
+    ]
+    repeat = 50
+    print(f"{'case':32} {'per sweep':>12} {'per event':>12}")
+    for name, fn in cases:
+        best = min(timeit.repeat(fn, number=1, repeat=repeat))
+        print(f"{name:32} {best * 1e3:10.3f}ms {best / len(times) * 1e9:10.0f}ns")
+    compile_time = min(timeit.repeat(Palette, number=1, repeat=5))
+    print(f"{'palette compile':32} {compile_time * 1e3:10.3f}ms")
+    print(f"distinct entries: {palette.distinct_entries()} of {len(palette)}")
+
+
+if __name__ == "__main__":
+    main()
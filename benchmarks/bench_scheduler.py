@@ -0,0 +1,57 @@
+"""Per-operation cost of SchedulerEngine as the queue grows.
+
+With a heap, add/cancel/pop should grow roughly with log n, so the per-op
+times below should stay almost flat from a thousand to a million jobs.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from scheduler_engine import ACTIONS, SYSTEM_ACTIONS, SchedulerEngine  # noqa: E402
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+
+def run(size, seed=1):
+    rng = random.Random(seed)
+    actions = list(ACTIONS)
+    base = time.time()
+    deadlines = [base + rng.uniform(0, 30 * 86400) for _ in range(size)]
+    engine = SchedulerEngine()
+
+    t0 = time.perf_counter()
+    jobs = [engine.add(actions[i % len(actions)], deadline) for i, deadline in enumerate(deadlines)]
+    add = time.perf_counter() - t0
+
+    victims = rng.sample(jobs, size // 2)
+    t0 = time.perf_counter()
+    for job in victims:
+        engine.cancel(job.id)
+        engine.peek()
+    cancel = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(1000):
+        engine.peek(SYSTEM_ACTIONS)
+    peek = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    popped = len(engine.pop_due(base + 31 * 86400))
+    pop = time.perf_counter() - t0
+    assert popped == size - len(victims) and len(engine) == 0
+    return add / size, cancel / len(victims), peek / 1000, pop / popped
+
+
+def main():
+    print(f"{'jobs':>10} {'add':>10} {'cancel+peek':>12} {'peek(system)':>13} {'pop due':>10}")
+    for size in SIZES:
+        add, cancel, peek, pop = run(size)
+        print(f"{size:>10} {add * 1e6:8.2f}us {cancel * 1e6:10.2f}us {peek * 1e6:11.2f}us {pop * 1e6:8.2f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Cold-start time and peak RSS of the headless commands versus the GUI.
+
+Each case runs in a fresh interpreter. Linux only (uses the resource module);
+the GUI case runs under QT_QPA_PLATFORM=offscreen with the fake backend.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SRC = os.path.join(ROOT, "src")
+SCRIPT = os.path.join(SRC, "ModernShutdownScheduler.py")
+
+# Runs the real script as __main__ and reports peak RSS (KiB) on exit.
+CHILD = r"""
+import atexit, resource, runpy, sys
+atexit.register(lambda: sys.stderr.write("MAXRSS %d\n" % resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+sys.argv = sys.argv[1:]
+runpy.run_path(sys.argv[0], run_name="__main__")
+"""
+
+# Builds the window, waits for the deferred startup work and quits.
+GUI_CHILD = r"""
+import atexit, resource, sys
+atexit.register(lambda: sys.stderr.write("MAXRSS %d\n" % resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+sys.path.insert(0, sys.argv[1])
+import ModernShutdownScheduler
+from PyQt6.QtWidgets import QApplication
+from shutdown_backend import create_backend
+profiler = ModernShutdownScheduler.StartupProfiler()
+app = QApplication([])
+window = ModernShutdownScheduler.ShutdownApp(create_backend("fake"), profiler)
+window.startup_finished.connect(app.quit)
+window.show()
+app.exec()
+sys.stderr.write("FIRST_FRAME %f\n" % profiler.elapsed("first frame"))
+"""
+
+CASES = [
+    ("headless --status", [sys.executable, "-c", CHILD, SCRIPT, "--status", "--backend", "fake"]),
+    ("headless --in 90m", [sys.executable, "-c", CHILD, SCRIPT, "--in", "90m", "--backend", "fake"]),
+    ("gui startup", [sys.executable, "-c", GUI_CHILD, SRC]),
+]
+
+
+def run_once(cmd, env):
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    rss = first_frame = None
+    for line in proc.stderr.splitlines():
+        if line.startswith("MAXRSS "):
+            rss = int(line.split()[1])
+        elif line.startswith("FIRST_FRAME "):
+            first_frame = float(line.split()[1])
+    if rss is None:
+        raise RuntimeError(f"{cmd!r} failed:\n{proc.stderr}")
+    return elapsed, rss, first_frame
+
+
+def main(repeat=5):
+    with tempfile.TemporaryDirectory() as state:
+        env = dict(os.environ, QT_QPA_PLATFORM="offscreen", XDG_STATE_HOME=state)
+        print(f"{'case':22} {'median':>10} {'min':>10} {'peak RSS':>10} {'1st frame':>10}")
+        for name, cmd in CASES:
+            runs = [run_once(cmd, env) for _ in range(repeat)]
+            times = [t for t, _, _ in runs]
+            rss = max(r for _, r, _ in runs)
+            frames = [f for _, _, f in runs if f is not None]
+            first_frame = f"{statistics.median(frames) * 1e3:8.1f}ms" if frames else f"{'-':>10}"
+            print(f"{name:22} {statistics.median(times) * 1e3:8.1f}ms {min(times) * 1e3:8.1f}ms {rss / 1024:8.1f}MB {first_frame}")
+
+
+if __name__ == "__main__":
+    main()
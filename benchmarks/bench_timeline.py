@@ -0,0 +1,83 @@
+"""Paint cost of the timeline picker.
+
+Renders the TimelinePicker offscreen at the window's width while panning
+across the whole 30-day range at every zoom level, and reports the paint
+time per frame and how many labels the zoom level cached. The old picker, a one-day QSlider
+with a row of 13 tick labels, is painted the same way for comparison.
+"""
+
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from PyQt6.QtCore import Qt  # noqa: E402
+from PyQt6.QtGui import QPixmap  # noqa: E402
+from PyQt6.QtWidgets import QApplication, QHBoxLayout, QLabel, QSlider, QVBoxLayout, QWidget  # noqa: E402
+
+import ModernShutdownScheduler as mss  # noqa: E402
+from palette import Palette  # noqa: E402
+
+WIDTH = mss.WINDOW_WIDTH - 60
+FRAMES = 300
+
+
+def paint_times(widget, before_frame, frames=FRAMES):
+    target = QPixmap(widget.size())
+    times = []
+    for i in range(frames):
+        before_frame(i)
+        start = time.perf_counter()
+        widget.render(target)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return statistics.mean(times), times[int(0.95 * (len(times) - 1))]
+
+
+def old_picker():
+    container = QWidget()
+    layout = QVBoxLayout(container)
+    layout.setContentsMargins(0, 0, 0, 0)
+    slider = QSlider(Qt.Orientation.Horizontal)
+    slider.setRange(1, mss.MINUTES_IN_DAY)
+    slider.setTickInterval(60)
+    slider.setTickPosition(QSlider.TickPosition.TicksBelow)
+    layout.addWidget(slider)
+    ticks = QHBoxLayout()
+    for i in range(13):
+        ticks.addWidget(QLabel(f"{(i * 2) % 24:02d}:00"), 1)
+    layout.addLayout(ticks)
+    container.setStyleSheet(mss.Styles.MAIN_WINDOW)
+    container.resize(WIDTH, 60)
+    return container, slider
+
+
+def main():
+    app = QApplication([])  # noqa: F841
+    container, slider = old_picker()
+    mean, p95 = paint_times(container, lambda i: slider.setValue(1 + i * 4))
+    print(f"{'picker':34} {'mean':>8} {'p95':>8} {'labels':>7}")
+    print(f"{'QSlider + 13 labels, 1 day':34} {mean * 1e3:6.3f}ms {p95 * 1e3:6.3f}ms {13:7d}")
+
+    timeline = mss.TimelinePicker(Palette(), lambda m: f"{(m // 60) % 24:02d}:{m % 60:02d}")
+    timeline.resize(WIDTH, mss.TIMELINE_HEIGHT)
+    timeline.setValue(mss.MAX_OFFSET_MINUTES // 2)
+    for index, span in enumerate(mss.TIMELINE_ZOOM_SPANS):
+        timeline.set_zoom(index)
+        travel = max(1, mss.MAX_OFFSET_MINUTES - span)
+
+        def pan(i):
+            timeline._set_view_start(travel * i / (FRAMES - 1))
+
+        mean, p95 = paint_times(timeline, pan)
+        labels = len(timeline._label_cache[timeline.zoom().label_step])
+        name = f"timeline, {span / 60:g} h visible" if span < 1440 else f"timeline, {span / 1440:g} d visible"
+        print(f"{name:34} {mean * 1e3:6.3f}ms {p95 * 1e3:6.3f}ms {labels:7d}")
+    print(f"frame budget at 60 fps: {1000 / 60:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Memory and wakeups of tray mode against the open window, offscreen.
+
+Schedules a shutdown an hour out, warms the window's caches by sweeping the
+timeline, then measures three states: the open window, tray mode after
+enter_tray_mode() has released the view, and the window rebuilt from the
+tray. For each it reports resident memory, live widgets and the timer events
+the process handles while idle, scaled to an hour. The offscreen platform has
+no system tray, so enter_tray_mode() is called directly; the icon itself is
+not part of the numbers.
+
+    python benchmarks/bench_tray.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("XDG_STATE_HOME", tempfile.mkdtemp(prefix="mss-bench-"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from PyQt6.QtCore import QEvent, QEventLoop, QObject, QTimer  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+import ModernShutdownScheduler as mss  # noqa: E402
+from process_memory import resident_bytes  # noqa: E402
+from shutdown_backend import FakeShutdownBackend  # noqa: E402
+
+IDLE_SECONDS = 3.0
+
+
+class TimerCounter(QObject):
+    """Counts every timer event delivered in the application."""
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Timer:
+            self.count += 1
+        return False
+
+
+def run_loop(seconds):
+    """Runs a real event loop, so deferred deletes happen as they would."""
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+
+def measure(app, window, counter):
+    run_loop(0.2)
+    timers, wakeups = counter.count, window.clock.wakeup_count
+    run_loop(IDLE_SECONDS)
+    per_hour = 3600 / IDLE_SECONDS
+    return {
+        "rss": resident_bytes(),
+        "widgets": len(app.allWidgets()),
+        "timers": (counter.count - timers) * per_hour,
+        "clock": (window.clock.wakeup_count - wakeups) * per_hour,
+    }
+
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    counter = TimerCounter()
+    app.installEventFilter(counter)
+    state_path = os.path.join(tempfile.mkdtemp(prefix="mss-bench-state-"), "state.dat")
+    window = mss.ShutdownApp(FakeShutdownBackend(), state_path=state_path)
+    window.show()
+    while not window.startup_complete:
+        app.processEvents()
+    window.schedule_job("shutdown", datetime.now() + timedelta(minutes=60))
+    for value in range(1, mss.MINUTES_IN_DAY + 1, 5):
+        window.time_input.setValue(value)
+        app.processEvents()
+    window.time_input.setValue(60)
+
+    results = [("open window", measure(app, window, counter), None)]
+    window.enter_tray_mode()
+    results.append(("tray", measure(app, window, counter), None))
+    start = time.perf_counter()
+    window.show_from_tray()
+    while not window.isVisible():
+        app.processEvents()
+    rebuild_ms = (time.perf_counter() - start) * 1000
+    results.append(("rebuilt", measure(app, window, counter), rebuild_ms))
+
+    print(f"{'state':12} {'RSS MiB':>8} {'widgets':>8} {'timers/h':>9} {'clock/h':>8}")
+    for name, r, extra in results:
+        rss = r["rss"] / 2**20 if r["rss"] is not None else float("nan")
+        note = f"  rebuilt in {extra:.1f} ms" if extra is not None else ""
+        print(f"{name:12} {rss:8.1f} {r['widgets']:8d} {r['timers']:9.0f} {r['clock']:8.0f}{note}")
+    window.close()
+    app.processEvents()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""Offscreen benchmarks for the GUI hot paths.
+
+Runs the real ShutdownApp under QT_QPA_PLATFORM=offscreen with the fake
+shutdown backend and reports, per case: wall time, per-event latency
+percentiles, allocated blocks and peak traced memory (tracemalloc, measured
+in a second pass so it does not skew the timings) and the process peak RSS.
+
+    python benchmarks/bench_ui.py --json results.json
+    python benchmarks/bench_ui.py --compare results.json
+
+Linux only (peak RSS comes from the resource module). Cold start is covered
+by bench_startup.py.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("XDG_STATE_HOME", tempfile.mkdtemp(prefix="mss-bench-"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from PyQt6.QtCore import QTimer  # noqa: E402
+from PyQt6.QtWidgets import QApplication, QMessageBox  # noqa: E402
+
+import ModernShutdownScheduler as mss  # noqa: E402
+from shutdown_backend import FakeShutdownBackend  # noqa: E402
+
+MINUTES = range(1, mss.MINUTES_IN_DAY + 1)
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def pump(app, seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+
+
+def start_app(app, backend=None):
+    state_path = os.path.join(tempfile.mkdtemp(prefix="mss-bench-state-"), "state.dat")
+    window = mss.ShutdownApp(backend or FakeShutdownBackend(), state_path=state_path)
+    window.show()
+    while not window.startup_complete:
+        app.processEvents()
+    return window
+
+
+def measure(name, setup, events, event):
+    """Times event(x) for every x in events, then repeats under tracemalloc."""
+    context = setup()
+    latencies = []
+    start = time.perf_counter()
+    for x in events:
+        t0 = time.perf_counter_ns()
+        event(context, x)
+        latencies.append(time.perf_counter_ns() - t0)
+    wall = time.perf_counter() - start
+
+    context = setup()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for x in events:
+        event(context, x)
+    after = tracemalloc.take_snapshot()
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+
+    latencies.sort()
+    return {
+        "case": name,
+        "events": len(latencies),
+        "wall_ms": wall * 1e3,
+        "p50_us": percentile(latencies, 0.50) / 1e3,
+        "p95_us": percentile(latencies, 0.95) / 1e3,
+        "p99_us": percentile(latencies, 0.99) / 1e3,
+        "max_us": latencies[-1] / 1e3 if latencies else 0.0,
+        "alloc_blocks": blocks,
+        "traced_peak_kb": traced_peak / 1024,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def run_cases(app):
+    window = start_app(app)
+    now = datetime.now()
+    results = []
+
+    def same_window():
+        return window
+
+    def sweep_setup():
+        window.time_input.blockSignals(True)
+        return window
+
+    results.append(measure("update_time_label sweep", sweep_setup, MINUTES,
+                           lambda w, v: (w.time_input.setValue(v), w.update_time_label(v))))
+    results.append(measure("update_slider_labels x1440", sweep_setup, MINUTES,
+                           lambda w, v: w.update_slider_labels()))
+    results.append(measure("update_background_color sweep", sweep_setup, MINUTES,
+                           lambda w, v: (w.time_input.setValue(v), w.update_background_color())))
+    window.time_input.blockSignals(False)
+    times = [now.replace(hour=m // 60, minute=m % 60) for m in range(mss.MINUTES_IN_DAY)]
+    results.append(measure("get_smooth_colors sweep", same_window, times,
+                           lambda w, t: w.get_smooth_colors(t)))
+
+    def drag_setup():
+        window.time_input.setValue(1)
+        window.render_scheduler.flush()
+        window.render_scheduler.frame_count = 0
+        return window
+
+    def drag_event(w, v):
+        w.time_input.setValue(v)
+        app.processEvents()
+
+    drag = measure("slider drag 1..1440 (coalesced)", drag_setup, MINUTES, drag_event)
+    pump(app, 0.05)
+    drag["frames"] = window.render_scheduler.frame_count
+    results.append(drag)
+
+    def minute_event(w, _):
+        w.last_minute = -1
+        w.check_minute_change()
+        w.render_scheduler.flush()
+
+    results.append(measure("24h of check_minute_change", same_window, range(mss.MINUTES_IN_DAY), minute_event))
+
+    def progress_setup():
+        window.clock.countdown_total = 86400
+        return window
+
+    results.append(measure("24h of update_progress", progress_setup, range(86400, -1, -1),
+                           lambda w, remaining: w.update_progress(remaining)))
+
+    def log_event(w, i):
+        w.log_message(f"schedule/cancel cycle {i}")
+        if i % 50 == 0:
+            app.processEvents()
+
+    results.append(measure("system log, 20k messages", same_window, range(20000), log_event))
+
+    def startup_event(_, __):
+        w = start_app(app)
+        w.close()
+        w.deleteLater()
+        app.processEvents()
+
+    results.append(measure("startup (warm, in-process)", lambda: None, range(10), startup_event))
+
+    slow = FakeShutdownBackend(latency=0.2)
+    slow_window = start_app(app, slow)
+    results.append(measure("initiate_shutdown, 200ms backend", lambda: slow_window, range(5),
+                           lambda w, _: w.initiate_shutdown()))
+    pump(app, 2.5)
+
+    window.time_input.setValue(1)
+    window.initiate_shutdown()
+    # The polling this replaced: a 1 s minute check plus a 1 s progress timer,
+    # counted over the same interval as the clock. The half-second lead keeps
+    # their ticks off the interval's edges.
+    polled = []
+    polling = [QTimer(), QTimer()]
+    for timer in polling:
+        timer.timeout.connect(lambda: polled.append(1))
+        timer.start(1000)
+    pump(app, 0.5)
+    polled.clear()
+    wakeups = window.clock.wakeup_count
+    pump(app, 3.0)
+    per_hour = (window.clock.wakeup_count - wakeups) / 3.0 * 3600
+    for timer in polling:
+        timer.stop()
+    window.hide()
+    wakeups = window.clock.wakeup_count
+    pump(app, 1.0)
+    results.append({
+        "case": "clock wakeups per hour",
+        "countdown_visible": per_hour,
+        "hidden": (window.clock.wakeup_count - wakeups) * 3600,
+        "polling_baseline": len(polled) / 3.0 * 3600,
+    })
+    results.append({
+        "case": "memory",
+        "icon_cache_kb": window.icons.decoded_bytes() / 1024,
+        "stylesheets": window.styles.applied_count,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    })
+    return results
+
+
+def print_results(results, baseline=None):
+    baseline = {r["case"]: r for r in baseline or []}
+    for result in results:
+        old = baseline.get(result["case"], {})
+        fields = []
+        for key, value in result.items():
+            if key == "case":
+                continue
+            text = f"{key}={value:.1f}" if isinstance(value, float) else f"{key}={value}"
+            if isinstance(value, (int, float)) and old.get(key):
+                text += f" ({(value - old[key]) / old[key] * 100:+.0f}%)"
+            fields.append(text)
+        print(f"{result['case']}\n    " + "  ".join(fields))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="show the change against an earlier --json file")
+    args = parser.parse_args()
+
+    QMessageBox.warning = staticmethod(lambda *a, **k: None)
+    QMessageBox.critical = staticmethod(lambda *a, **k: None)
+    app = QApplication.instance() or QApplication([])
+    results = run_cases(app)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    print_results(results, baseline)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "results": results,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
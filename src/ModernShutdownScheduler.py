@@ -1,42 +1,114 @@
 import sys
+import time
+
+STARTUP_T0 = time.perf_counter()
+
+if __name__ == '__main__':
+    # Headless commands must not pay for importing PyQt6.
+    import headless
+    if headless.is_headless_invocation(sys.argv[1:]):
+        sys.exit(headless.main(sys.argv[1:]))
+    if headless.activate_running_instance():
+        sys.exit(0)
+
+import html
 import os
-import subprocess
-import platform
+import math
+import weakref
+from functools import partial
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QTextEdit, QLabel, QSlider, QProgressBar, QMessageBox, QComboBox
+    QPushButton, QPlainTextEdit, QLabel, QLineEdit, QSlider, QProgressBar, QMessageBox, QComboBox,
+    QCheckBox, QSpinBox, QDialog, QFileDialog, QMenu, QSystemTrayIcon
+)
+from PyQt6.QtCore import (
+    QCoreApplication, QEasingCurve, QEvent, QLineF, QObject, QPointF, QPropertyAnimation, QRectF, Qt, QTimer, pyqtProperty, pyqtSignal
+)
+from PyQt6.QtGui import (
+    QBrush, QColor, QGuiApplication, QIcon, QImage, QImageReader, QKeySequence, QLinearGradient, QPainter, QPalette,
+    QPen, QPixmap, QShortcut
 )
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QIcon
 from datetime import datetime, timedelta
-
-if platform.system() != "Windows":
-    app = QApplication([])
-    QMessageBox.critical(None, "Unsupported OS", "This application can only run on Windows.")
-    sys.exit()
+from asset_bundle import BUNDLE_PATH, ENTRY_FORMAT, AssetBundle
+from idle_detector import IdleDetector, IdleWatcher, create_metrics_source
+from hot_paths import HOT_PATHS_ENV_VAR, HotPathRecorder, output_path as hot_paths_output
+from headless import NOTHING_SCHEDULED, NOTHING_TO_CANCEL, parse_command, scheduled_message, status_message, target_for
+from palette import DEFAULT_PALETTE, interpolate_color
+from process_memory import trim as trim_process_memory
+from recurrence import DAILY, PREVIEW_COUNT, WEEKDAYS, compile_rule, parse_exclusions
+from scheduler_engine import ACTIONS, SYSTEM_ACTIONS, SchedulerEngine
+from shutdown_backend import TIMED_ACTIONS, ShutdownResult, create_backend, run_action, run_cancel, run_schedule, shutdown_target, state_dir
+from single_instance import InstanceServer, forward_command
+from state_store import STATE_FILE_NAME, StateStore, job_record, restore_jobs
+from system_log import LOG_FILE_ENV_VAR, SystemLog, format_record
 
 MINUTES_IN_DAY = 24 * 60
 DEFAULT_SHUTDOWN_OFFSET = 1
-SLIDER_TICK_COUNT = 13
+MAX_SCHEDULE_DAYS = 30
+MAX_OFFSET_MINUTES = MAX_SCHEDULE_DAYS * MINUTES_IN_DAY
+# Visible spans the timeline zooms between, in minutes: one hour to 30 days.
+TIMELINE_ZOOM_SPANS = (60, 180, 360, 720, 1440, 2880, 5760, 10080, 20160, 43200)
+# One day, the span of the old slider.
+DEFAULT_TIMELINE_ZOOM = 4
+TIMELINE_TICK_STEPS = (1, 5, 10, 15, 30, 60, 120, 180, 360, 720, 1440, 2880, 10080)
+TIMELINE_BAND_STEPS = (1, 2, 3, 4, 5, 6, 8, 10, 12, 15, 20, 30, 60)
+TIMELINE_HEIGHT = 60
+MIN_TICK_SPACING = 6
+MIN_LABEL_SPACING = 64
+BAND_PIXELS = 3
+# Background fades between time-of-day colors over this long. Colors are
+# snapped to COLOR_QUANTUM per channel, which bounds how many gradients a
+# fade builds and how often it repaints.
+BACKGROUND_FADE_MS = 250
+COLOR_QUANTUM = 4
+BACKGROUND_BRUSH_CACHE_SIZE = 64
+BACKGROUND_RADIUS = 32
+DEFAULT_BACKGROUND = (30, 30, 40)
+DEFAULT_TEXT_COLOR = (255, 255, 255)
+DEFAULT_ACCENT = (79, 140, 255)
 ICON_SIZE = 100
 WINDOW_OPACITY = 1
 WINDOW_WIDTH = 850
 WINDOW_HEIGHT = 850
-MORNING_COLOR = (255, 200, 120)
-DAY_COLOR = (255, 255, 255)
-EVENING_COLOR = (255, 140, 70)
-NIGHT_COLOR = (0, 0, 0)
-BLUE_COLOR = (79, 140, 255)
-ORANGE_COLOR = (220, 140, 60)
-RED_COLOR = (255, 60, 60)
-COLOR_TRANSITION_MINUTES = 240
+DEFAULT_FRAME_INTERVAL_MS = 16
+MINUTE_BOUNDARY_SLACK_MS = 20
+# Job timers never sleep longer than this, so a wall-clock change (manual
+# adjustment, DST, resume from sleep) is noticed within a minute.
+MAX_JOB_TIMER_INTERVAL_MS = 60000
+# Settings and schedule changes are written at most this often.
+PERSIST_DELAY_MS = 500
+# An OS countdown found at startup belongs to the saved system job when their
+# deadlines are this close: scheduling truncates to whole seconds and the
+# backend reports the deadline rounded up.
+SYSTEM_JOB_MATCH_SECONDS = 2
+DEFAULT_IDLE_MINUTES = 30
+# Idle-triggered actions start as a countdown so they can still be canceled.
+IDLE_GRACE_SECONDS = 60
+# Pre-shutdown hooks run before every action that takes the machine down.
+HOOK_ACTIONS = ("shutdown", "restart", "hibernate", "logoff")
+# Fleet progress is redrawn at most this often, however fast replies arrive.
+FLEET_REFRESH_MS = 50
+FLEET_MAX_FAILURE_LINES = 500
+# The hot-path overlay (see hot_paths.py) is toggled with this key and
+# redrawn this often while shown.
+HOT_PATHS_OVERLAY_KEY = "F12"
+HOT_PATHS_REFRESH_MS = 500
+# Tray mode offers to push the next one-off job back by these many minutes.
+TRAY_EXTEND_MINUTES = (10, 30, 60)
+REPEAT_MODES = {
+    "once": "Once",
+    "daily": "Daily",
+    "weekdays": "Weekdays",
+    "custom": "Custom (cron)",
+}
 
 def resource_path(relative_path):
     try:
         base_path = sys._MEIPASS
     except Exception:
-        base_path = os.path.abspath(".")
-    
+        # assets/ sits next to src/, wherever the app was started from.
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
     return os.path.join(base_path, relative_path)
 
 class Styles:
@@ -46,15 +118,13 @@ class Styles:
         }
         QWidget {
             font-family: 'Segoe UI', 'San Francisco', 'Arial', sans-serif;
-            color: #fff;
         }
         QLabel {
-            color: #fff;
             font-size: 16px;
             font-weight: 500;
             border-radius: 32px;
         }
-        QTextEdit {
+        QPlainTextEdit {
             background: rgba(40, 40, 50, 0.7);
             color: #fff;
             border: 1.5px solid #3d3d3d;
@@ -101,13 +171,10 @@ class Styles:
             margin: 0px;
         }
     """
-    CENTRAL_WIDGET = """
-        background: rgba(30, 30, 40, 0.7);
-        border-radius: 32px;
-    """
-    APP_NAME_LABEL = "font-size: 24px; font-weight: bold; color: #fff; margin-bottom: 16px;"
-    TIME_VALUE_LABEL = "font-size: 18px; font-weight: 600; color: #fff; margin-bottom: 8px;"
-    SLIDER_TICK_LABEL = "color: #bbb; font-size: 12px;"
+    # Text colors come from the palette BackgroundWidget sets on its children.
+    APP_NAME_LABEL = "font-size: 24px; font-weight: bold; margin-bottom: 16px;"
+    TIME_VALUE_LABEL = "font-size: 18px; font-weight: 600; margin-bottom: 8px;"
+    PROGRESS_BAR = "QProgressBar { color: #222; font-weight: bold; font-size: 16px; background: #e6e6e6; border-radius: 22px; border: 2px solid #bdbdbd; text-align: center; } QProgressBar::chunk { background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #4f8cff, stop:1 #a084e8); border-radius: 22px; margin: 0px; }"
     SHUTDOWN_BUTTON = """
         QPushButton {
             background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #c7a4ff, stop:1 #a084e8);
@@ -139,170 +206,1166 @@ class Styles:
         }
     """
 
-class ShutdownApp(QMainWindow):
+class StyleManager:
+    """Only re-applies a stylesheet when it changes.
+
+    setStyleSheet makes Qt re-parse the sheet and re-polish the widget and all
+    of its children, so setting the sheet a widget already has is skipped.
+    """
+
     def __init__(self):
+        self._applied = weakref.WeakKeyDictionary()
+        self.applied_count = 0
+        self.skipped_count = 0
+
+    def set(self, widget, sheet):
+        if self._applied.get(widget) is sheet:
+            self.skipped_count += 1
+            return False
+        widget.setStyleSheet(sheet)
+        self._applied[widget] = sheet
+        self.applied_count += 1
+        return True
+
+def format_remaining(seconds):
+    """Minute-resolution countdown for the tray tooltip."""
+    minutes = math.ceil(seconds / 60)
+    if minutes <= 0:
+        return "due now"
+    hours, minutes = divmod(minutes, 60)
+    return f"in {hours} h {minutes:02d} min" if hours else f"in {minutes} min"
+
+def load_asset_bundle():
+    """The packed, pre-scaled images (see asset_bundle.py), or None when the
+    bundle is missing or damaged and the loose files are used instead."""
+    try:
+        return AssetBundle.load(resource_path(BUNDLE_PATH))
+    except (OSError, ValueError):
+        return None
+
+class PeriodIconCache:
+    """Decodes each period icon on first use and keeps one pre-scaled pixmap
+    per device pixel ratio, so the source PNGs are never held at full size.
+
+    With an asset bundle only the stored size nearest the target is decoded;
+    without one the loose PNG is read and scaled while decoding. An image that
+    cannot be read is reported to on_error and cached as an empty pixmap.
+    """
+
+    PATHS = {
+        "morning": "assets/images/morning.png",
+        "day": "assets/images/day.png",
+        "evening": "assets/images/evening.png",
+        "night": "assets/images/night.png",
+    }
+
+    def __init__(self, size=ICON_SIZE, bundle=None, on_error=None):
+        self._size = size
+        self._bundle = bundle
+        self._on_error = on_error
+        self._pixmaps = {}
+        # Bytes of the images decoded before any final scaling.
+        self.decoded_source_bytes = 0
+
+    def pixmap(self, period, dpr=1.0):
+        key = (period, dpr)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            pixmap = self._pixmaps[key] = self._decode(period, dpr)
+        return pixmap
+
+    def _decode(self, period, dpr):
+        side = round(self._size * dpr)
+        name = f"period/{period}"
+        if self._bundle is not None and name in self._bundle:
+            size = self._bundle.best_size(name, side)
+            image = QImage.fromData(self._bundle.blob(name, size).tobytes(), ENTRY_FORMAT)
+            if image.isNull():
+                return self._failed(f"Could not decode {name}@{size} from the asset bundle")
+            self.decoded_source_bytes += image.sizeInBytes()
+        else:
+            reader = QImageReader(resource_path(self.PATHS[period]))
+            target = reader.size()
+            if target.isValid():
+                # The PNG decoder produces the full image and then scales it.
+                self.decoded_source_bytes += target.width() * target.height() * 4
+                target.scale(side, side, Qt.AspectRatioMode.KeepAspectRatio)
+                reader.setScaledSize(target)
+            image = reader.read()
+            if image.isNull():
+                return self._failed(f"Could not load {self.PATHS[period]}: {reader.errorString()}")
+        if image.width() > side or image.height() > side:
+            image = image.scaled(side, side, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(dpr)
+        return pixmap
+
+    def _failed(self, message):
+        if self._on_error is not None:
+            self._on_error(message)
+        return QPixmap()
+
+    def decoded_bytes(self):
+        return sum(p.width() * p.height() * p.depth() // 8 for p in self._pixmaps.values())
+
+    def clear(self):
+        self._pixmaps.clear()
+
+def quantize_color(rgb, step=COLOR_QUANTUM):
+    return tuple(min(255, (channel + step // 2) // step * step) for channel in rgb)
+
+class BackgroundWidget(QWidget):
+    """Central widget that paints the rounded time-of-day background itself.
+
+    A color change repaints this widget instead of re-polishing every child
+    through the stylesheet engine. The vertical gradient brush for each
+    quantized background color is built once and kept; Qt caches the
+    rendered color ramp behind it, which fills the rounded rectangle far
+    faster than a pre-rendered pixmap used as a texture. set_theme() fades
+    background, text and accent colors together; text and field colors go
+    straight into the children's palettes, the accent is handed out through
+    accentChanged.
+    """
+
+    textColorChanged = pyqtSignal(object)
+    accentChanged = pyqtSignal(object)
+
+    def __init__(self, background=DEFAULT_BACKGROUND, text=DEFAULT_TEXT_COLOR, accent=DEFAULT_ACCENT,
+                 radius=BACKGROUND_RADIUS, parent=None):
+        super().__init__(parent)
+        self._radius = radius
+        self._start = self._target = (tuple(background), tuple(text), tuple(accent))
+        self._current = tuple(quantize_color(c) for c in self._target)
+        self._progress = 1.0
+        self._brush_cache = {}
+        self._animation = QPropertyAnimation(self, b"progress", self)
+        self._animation.setDuration(BACKGROUND_FADE_MS)
+        self._animation.setEasingCurve(QEasingCurve.Type.OutCubic)
+        self._animation.setStartValue(0.0)
+        self._animation.setEndValue(1.0)
+        self.paint_count = 0
+        self.brushes_built = 0
+
+    def background(self):
+        return self._current[0]
+
+    def text_color(self):
+        return self._current[1]
+
+    def accent(self):
+        return self._current[2]
+
+    def is_animating(self):
+        return self._animation.state() == QPropertyAnimation.State.Running
+
+    def set_theme(self, background, text, accent, animate=True):
+        """Fades to the given colors, or switches at once when `animate` is
+        false. A new target during a fade starts from the colors on screen."""
+        target = (tuple(background), tuple(text), tuple(accent))
+        if target == self._target:
+            return
+        self._animation.stop()
+        self._start, self._target = self._current, target
+        if animate and self.isVisible():
+            self._animation.start()
+        else:
+            self._set_progress(1.0)
+
+    def _get_progress(self):
+        return self._progress
+
+    def _set_progress(self, progress):
+        self._progress = progress
+        background, text, accent = (quantize_color(interpolate_color(a, b, progress))
+                                    for a, b in zip(self._start, self._target))
+        previous, self._current = self._current, (background, text, accent)
+        if background != previous[0]:
+            self.update()
+        if background != previous[0] or text != previous[1]:
+            self.apply_palette()
+        if text != previous[1]:
+            self.textColorChanged.emit(text)
+        if accent != previous[2]:
+            self.accentChanged.emit(accent)
+
+    progress = pyqtProperty(float, _get_progress, _set_progress)
+
+    def apply_palette(self):
+        """Gives every child the current text and field colors. Palettes do
+        not propagate past widgets polished by a stylesheet, so each child is
+        set directly; call this again after adding widgets."""
+        background, text, _ = self._current
+        palette = QPalette(self.palette())
+        for role in (QPalette.ColorRole.WindowText, QPalette.ColorRole.Text, QPalette.ColorRole.ButtonText):
+            palette.setColor(role, QColor(*text))
+        for role in (QPalette.ColorRole.Window, QPalette.ColorRole.Base, QPalette.ColorRole.Button):
+            palette.setColor(role, QColor(*background))
+        for child in self.findChildren(QWidget):
+            child.setPalette(palette)
+
+    def gradient_brush(self, color, height):
+        key = (color, height)
+        brush = self._brush_cache.get(key)
+        if brush is None:
+            if len(self._brush_cache) >= BACKGROUND_BRUSH_CACHE_SIZE:
+                del self._brush_cache[next(iter(self._brush_cache))]
+            base = QColor(*color)
+            gradient = QLinearGradient(0, 0, 0, height)
+            gradient.setColorAt(0.0, base.lighter(110))
+            gradient.setColorAt(1.0, base.darker(110))
+            brush = self._brush_cache[key] = QBrush(gradient)
+            self.brushes_built += 1
+        return brush
+
+    def paintEvent(self, event):
+        self.paint_count += 1
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.gradient_brush(self._current[0], self.height()))
+        painter.drawRoundedRect(QRectF(self.rect()), self._radius, self._radius)
+
+class TimelineZoom:
+    """Tick layout for one zoom level, derived once from its visible span."""
+
+    __slots__ = ("span", "tick_step", "label_step", "band_minutes")
+
+    def __init__(self, span, width):
+        pixels_per_minute = width / span
+        self.span = span
+        self.tick_step = next((s for s in TIMELINE_TICK_STEPS if s * pixels_per_minute >= MIN_TICK_SPACING),
+                              TIMELINE_TICK_STEPS[-1])
+        self.label_step = next((s for s in TIMELINE_TICK_STEPS
+                                if s >= self.tick_step and s * pixels_per_minute >= MIN_LABEL_SPACING),
+                               TIMELINE_TICK_STEPS[-1])
+        # Day/night colors are sampled about every BAND_PIXELS, snapped to a
+        # divisor of the day so the samples repeat exactly from day to day.
+        self.band_minutes = next((d for d in TIMELINE_BAND_STEPS if d * pixels_per_minute >= BAND_PIXELS),
+                                 TIMELINE_BAND_STEPS[-1])
+
+class TimelinePicker(QWidget):
+    """Custom-painted replacement for the time slider that spans days.
+
+    The value is an offset in minutes from the origin (the current minute).
+    The wheel zooms between TIMELINE_ZOOM_SPANS around the cursor; dragging
+    the scale, or shift+wheel, pans. Painting only visits the ticks, labels
+    and day/night bands inside the visible span, so its cost depends on the
+    width of the widget rather than on how many days can be scheduled. Label
+    strings and band colors are cached per zoom level.
+    """
+
+    valueChanged = pyqtSignal(int)
+    zoomChanged = pyqtSignal(int)
+
+    TRACK_TOP = 8
+    TRACK_HEIGHT = 12
+    TICK_TOP = 26
+    LABEL_TOP = 36
+    HANDLE_RADIUS = 8
+    PADDING = 10
+
+    def __init__(self, color_palette, format_minute, minimum=1, maximum=MAX_OFFSET_MINUTES, zoom=DEFAULT_TIMELINE_ZOOM,
+                 parent=None):
+        super().__init__(parent)
+        self.color_palette = color_palette
+        self.format_minute = format_minute
+        self._minimum = minimum
+        self._maximum = maximum
+        self._value = minimum
+        self._base = 0
+        self._origin_date = None
+        self._zoom_index = max(0, min(zoom, len(TIMELINE_ZOOM_SPANS) - 1))
+        self._zooms = {}
+        self._view_start = 0.0
+        self._label_cache = {}
+        self._band_cache = {}
+        self._accent = QColor(79, 140, 255)
+        self._text_color = QColor(187, 187, 187)
+        self._drag = None
+        self.paint_count = 0
+        self.setMinimumHeight(TIMELINE_HEIGHT)
+        self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.setToolTip("Drag to pick a time. Scroll to zoom, drag the scale or shift+scroll to pan.")
+        self.set_origin(datetime.now())
+
+    # QSlider-compatible API used by the rest of the window.
+    def value(self):
+        return self._value
+
+    def minimum(self):
+        return self._minimum
+
+    def maximum(self):
+        return self._maximum
+
+    def setValue(self, value):
+        value = max(self._minimum, min(int(value), self._maximum))
+        if value == self._value:
+            return
+        self._value = value
+        if self._drag is None:
+            self.ensure_visible(value)
+        self.update()
+        self.valueChanged.emit(value)
+
+    def zoom_index(self):
+        return self._zoom_index
+
+    def zoom(self):
+        width = self.track_width()
+        key = (self._zoom_index, width)
+        zoom = self._zooms.get(key)
+        if zoom is None:
+            zoom = self._zooms[key] = TimelineZoom(TIMELINE_ZOOM_SPANS[self._zoom_index], width)
+        return zoom
+
+    def track_width(self):
+        return max(1, self.width() - 2 * self.PADDING)
+
+    def scale(self):
+        return self.track_width() / self.zoom().span
+
+    def view_range(self):
+        return self._view_start, self._view_start + self.zoom().span
+
+    def set_origin(self, origin):
+        """Anchors offset 0 to `origin`'s minute; labels and bands follow the
+        wall clock from there."""
+        base = origin.hour * 60 + origin.minute
+        if origin.date() != self._origin_date:
+            # Labels are keyed by minutes since the origin's midnight.
+            self._label_cache.clear()
+            self._origin_date = origin.date()
+        if base != self._base:
+            self._base = base
+            self.update()
+
+    def invalidate_labels(self):
+        self._label_cache.clear()
+        self.update()
+
+    def set_accent(self, rgb):
+        if self._accent.getRgb()[:3] != tuple(rgb):
+            self._accent = QColor(*rgb)
+            self.update()
+
+    def set_text_color(self, rgb):
+        if self._text_color.getRgb()[:3] != tuple(rgb):
+            self._text_color = QColor(*rgb)
+            self.update()
+
+    def set_zoom(self, index, anchor=None):
+        """Switches zoom level keeping the offset `anchor` (default: the
+        value) at the same x position."""
+        index = max(0, min(index, len(TIMELINE_ZOOM_SPANS) - 1))
+        if index == self._zoom_index:
+            return
+        if anchor is None:
+            anchor = self._value
+        x = self.x_for(anchor)
+        self._zoom_index = index
+        self._set_view_start(anchor - (x - self.PADDING) / self.scale())
+        self.zoomChanged.emit(index)
+
+    def pan(self, minutes):
+        self._set_view_start(self._view_start + minutes)
+
+    def ensure_visible(self, value):
+        start, end = self.view_range()
+        if not start <= value <= end:
+            self._set_view_start(value - self.zoom().span / 2)
+
+    def _set_view_start(self, start):
+        span = self.zoom().span
+        start = max(0.0, min(float(start), max(0.0, self._maximum - span)))
+        if start != self._view_start:
+            self._view_start = start
+        self.update()
+
+    def x_for(self, offset):
+        return self.PADDING + (offset - self._view_start) * self.scale()
+
+    def offset_at(self, x):
+        return self._view_start + (x - self.PADDING) / self.scale()
+
+    def label(self, zoom, minute, metrics):
+        """(text, width) for the label at `minute` minutes past the origin's
+        midnight. Times repeat every day and are cached by minute of day,
+        dates by minute, so a zoom level holds at most a day's worth of
+        labels plus one per day of the range."""
+        labels = self._label_cache.get(zoom.label_step)
+        if labels is None:
+            labels = self._label_cache[zoom.label_step] = {}
+        is_date = minute % MINUTES_IN_DAY == 0
+        key = minute if is_date else minute % MINUTES_IN_DAY
+        label = labels.get(key)
+        if label is None:
+            if is_date:
+                day = self._origin_date + timedelta(days=minute // MINUTES_IN_DAY)
+                text = f"{day:%a %d}"
+            else:
+                text = self.format_minute(minute)
+            label = labels[key] = (text, metrics.horizontalAdvance(text))
+        return label
+
+    def band_strip(self, band_minutes):
+        """One day of background colors, one pixel per band; paintEvent
+        stretches the visible part of each day over the track."""
+        strip = self._band_cache.get(band_minutes)
+        if strip is None:
+            image = QImage(MINUTES_IN_DAY // band_minutes, 1, QImage.Format.Format_RGB32)
+            for x in range(image.width()):
+                image.setPixelColor(x, 0, QColor(*self.color_palette.entry(x * band_minutes + band_minutes // 2).bg))
+            strip = self._band_cache[band_minutes] = QPixmap.fromImage(image)
+        return strip
+
+    def paintEvent(self, event):
+        self.paint_count += 1
+        zoom = self.zoom()
+        scale = self.track_width() / zoom.span
+        start, end = self._view_start, self._view_start + zoom.span
+        base = self._base
+        left, right = self.PADDING, self.width() - self.PADDING
+        painter = QPainter(self)
+
+        # Day/night bands: one stretched blit per visible day.
+        band = zoom.band_minutes
+        strip = self.band_strip(band)
+        track_top, track_height = self.TRACK_TOP, self.TRACK_HEIGHT
+        minute, stop = base + start, base + end
+        while minute < stop:
+            day_start = minute // MINUTES_IN_DAY * MINUTES_IN_DAY
+            segment_end = min(day_start + MINUTES_IN_DAY, stop)
+            painter.drawPixmap(
+                QRectF(left + (minute - base - start) * scale, track_top, (segment_end - minute) * scale, track_height),
+                strip,
+                QRectF((minute - day_start) / band, 0, (segment_end - minute) / band, 1),
+            )
+            minute = segment_end
+
+        # Selected span, then ticks and labels.
+        value_x = self.x_for(self._value)
+        painter.fillRect(QRectF(left, track_top + track_height, max(0.0, min(value_x, right) - left), 3), self._accent)
+        painter.setPen(self._text_color)
+        tick_top = self.TICK_TOP
+        step = zoom.tick_step
+        label_step = zoom.label_step
+        minute = -(-(base + int(start)) // step) * step
+        stop = base + end
+        lines = []
+        while minute <= stop:
+            x = left + (minute - base - start) * scale
+            lines.append(QLineF(x, tick_top, x, tick_top + (8 if minute % label_step == 0 else 4)))
+            minute += step
+        painter.drawLines(lines)
+        metrics = self.fontMetrics()
+        label_top = self.LABEL_TOP + metrics.ascent()
+        minute = -(-(base + int(start)) // label_step) * label_step
+        width = self.width()
+        while minute <= stop:
+            text, text_width = self.label(zoom, minute, metrics)
+            x = left + (minute - base - start) * scale - text_width / 2
+            painter.drawText(QPointF(max(0.0, min(x, width - text_width)), label_top), text)
+            minute += label_step
+
+        if left - self.HANDLE_RADIUS <= value_x <= right + self.HANDLE_RADIUS:
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(QPen(QColor(255, 255, 255), 2))
+            painter.setBrush(self._accent)
+            painter.drawEllipse(QPointF(value_x, track_top + track_height / 2), self.HANDLE_RADIUS, self.HANDLE_RADIUS)
+        painter.end()
+
+    def mousePressEvent(self, event):
+        if event.button() != Qt.MouseButton.LeftButton:
+            return super().mousePressEvent(event)
+        x = event.position().x()
+        if event.position().y() < self.TICK_TOP:
+            self._drag = ("value",)
+            self.setValue(round(self.offset_at(x)))
+        else:
+            self._drag = ("pan", x, self._view_start)
+        event.accept()
+
+    def mouseMoveEvent(self, event):
+        if self._drag is None:
+            return super().mouseMoveEvent(event)
+        x = event.position().x()
+        if self._drag[0] == "value":
+            self.setValue(round(self.offset_at(min(max(x, self.PADDING), self.width() - self.PADDING))))
+        else:
+            _, press_x, view_start = self._drag
+            self._set_view_start(view_start - (x - press_x) / self.scale())
+        event.accept()
+
+    def mouseReleaseEvent(self, event):
+        self._drag = None
+        event.accept()
+
+    def wheelEvent(self, event):
+        delta = event.angleDelta()
+        steps = (delta.y() or delta.x()) / 120
+        if not steps:
+            return
+        if delta.x() or event.modifiers() & Qt.KeyboardModifier.ShiftModifier:
+            self.pan(-steps * self.zoom().span / 10)
+        else:
+            self.set_zoom(self._zoom_index - (1 if steps > 0 else -1), self.offset_at(event.position().x()))
+        event.accept()
+
+    def keyPressEvent(self, event):
+        key = event.key()
+        page = self.zoom().label_step
+        if key == Qt.Key.Key_Left:
+            self.setValue(self._value - 1)
+        elif key == Qt.Key.Key_Right:
+            self.setValue(self._value + 1)
+        elif key == Qt.Key.Key_PageDown:
+            self.setValue(self._value - page)
+        elif key == Qt.Key.Key_PageUp:
+            self.setValue(self._value + page)
+        elif key == Qt.Key.Key_Home:
+            self.setValue(self._minimum)
+        elif key == Qt.Key.Key_End:
+            self.setValue(self._maximum)
+        elif key in (Qt.Key.Key_Plus, Qt.Key.Key_Equal):
+            self.set_zoom(self._zoom_index - 1)
+        elif key == Qt.Key.Key_Minus:
+            self.set_zoom(self._zoom_index + 1)
+        else:
+            return super().keyPressEvent(event)
+        event.accept()
+
+    def resizeEvent(self, event):
+        self._set_view_start(self._view_start)
+        super().resizeEvent(event)
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.FontChange:
+            # Cached labels carry their width in the old font.
+            self.invalidate_labels()
+        super().changeEvent(event)
+
+class RenderScheduler:
+    """Coalesces UI invalidations into at most one render per display frame.
+
+    Callers mark parts of the UI dirty; the first invalidation arms a
+    single-shot timer for the next frame and later ones only OR in their
+    flags. The render reads the current slider value when it runs, so the
+    last value of a drag is always the one that gets painted.
+    """
+
+    LABEL = 1
+    COLORS = 2
+    ICON = 4
+    TICKS = 8
+    ALL = LABEL | COLORS | ICON | TICKS
+
+    def __init__(self, parent, render, interval_ms=None):
+        if interval_ms is None:
+            interval_ms = self.frame_interval_ms()
+        self._render = render
+        self._dirty = 0
+        self._timer = QTimer(parent)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+        self.invalidation_count = 0
+        self.frame_count = 0
+
+    @staticmethod
+    def frame_interval_ms():
+        screen = QGuiApplication.primaryScreen()
+        rate = screen.refreshRate() if screen is not None else 0
+        if rate <= 0:
+            return DEFAULT_FRAME_INTERVAL_MS
+        return max(1, int(1000 / rate))
+
+    def invalidate(self, flags=ALL):
+        self.invalidation_count += 1
+        self._dirty |= flags
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        self._timer.stop()
+        flags = self._dirty
+        if not flags:
+            return
+        self._dirty = 0
+        self.frame_count += 1
+        self._render(flags)
+
+    def is_pending(self):
+        return bool(self._dirty)
+
+class ClockService(QObject):
+    """Event-driven replacement for polling timers.
+
+    minute_changed fires once per wall-clock minute from a single-shot timer
+    aimed at the next minute boundary. The countdown is measured against
+    self._monotonic(), so it cannot drift, and wakes up only when the whole
+    number of remaining seconds changes. While paused no timers run at all;
+    resume() catches up immediately. wall and monotonic are the time sources,
+    replaceable so the wakeups can be counted on a simulated clock.
+    """
+
+    minute_changed = pyqtSignal()
+    countdown_changed = pyqtSignal(int)
+    countdown_finished = pyqtSignal()
+
+    def __init__(self, parent=None, wall=time.time, monotonic=time.monotonic):
+        super().__init__(parent)
+        self._wall = wall
+        self._monotonic = monotonic
+        self._minute_timer = QTimer(self)
+        self._minute_timer.setSingleShot(True)
+        self._minute_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._minute_timer.timeout.connect(self._on_minute_timer)
+        self._countdown_timer = QTimer(self)
+        self._countdown_timer.setSingleShot(True)
+        self._countdown_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._countdown_timer.timeout.connect(self._on_countdown_timer)
+        self._active = False
+        self._minute_key = self._current_minute_key()
+        self._deadline = None
+        self.countdown_total = 0
+        self.wakeup_count = 0
+
+    def _current_minute_key(self):
+        return int(self._wall() // 60)
+
+    def is_active(self):
+        return self._active
+
+    def start(self):
+        self._active = True
+        self._minute_key = self._current_minute_key()
+        self._arm_minute_timer()
+        self._arm_countdown_timer()
+
+    def pause(self):
+        self._active = False
+        self._minute_timer.stop()
+        self._countdown_timer.stop()
+
+    def resume(self):
+        if self._active:
+            return
+        self._active = True
+        self._check_minute()
+        if self._deadline is not None:
+            self._emit_countdown()
+
+    def start_countdown(self, seconds, total=None):
+        self.countdown_total = seconds if total is None else total
+        self._deadline = self._monotonic() + seconds
+        self._emit_countdown()
+
+    def stop_countdown(self):
+        self._deadline = None
+        self._countdown_timer.stop()
+
+    def remaining_seconds(self):
+        if self._deadline is None:
+            return None
+        return max(0, math.ceil(self._deadline - self._monotonic()))
+
+    def _arm_minute_timer(self):
+        if not self._active:
+            return
+        into_minute_ms = int(self._wall() * 1000) % 60000
+        self._minute_timer.start(60000 - into_minute_ms + MINUTE_BOUNDARY_SLACK_MS)
+
+    def _arm_countdown_timer(self):
+        if not self._active or self._deadline is None:
+            return
+        left = self._deadline - self._monotonic()
+        until_next_second = left - (math.ceil(left) - 1)
+        self._countdown_timer.start(max(1, int(until_next_second * 1000) + 1))
+
+    def _check_minute(self):
+        key = self._current_minute_key()
+        if key != self._minute_key:
+            self._minute_key = key
+            self.minute_changed.emit()
+        self._arm_minute_timer()
+
+    def _emit_countdown(self):
+        remaining = self.remaining_seconds()
+        self.countdown_changed.emit(remaining)
+        if remaining <= 0:
+            self._deadline = None
+            self.countdown_finished.emit()
+            return
+        self._arm_countdown_timer()
+
+    def _on_minute_timer(self):
+        self.wakeup_count += 1
+        self._check_minute()
+
+    def _on_countdown_timer(self):
+        self.wakeup_count += 1
+        if self._deadline is not None:
+            self._emit_countdown()
+
+class StartupProfiler:
+    """Records how long each startup phase took, relative to module import."""
+
+    def __init__(self, start=STARTUP_T0):
+        self.start = start
+        self._last = start
+        self.phases = []
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last, now - self.start))
+        self._last = now
+
+    def elapsed(self, name):
+        for phase, _, total in self.phases:
+            if phase == name:
+                return total
+        return None
+
+    def report(self):
+        lines = [f"{'phase':<24}{'took':>10}{'at':>10}"]
+        for name, took, total in self.phases:
+            lines.append(f"{name:<24}{took * 1000:>8.1f}ms{total * 1000:>8.1f}ms")
+        return "\n".join(lines)
+
+class ShutdownWorker(QObject):
+    """Runs backend jobs one at a time on a worker thread.
+
+    Jobs are serialized so a cancel can never overtake the schedule before
+    it; results come back on the GUI thread through `finished`. A job that
+    raises comes back as a failed ShutdownResult, so `finished` always fires.
+    """
+
+    finished = pyqtSignal(str, object, object)
+
+    def __init__(self, backend, parent=None):
+        super().__init__(parent)
+        self.backend = backend
+        self._executor = None
+        self.pending_jobs = 0
+        self.finished.connect(self._on_finished)
+
+    def submit(self, kind, context, fn, *args):
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shutdown-backend")
+        self.pending_jobs += 1
+        future = self._executor.submit(self._call, kind, fn, *args)
+        future.add_done_callback(lambda f: self.finished.emit(kind, context, f.result()))
+
+    def _call(self, kind, fn, *args):
+        try:
+            return fn(self.backend, *args)
+        except Exception as e:
+            return ShutdownResult(kind, None, "", str(e), 0.0)
+
+    def _on_finished(self, kind, context, result):
+        self.pending_jobs -= 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+class JobScheduler(QObject):
+    """Fires SchedulerEngine jobs from a single timer armed for the earliest
+    deadline. Deadlines are wall-clock times, re-read on every arm."""
+
+    job_due = pyqtSignal(object)
+    changed = pyqtSignal()
+
+    def __init__(self, parent=None, engine=None):
+        super().__init__(parent)
+        self.engine = engine if engine is not None else SchedulerEngine()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._on_timer)
+        self.wakeup_count = 0
+
+    def __len__(self):
+        return len(self.engine)
+
+    def add(self, action, deadline, note=""):
+        job = self.engine.add(action, deadline, note)
+        self.rearm()
+        self.changed.emit()
+        return job
+
+    def add_recurring(self, action, rule, note=""):
+        job = self.engine.add_recurring(action, rule, note)
+        self.rearm()
+        self.changed.emit()
+        return job
+
+    def cancel(self, job_id):
+        job = self.engine.cancel(job_id)
+        if job is not None:
+            self.rearm()
+            self.changed.emit()
+        return job
+
+    def peek(self, actions=None):
+        return self.engine.peek(actions)
+
+    def jobs(self):
+        return self.engine.jobs()
+
+    def rearm(self):
+        deadline = self.engine.next_deadline()
+        if deadline is None:
+            self._timer.stop()
+            return
+        delay_ms = (deadline - time.time()) * 1000
+        self._timer.start(int(min(max(delay_ms, 0), MAX_JOB_TIMER_INTERVAL_MS)))
+
+    def _on_timer(self):
+        self.wakeup_count += 1
+        due = self.engine.pop_due()
+        for job in due:
+            self.job_due.emit(job)
+        self.rearm()
+        if due:
+            self.changed.emit()
+
+class FleetDialog(QDialog):
+    """Sends the main window's schedule, cancel and status commands to every
+    host in a hosts file.
+
+    Progress is one bar and a summary line however many hosts there are;
+    only failures (and status replies) are listed. Runs happen on a FleetRunner thread and
+    replies arrive through queued signals.
+    """
+
+    result_ready = pyqtSignal(object)
+    run_finished = pyqtSignal(object)
+
+    def __init__(self, app):
+        super().__init__(app)
+        # asyncio is only imported once the dialog is first opened.
+        from fleet import TOKEN_ENV_VAR
+        self.app = app
+        self.setWindowTitle('Fleet')
+        self.setMinimumWidth(520)
+        self.runner = None
+        self.controller = None
+        self._controller_key = None
+        self.progress_state = None
+        self.command = None
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.timeout.connect(self.refresh)
+        self.result_ready.connect(self.on_result)
+        self.run_finished.connect(self.on_run_finished)
+
+        layout = QVBoxLayout(self)
+        hosts_row = QHBoxLayout()
+        hosts_row.addWidget(QLabel('Hosts file:'))
+        self.hosts_input = QLineEdit(app.saved_setting("fleet_hosts", ""))
+        self.hosts_input.textChanged.connect(app.persist)
+        hosts_row.addWidget(self.hosts_input)
+        browse_button = QPushButton('Browse...')
+        browse_button.clicked.connect(self.browse)
+        hosts_row.addWidget(browse_button)
+        layout.addLayout(hosts_row)
+        token_row = QHBoxLayout()
+        token_row.addWidget(QLabel('Token:'))
+        self.token_input = QLineEdit(os.environ.get(TOKEN_ENV_VAR, ""))
+        self.token_input.setEchoMode(QLineEdit.EchoMode.Password)
+        token_row.addWidget(self.token_input)
+        layout.addLayout(token_row)
+        # Agents only run what the OS can count down, so the dialog offers
+        # just those, with its own delay that works while the window is in
+        # the tray.
+        when_row = QHBoxLayout()
+        when_row.addWidget(QLabel('Schedule:'))
+        self.action_input = QComboBox()
+        for action in TIMED_ACTIONS:
+            self.action_input.addItem(ACTIONS[action], userData=action)
+        self.action_input.setCurrentIndex(max(0, self.action_input.findData(app.saved_setting("action", "shutdown"))))
+        when_row.addWidget(self.action_input)
+        when_row.addWidget(QLabel('in'))
+        self.minutes_input = QSpinBox()
+        self.minutes_input.setRange(1, MAX_OFFSET_MINUTES)
+        self.minutes_input.setSuffix(' min')
+        if hasattr(app, 'time_input'):
+            self.minutes_input.setValue(app.time_input.value())
+        else:
+            self.minutes_input.setValue(app.saved_setting("offset", DEFAULT_SHUTDOWN_OFFSET))
+        when_row.addWidget(self.minutes_input)
+        when_row.addStretch()
+        layout.addLayout(when_row)
+
+        buttons = QHBoxLayout()
+        self.schedule_button = QPushButton('Schedule on all hosts')
+        self.schedule_button.clicked.connect(lambda: self.start("schedule"))
+        self.cancel_button = QPushButton('Cancel on all hosts')
+        self.cancel_button.clicked.connect(lambda: self.start("cancel"))
+        self.status_button = QPushButton('Status')
+        self.status_button.clicked.connect(lambda: self.start("status"))
+        for button in (self.schedule_button, self.cancel_button, self.status_button):
+            buttons.addWidget(button)
+        layout.addLayout(buttons)
+
+        self.progress = QProgressBar()
+        self.progress.setValue(0)
+        layout.addWidget(self.progress)
+        self.summary_label = QLabel('')
+        layout.addWidget(self.summary_label)
+        self.failures = QPlainTextEdit()
+        self.failures.setReadOnly(True)
+        self.failures.setMaximumBlockCount(FLEET_MAX_FAILURE_LINES)
+        self.failures.setPlaceholderText('Failures and status replies appear here.')
+        layout.addWidget(self.failures)
+
+    def browse(self):
+        path, _ = QFileDialog.getOpenFileName(self, 'Hosts file', self.hosts_input.text())
+        if path:
+            self.hosts_input.setText(path)
+
+    def get_controller(self):
+        from fleet import FleetController, read_hosts, read_token
+        path = self.hosts_input.text().strip()
+        key = (path, os.path.getmtime(path), self.token_input.text())
+        if key != self._controller_key:
+            if self.controller is not None:
+                self.runner.call(self.controller.close)
+            self.controller = FleetController(read_hosts(path), read_token(self.token_input.text()))
+            self._controller_key = key
+        return self.controller
+
+    def set_running(self, running):
+        for button in (self.schedule_button, self.cancel_button, self.status_button):
+            button.setEnabled(not running)
+
+    def start(self, command):
+        from fleet import FleetProgress, FleetRunner
+        try:
+            if self.runner is None:
+                self.runner = FleetRunner()
+            controller = self.get_controller()
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Fleet", str(e))
+            return
+        if not controller.hosts:
+            QMessageBox.warning(self, "Fleet", "The hosts file lists no hosts.")
+            return
+        self.command = command
+        self.progress_state = FleetProgress(len(controller.hosts))
+        self.progress.setRange(0, len(controller.hosts))
+        self.progress.setValue(0)
+        self.failures.clear()
+        self.set_running(True)
+        if command == "schedule":
+            coro = controller.schedule(self.minutes_input.value(), action=self.action_input.currentData(),
+                                       on_result=self.result_ready.emit)
+        else:
+            coro = controller.run(command, {}, self.result_ready.emit)
+        future = self.runner.submit(coro)
+        future.add_done_callback(lambda f: self.run_finished.emit(f.exception()))
+        self.app.log_message(f"Fleet {command} started on {len(controller.hosts)} hosts.")
+        self.refresh()
+
+    def on_result(self, result):
+        self.progress_state.add(result)
+        if not result.ok or self.command == "status":
+            self.failures.appendPlainText(f"{result.host}: {result.describe()}")
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start(FLEET_REFRESH_MS)
+
+    def refresh(self):
+        if self.progress_state is not None:
+            self.progress.setValue(self.progress_state.done)
+            self.summary_label.setText(self.progress_state.summary())
+
+    def on_run_finished(self, error):
+        self._refresh_timer.stop()
+        self.refresh()
+        self.set_running(False)
+        if error is not None:
+            self.app.log_message(f"Fleet {self.command} failed: {error}", "ERROR")
+            return
+        state = self.progress_state
+        level = "INFO" if state.ok == state.total else "WARNING"
+        self.app.log_message(f"Fleet {self.command}: {state.summary()}", level)
+
+    def shutdown(self):
+        if self.runner is not None:
+            if self.controller is not None:
+                self.runner.call(self.controller.close)
+            self.runner.stop()
+            self.runner = None
+
+class ShutdownApp(QMainWindow):
+    startup_finished = pyqtSignal()
+    instance_command = pyqtSignal(object)
+    idle_sampled = pyqtSignal(object)
+    idle_reached = pyqtSignal()
+    hook_output = pyqtSignal(str, str)
+    hook_result = pyqtSignal(object)
+    hooks_finished = pyqtSignal(object)
+
+    def __init__(self, backend=None, profiler=None, log_file=None, state_path=None, hot_paths=None):
         super().__init__()
-        self.time_format_mode = '24'
+        self.profiler = profiler if profiler is not None else StartupProfiler()
+        self.hot_paths = hot_paths
+        self.profiler.mark("window created")
+        self.backend = backend if backend is not None else create_backend()
+        if self.backend is None:
+            raise RuntimeError("No shutdown backend is available on this platform.")
+        if state_path is None:
+            name = STATE_FILE_NAME if self.backend.name == "windows" else f"state-{self.backend.name}.dat"
+            state_path = os.path.join(state_dir(), name)
+        self.store = StateStore(state_path)
+        self._persist_timer = QTimer(self)
+        self._persist_timer.setSingleShot(True)
+        self._persist_timer.timeout.connect(self.save_state)
+        self.time_format_mode = self.saved_setting("time_format", '24')
+        if self.time_format_mode not in ('24', '12'):
+            self.time_format_mode = '24'
+        # The first saved_setting() above read the state file.
+        self.profiler.mark("state loaded")
+        self.color_palette = DEFAULT_PALETTE
+        self.styles = StyleManager()
+        self.assets = load_asset_bundle()
+        self.icons = PeriodIconCache(bundle=self.assets, on_error=self.on_asset_error)
+        self._icon_key = None
+        self._time_strings = {}
+        self.system_log = SystemLog()
+        self._log_flush_pending = False
+        log_file = log_file or os.environ.get(LOG_FILE_ENV_VAR)
+        if log_file:
+            self.system_log.open_file(log_file)
+        self.startup_complete = False
+        self.instance_server = None
+        self.instance_command.connect(self.on_instance_command)
+        self.idle_watcher = None
+        self.idle_sampled.connect(self.on_idle_sampled)
+        self.idle_reached.connect(self.on_idle_reached)
+        self.tray_mode = False
+        self.tray_icon = None
+        self.hooks = None
+        self.hook_run = None
+        self._hook_key = None
+        self._hook_timer = QTimer(self)
+        self._hook_timer.setSingleShot(True)
+        self._hook_timer.timeout.connect(self.arm_hooks)
+        self.hook_output.connect(self.on_hook_output)
+        self.hook_result.connect(self.on_hook_result)
+        self.hooks_finished.connect(self.on_hooks_finished)
         self.initUI()
+        self.profiler.mark("critical UI built")
 
     def get_time_period(self, time_obj=None):
         if time_obj is None:
             time_obj = datetime.now()
-        hour = time_obj.hour
-        if 5 <= hour < 8:
-            return "morning"
-        elif 8 <= hour < 19:
-            return "day"
-        elif 19 <= hour < 22:
-            return "evening"
-        else:
-            return "night"
+        return self.color_palette.at(time_obj).period
 
     def get_smooth_colors(self, time_obj=None):
         if time_obj is None:
             time_obj = datetime.now()
-        hour = time_obj.hour
-        minute = time_obj.minute
-        total_minutes = hour * 60 + minute
-        morning_start = 5 * 60
-        morning_end = 5 * 60 + COLOR_TRANSITION_MINUTES
-        day_start = 8 * 60
-        day_end = 8 * 60 + COLOR_TRANSITION_MINUTES
-        evening_start = 19 * 60
-        evening_end = 19 * 60 + COLOR_TRANSITION_MINUTES
-        night_start = 22 * 60
-        night_end = 22 * 60 + COLOR_TRANSITION_MINUTES
-        if total_minutes < morning_start:
-            bg_color = NIGHT_COLOR; text_color = (255, 255, 255)
-        elif total_minutes < morning_end:
-            progress = (total_minutes - morning_start) / COLOR_TRANSITION_MINUTES
-            bg_color = self.interpolate_color(NIGHT_COLOR, MORNING_COLOR, progress)
-            text_color = self.interpolate_color((255, 255, 255), (50, 50, 50), progress)
-        elif total_minutes < day_start:
-            bg_color = MORNING_COLOR; text_color = (50, 50, 50)
-        elif total_minutes < day_end:
-            progress = (total_minutes - day_start) / COLOR_TRANSITION_MINUTES
-            bg_color = self.interpolate_color(MORNING_COLOR, DAY_COLOR, progress); text_color = (50, 50, 50)
-        elif total_minutes < evening_start:
-            bg_color = DAY_COLOR; text_color = (50, 50, 50)
-        elif total_minutes < evening_end:
-            progress = (total_minutes - evening_start) / COLOR_TRANSITION_MINUTES
-            bg_color = self.interpolate_color(DAY_COLOR, EVENING_COLOR, progress); text_color = self.interpolate_color((50, 50, 50), (255, 255, 255), progress)
-        elif total_minutes < night_start:
-            bg_color = EVENING_COLOR; text_color = (255, 255, 255)
-        elif total_minutes < night_end:
-            progress = (total_minutes - night_start) / COLOR_TRANSITION_MINUTES
-            bg_color = self.interpolate_color(EVENING_COLOR, NIGHT_COLOR, progress); text_color = (255, 255, 255)
-        else:
-            bg_color = NIGHT_COLOR; text_color = (255, 255, 255)
-        return bg_color, text_color
+        entry = self.color_palette.at(time_obj)
+        return entry.bg, entry.text
 
-    def get_smooth_slider_color(self, time_obj=None):
-        if time_obj is None:
-            time_obj = datetime.now()
-        hour = time_obj.hour; minute = time_obj.minute; total_minutes = hour * 60 + minute
-        morning_start = 5 * 60; morning_end = 5 * 60 + COLOR_TRANSITION_MINUTES
-        day_start = 8 * 60; day_end = 8 * 60 + COLOR_TRANSITION_MINUTES
-        evening_start = 19 * 60; evening_end = 19 * 60 + COLOR_TRANSITION_MINUTES
-        night_start = 22 * 60; night_end = 22 * 60 + COLOR_TRANSITION_MINUTES
-        if total_minutes < morning_start:
-            return (100, 100, 200)
-        elif total_minutes < morning_end:
-            progress = (total_minutes - morning_start) / COLOR_TRANSITION_MINUTES
-            return self.interpolate_color((100, 100, 200), ORANGE_COLOR, progress)
-        elif total_minutes < day_start:
-            return ORANGE_COLOR
-        elif total_minutes < day_end:
-            progress = (total_minutes - day_start) / COLOR_TRANSITION_MINUTES
-            return self.interpolate_color(ORANGE_COLOR, BLUE_COLOR, progress)
-        elif total_minutes < evening_start:
-            return BLUE_COLOR
-        elif total_minutes < evening_end:
-            progress = (total_minutes - evening_start) / COLOR_TRANSITION_MINUTES
-            return self.interpolate_color(BLUE_COLOR, RED_COLOR, progress)
-        elif total_minutes < night_start:
-            return RED_COLOR
-        elif total_minutes < night_end:
-            progress = (total_minutes - night_start) / COLOR_TRANSITION_MINUTES
-            return self.interpolate_color(RED_COLOR, (100, 100, 200), progress)
-        else:
-            return (100, 100, 200)
-
-    def get_icon_for_period(self, period):
-        if period == "morning": return self.morning_icon
-        if period == "day": return self.day_icon
-        if period == "evening": return self.evening_icon
-        return self.night_icon
-
-    def create_icon(self, path):
-        return QIcon(path)
+    def set_period_icon(self, period):
+        dpr = self.icon_label.devicePixelRatioF()
+        key = (period, dpr)
+        if key == self._icon_key:
+            return
+        self.icon_label.setPixmap(self.icons.pixmap(period, dpr))
+        self._icon_key = key
 
-    def interpolate_color(self, color1, color2, factor):
-        r = int(color1[0] * (1 - factor) + color2[0] * factor)
-        g = int(color1[1] * (1 - factor) + color2[1] * factor)
-        b = int(color1[2] * (1 - factor) + color2[2] * factor)
-        return r, g, b
+    def on_asset_error(self, message):
+        self.log_message(message, "WARNING")
 
-    def rgb_to_string(self, rgb_tuple):
-        return f"rgb({rgb_tuple[0]}, {rgb_tuple[1]}, {rgb_tuple[2]})"
+    def app_icon(self):
+        if self.assets is None or "app-icon" not in self.assets:
+            return QIcon(resource_path("assets/icons/icon.ico"))
+        icon = QIcon()
+        for size in self.assets.sizes("app-icon"):
+            icon.addPixmap(QPixmap.fromImage(QImage.fromData(self.assets.blob("app-icon", size).tobytes(), ENTRY_FORMAT)))
+        return icon
 
     def get_shutdown_time(self, offset_minutes=None):
         if offset_minutes is None:
             offset_minutes = self.time_input.value()
         return datetime.now() + timedelta(minutes=offset_minutes)
 
-    def update_label_text_color(self, label, color_rgb):
-        current_style = label.styleSheet()
-        style_parts = []
-        for part in current_style.split(';'):
-            if part.strip() and not part.strip().startswith('color:'):
-                style_parts.append(part.strip())
-        style_parts.append(f'color: {self.rgb_to_string(color_rgb)}')
-        label.setStyleSheet('; '.join(style_parts) + ';')
-
-    def update_tick_label_colors(self, color_rgb):
-        if not hasattr(self, 'ticks_layout'):
-            return
-        color_str = self.rgb_to_string(color_rgb)
-        for i in range(self.ticks_layout.count()):
-            item = self.ticks_layout.itemAt(i)
-            if item:
-                w = item.widget()
-                if isinstance(w, QLabel):
-                    w.setStyleSheet(f"color: {color_str}; font-size: 12px;")
-
     def format_time(self, dt: datetime) -> str:
-        if self.time_format_mode == '12':
-            return dt.strftime('%I:%M %p').lstrip('0')
-        return dt.strftime('%H:%M')
+        return self.format_minute(dt.hour * 60 + dt.minute)
+
+    def format_minute(self, total_minutes):
+        key = (total_minutes % MINUTES_IN_DAY, self.time_format_mode)
+        text = self._time_strings.get(key)
+        if text is None:
+            dt = datetime(2000, 1, 1, key[0] // 60, key[0] % 60)
+            if self.time_format_mode == '12':
+                text = dt.strftime('%I:%M %p').lstrip('0')
+            else:
+                text = dt.strftime('%H:%M')
+            self._time_strings[key] = text
+        return text
 
     def on_time_format_changed(self, index):
         chosen = self.time_format_combo.currentData()
         if chosen in ('24', '12'):
             self.time_format_mode = chosen
-            self.update_time_label(self.time_input.value())
-            self.update_slider_labels()
+            self.time_input.invalidate_labels()
+            self.render_scheduler.invalidate(RenderScheduler.LABEL | RenderScheduler.TICKS)
+            self.persist()
 
     def on_opacity_changed(self, value):
         new_opacity = value / 100.0
         self.setWindowOpacity(new_opacity)
         if hasattr(self, 'opacity_value_label'):
             self.opacity_value_label.setText(f"Opacity: {value}%")
+        self.persist()
 
     def initUI(self):
         self.setWindowTitle('Modern Shutdown Scheduler')
         self.setFixedSize(WINDOW_WIDTH, WINDOW_HEIGHT)
-        self.setWindowOpacity(WINDOW_OPACITY)
+        self.setWindowOpacity(self.saved_opacity() / 100.0)
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
 
-        app_icon_path = resource_path("assets/icons/icon.ico")
-        self.setWindowIcon(QIcon(app_icon_path))
+        self.setWindowIcon(self.app_icon())
+        self.render_scheduler = RenderScheduler(self, self.render)
+        self.build_view()
+
+        
+        self.clock = ClockService(self)
+        self.clock.minute_changed.connect(self.check_minute_change)
+        self.clock.countdown_changed.connect(self.update_progress)
+        self.clock.start()
+        self.last_minute = datetime.now().minute
+
+        self.shutdown_worker = ShutdownWorker(self.backend, self)
+        self.shutdown_worker.finished.connect(self.on_shutdown_job_finished)
 
+        self.jobs = JobScheduler(self)
+        self.jobs.job_due.connect(self.on_job_due)
+        self.jobs.changed.connect(self.on_jobs_changed)
+        self.clock.minute_changed.connect(self.jobs.rearm)
+        self._progress_job = None
+        self._system_job = None
+        if self.backend.name != "windows":
+            self.log_message(f"Using the {self.backend.name} shutdown backend; no real shutdown will happen.")
+        self.restore_state()
+        self.background.apply_palette()
+
+        self.background.installEventFilter(self)
+
+    def build_view(self):
+        """Builds the widgets shown before the first frame. The rest follow
+        in build_deferred_view(); release_view() tears both down."""
         self.setStyleSheet(Styles.MAIN_WINDOW)
 
-        central_widget = QWidget()
-        central_widget.setStyleSheet(Styles.CENTRAL_WIDGET)
+        central_widget = self.background = BackgroundWidget()
         self.setCentralWidget(central_widget)
         layout = QVBoxLayout(central_widget)
         layout.setSpacing(18)
@@ -312,36 +1375,20 @@ class ShutdownApp(QMainWindow):
         title_bar = QHBoxLayout()
         title_bar.setContentsMargins(0, 0, 0, 0)
         title_bar.addStretch()
+        self.tray_button = QPushButton('🔽')
+        self.tray_button.setToolTip("Hide to the system tray and free the window's memory")
+        self.tray_button.setVisible(QSystemTrayIcon.isSystemTrayAvailable())
+        self.tray_button.clicked.connect(self.enter_tray_mode)
+        title_bar.addWidget(self.tray_button)
         self.close_button = QPushButton('❌')
         self.close_button.clicked.connect(self.close)
         title_bar.addWidget(self.close_button)
         layout.addLayout(title_bar)
 
         
-        settings_row = QHBoxLayout()
-        settings_row.setContentsMargins(0, 0, 0, 0)
-
-        tf_label = QLabel('Time Format:')
-        tf_label.setStyleSheet('font-size: 12px;')
-        settings_row.addWidget(tf_label)
-        self.time_format_combo = QComboBox()
-        self.time_format_combo.addItem('24-hour', userData='24')
-        self.time_format_combo.addItem('12-hour (AM/PM)', userData='12')
-        self.time_format_combo.currentIndexChanged.connect(self.on_time_format_changed)
-        self.time_format_combo.setCurrentIndex(0)
-        settings_row.addWidget(self.time_format_combo)
-
-        self.opacity_value_label = QLabel(f'Opacity: {int(WINDOW_OPACITY*100)}%')
-        self.opacity_value_label.setStyleSheet('font-size: 12px;')
-        settings_row.addWidget(self.opacity_value_label)
-        self.opacity_slider = QSlider(Qt.Orientation.Horizontal)
-        self.opacity_slider.setRange(50, 100)
-        self.opacity_slider.setValue(int(WINDOW_OPACITY * 100))
-        self.opacity_slider.setFixedWidth(140)
-        self.opacity_slider.valueChanged.connect(self.on_opacity_changed)
-        settings_row.addWidget(self.opacity_slider)
-        settings_row.addStretch()
-        layout.addLayout(settings_row)
+        self.settings_row = QHBoxLayout()
+        self.settings_row.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(self.settings_row)
 
         
         self.app_name_label = QLabel('☀️Modern Shutdown Scheduler🌑')
@@ -355,16 +1402,9 @@ class ShutdownApp(QMainWindow):
         layout.addWidget(self.progress)
 
         
-        self.morning_icon = self.create_icon(resource_path("assets/images/morning.png"))
-        self.day_icon = self.create_icon(resource_path("assets/images/day.png"))
-        self.evening_icon = self.create_icon(resource_path("assets/images/evening.png"))
-        self.night_icon = self.create_icon(resource_path("assets/images/night.png"))
-        current_period = self.get_time_period(datetime.now())
-        icon = self.get_icon_for_period(current_period)
         self.icon_label = QLabel()
         self.icon_label.setFixedSize(ICON_SIZE, ICON_SIZE)
         self.icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.icon_label.setPixmap(icon.pixmap(ICON_SIZE, ICON_SIZE).scaled(ICON_SIZE, ICON_SIZE, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
         icon_hbox = QHBoxLayout()
         icon_hbox.addStretch()
         icon_hbox.addWidget(self.icon_label)
@@ -383,26 +1423,35 @@ class ShutdownApp(QMainWindow):
         slider_layout.setContentsMargins(0, 0, 0, 0)
         slider_label = QLabel('Pick shutdown time:')
         slider_layout.addWidget(slider_label)
-        self.time_input = QSlider(Qt.Orientation.Horizontal)
-        self.time_input.setRange(1, MINUTES_IN_DAY)
-        self.time_input.setValue(DEFAULT_SHUTDOWN_OFFSET)
-        self.time_input.setTickInterval(60)
-        self.time_input.setSingleStep(1)
-        self.time_input.setPageStep(60)
-        self.time_input.setTickPosition(QSlider.TickPosition.TicksBelow)
-        self.time_input.valueChanged.connect(self.update_time_label)
+        self.time_input = TimelinePicker(self.color_palette, self.format_minute,
+                                         zoom=self.saved_setting("timeline_zoom", DEFAULT_TIMELINE_ZOOM))
+        self.time_input.setValue(self.saved_setting("offset", DEFAULT_SHUTDOWN_OFFSET))
+        self.time_input.valueChanged.connect(self.on_time_input_changed)
+        self.background.textColorChanged.connect(self.time_input.set_text_color)
+        self.background.accentChanged.connect(self.time_input.set_accent)
+        self.time_input.zoomChanged.connect(self.persist)
         slider_layout.addWidget(self.time_input)
-        self.slider_ticks = QWidget()
-        self.ticks_layout = QHBoxLayout(self.slider_ticks)
-        self.ticks_layout.setContentsMargins(0, 0, 0, 0)
-        self.ticks_layout.setSpacing(0)
-        self.update_slider_labels()
-        slider_layout.addWidget(self.slider_ticks)
         layout.addWidget(slider_container)
-        self.update_time_label(self.time_input.value())
+        self.profiler.mark("critical widgets")
+        self.render(RenderScheduler.ALL)
+        self.profiler.mark("first render")
 
         
-        self.shutdown_button = QPushButton('Schedule Shutdown')
+        action_row = QHBoxLayout()
+        action_row.addStretch()
+        action_row.addWidget(QLabel('Action:'))
+        self.action_combo = QComboBox()
+        for action, label in ACTIONS.items():
+            self.action_combo.addItem(label, userData=action)
+        self.action_combo.setCurrentIndex(max(0, self.action_combo.findData(self.saved_setting("action", "shutdown"))))
+        self.action_combo.currentIndexChanged.connect(self.on_action_changed)
+        action_row.addWidget(self.action_combo)
+        action_row.addStretch()
+        layout.addLayout(action_row)
+        self.repeat_row = QVBoxLayout()
+        self.repeat_row.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(self.repeat_row)
+        self.shutdown_button = QPushButton(f"Schedule {self.action_combo.currentText()}")
         self.shutdown_button.clicked.connect(self.initiate_shutdown)
         self.shutdown_button.setStyleSheet(Styles.SHUTDOWN_BUTTON)
         layout.addWidget(self.shutdown_button, alignment=Qt.AlignmentFlag.AlignCenter)
@@ -412,85 +1461,231 @@ class ShutdownApp(QMainWindow):
         layout.addWidget(self.cancel_button, alignment=Qt.AlignmentFlag.AlignCenter)
 
         
-        console_label = QLabel('System Log:')
-        layout.addWidget(console_label)
-        self.console = QTextEdit()
-        self.console.setReadOnly(True)
-        self.console.setMaximumHeight(120)
-        layout.addWidget(self.console)
+        self.main_layout = layout
 
         
         self.offset = None
         central_widget.mousePressEvent = self.mousePressEvent
         central_widget.mouseMoveEvent = self.mouseMoveEvent
 
-        
-        self.dynamic_timer = QTimer(self)
-        self.dynamic_timer.timeout.connect(self.check_minute_change)
-        self.dynamic_timer.start(1000)
-        self.last_minute = datetime.now().minute
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint and obj is self.centralWidget() and not self.startup_complete:
+            obj.removeEventFilter(self)
+            self.profiler.mark("first frame")
+            QTimer.singleShot(0, self.finish_startup)
+        return super().eventFilter(obj, event)
 
-    def update_background_color(self):
-        now = datetime.now()
-        offset_minutes = self.time_input.value() if hasattr(self, 'time_input') else DEFAULT_SHUTDOWN_OFFSET
-        target_time = now + timedelta(minutes=offset_minutes)
-        
-        bg_color, text_color = self.get_smooth_colors(target_time)
-        slider_color = self.get_smooth_slider_color(target_time)
+    def finish_startup(self):
+        if self.startup_complete:
+            return
+        self.startup_complete = True
+        self.build_deferred_view()
+        if self.hot_paths is not None:
+            self.log_message(f"Hot-path timing is on; press {HOT_PATHS_OVERLAY_KEY} to show it.")
+        self.profiler.mark("deferred UI built")
+        self.resume_system_job()
+        self.load_hooks()
+        dpr = self.icon_label.devicePixelRatioF()
+        for period in PeriodIconCache.PATHS:
+            self.icons.pixmap(period, dpr)
+        self.color_palette.compile()
+        self.profiler.mark("caches warmed")
+        self.startup_finished.emit()
 
-        color_style = f"background: {self.rgb_to_string(bg_color)}; border-radius: 32px;"
-        text_color_str = self.rgb_to_string(text_color)
-        self.centralWidget().setStyleSheet(f"{color_style} color: {text_color_str};")
+    def build_deferred_view(self):
+        self.build_settings_row()
+        self.build_repeat_row()
+        self.build_idle_row()
+        self.build_console()
+        if self.hot_paths is not None:
+            self.build_hot_path_overlay()
+        self.background.apply_palette()
 
-        if hasattr(self, 'app_name_label'):
-            self.app_name_label.setStyleSheet(f'font-size: 24px; font-weight: bold; color: {text_color_str}; margin-bottom: 16px;')
-        
-        self.update_tick_label_colors(text_color)
+    def build_settings_row(self):
+        settings_row = self.settings_row
+        tf_label = QLabel('Time Format:')
+        tf_label.setStyleSheet('font-size: 12px;')
+        settings_row.addWidget(tf_label)
+        self.time_format_combo = QComboBox()
+        self.time_format_combo.addItem('24-hour', userData='24')
+        self.time_format_combo.addItem('12-hour (AM/PM)', userData='12')
+        self.time_format_combo.setCurrentIndex(self.time_format_combo.findData(self.time_format_mode))
+        self.time_format_combo.currentIndexChanged.connect(self.on_time_format_changed)
+        settings_row.addWidget(self.time_format_combo)
 
-        slider_color_str = self.rgb_to_string(slider_color)
-        if hasattr(self, 'time_input'):
-            self.time_input.setStyleSheet(f"QSlider::handle:horizontal {{ background: {slider_color_str}; border: 2px solid #fff; width: 16px; height: 16px; margin: -6px 0; border-radius: 8px; }} QSlider::sub-page:horizontal {{ background: {slider_color_str}; border-radius: 6px; }} QSlider::groove:horizontal {{ border: none; height: 12px; background: rgba(255,255,255,0.12); border-radius: 6px; }}")
+        opacity = self.saved_opacity()
+        self.opacity_value_label = QLabel(f'Opacity: {opacity}%')
+        self.opacity_value_label.setStyleSheet('font-size: 12px;')
+        settings_row.addWidget(self.opacity_value_label)
+        self.opacity_slider = QSlider(Qt.Orientation.Horizontal)
+        self.opacity_slider.setRange(50, 100)
+        self.opacity_slider.setValue(opacity)
+        self.opacity_slider.setFixedWidth(140)
+        self.opacity_slider.valueChanged.connect(self.on_opacity_changed)
+        settings_row.addWidget(self.opacity_slider)
+        settings_row.addStretch()
+        fleet_button = QPushButton('Fleet...')
+        fleet_button.clicked.connect(self.show_fleet_dialog)
+        settings_row.addWidget(fleet_button)
+
+    def show_fleet_dialog(self):
+        if not hasattr(self, 'fleet_dialog'):
+            self.fleet_dialog = FleetDialog(self)
+        self.fleet_dialog.show()
+        self.fleet_dialog.raise_()
+
+    def build_repeat_row(self):
+        controls = QHBoxLayout()
+        controls.addStretch()
+        controls.addWidget(QLabel('Repeat:'))
+        self.repeat_combo = QComboBox()
+        for mode, label in REPEAT_MODES.items():
+            self.repeat_combo.addItem(label, userData=mode)
+        self.repeat_combo.setCurrentIndex(max(0, self.repeat_combo.findData(self.saved_setting("repeat", "once"))))
+        self.repeat_combo.currentIndexChanged.connect(self.on_repeat_changed)
+        self.repeat_combo.currentIndexChanged.connect(self.persist)
+        controls.addWidget(self.repeat_combo)
+        self.cron_input = QLineEdit(self.saved_setting("cron", ""))
+        self.cron_input.setPlaceholderText('30 22 * * 1-5')
+        self.cron_input.setFixedWidth(140)
+        self.cron_input.textChanged.connect(self.update_repeat_preview)
+        self.cron_input.textChanged.connect(self.persist)
+        controls.addWidget(self.cron_input)
+        self.skip_dates_input = QLineEdit(self.saved_setting("skip_dates", ""))
+        self.skip_dates_input.setPlaceholderText('Skip dates: 2026-12-24, 2026-12-31')
+        self.skip_dates_input.setFixedWidth(220)
+        self.skip_dates_input.textChanged.connect(self.update_repeat_preview)
+        self.skip_dates_input.textChanged.connect(self.persist)
+        controls.addWidget(self.skip_dates_input)
+        controls.addStretch()
+        self.repeat_row.addLayout(controls)
+        self.repeat_preview = QLabel('')
+        self.repeat_preview.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.repeat_preview.setStyleSheet('font-size: 12px;')
+        self.repeat_row.addWidget(self.repeat_preview)
+        self.on_repeat_changed()
+
+    def build_idle_row(self):
+        controls = QHBoxLayout()
+        controls.addStretch()
+        self.idle_checkbox = QCheckBox('Run the action when idle for')
+        controls.addWidget(self.idle_checkbox)
+        self.idle_minutes_input = QSpinBox()
+        self.idle_minutes_input.setRange(1, 12 * 60)
+        self.idle_minutes_input.setSuffix(' min')
+        self.idle_minutes_input.setValue(min(max(self.saved_setting("idle_minutes", DEFAULT_IDLE_MINUTES), 1), 12 * 60))
+        self.idle_minutes_input.valueChanged.connect(self.on_idle_minutes_changed)
+        controls.addWidget(self.idle_minutes_input)
+        controls.addStretch()
+        self.repeat_row.addLayout(controls)
+        self.idle_status = QLabel('')
+        self.idle_status.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.idle_status.setStyleSheet('font-size: 12px;')
+        self.idle_status.setVisible(False)
+        self.repeat_row.addWidget(self.idle_status)
+        self.idle_checkbox.setChecked(self.saved_setting("idle_enabled", False))
+        self.idle_checkbox.toggled.connect(self.on_idle_toggled)
+        self.idle_checkbox.toggled.connect(self.persist)
+        if self.idle_checkbox.isChecked():
+            self.on_idle_toggled(True)
+
+    def build_console(self):
+        console_label = QLabel('System Log:')
+        self.main_layout.addWidget(console_label)
+        self.console = QPlainTextEdit()
+        self.console.setReadOnly(True)
+        self.console.setMaximumHeight(120)
+        self.console.setMaximumBlockCount(self.system_log.capacity)
+        self.main_layout.addWidget(self.console)
+        # A console rebuilt after tray mode starts empty, so fill it from
+        # everything the log still holds, not just the unflushed tail.
+        self.system_log.drain()
+        records = self.system_log.records()
+        if records:
+            self.console.appendPlainText("\n".join(format_record(r) for r in records))
+
+    def build_hot_path_overlay(self):
+        self.hot_path_overlay = QLabel(self.centralWidget())
+        self.hot_path_overlay.setStyleSheet(
+            "background: rgba(0, 0, 0, 220); color: #9f9; font-family: 'Consolas', monospace;"
+            " font-size: 11px; padding: 8px; border-radius: 8px;")
+        self.hot_path_overlay.setTextInteractionFlags(Qt.TextInteractionFlag.NoTextInteraction)
+        self.hot_path_overlay.setVisible(False)
+        self._hot_path_timer = QTimer(self.hot_path_overlay)
+        self._hot_path_timer.setInterval(HOT_PATHS_REFRESH_MS)
+        self._hot_path_timer.timeout.connect(self.refresh_hot_path_overlay)
+        shortcut = QShortcut(QKeySequence(HOT_PATHS_OVERLAY_KEY), self.background)
+        shortcut.activated.connect(self.toggle_hot_path_overlay)
+
+    def toggle_hot_path_overlay(self):
+        if not hasattr(self, 'hot_path_overlay'):
+            return
+        visible = not self.hot_path_overlay.isVisible()
+        if visible:
+            self.refresh_hot_path_overlay()
+            self._hot_path_timer.start()
+        else:
+            self._hot_path_timer.stop()
+        self.hot_path_overlay.setVisible(visible)
+        self.hot_path_overlay.raise_()
+
+    def refresh_hot_path_overlay(self):
+        self.hot_path_overlay.setText(f"<pre>{html.escape(self.hot_paths.report())}</pre>")
+        self.hot_path_overlay.adjustSize()
+        self.hot_path_overlay.move(12, 12)
+
+    def update_background_color(self, entry=None):
+        if entry is None:
+            offset_minutes = self.time_input.value() if hasattr(self, 'time_input') else DEFAULT_SHUTDOWN_OFFSET
+            entry = self.color_palette.at(datetime.now() + timedelta(minutes=offset_minutes))
+
+        self.background.set_theme(entry.bg, entry.text, entry.slider)
 
     def update_sun_moon_animation(self, value):
         try:
-            now = datetime.now()
-            target_time = now + timedelta(minutes=value)
-            target_period = self.get_time_period(target_time)
-            icon = self.get_icon_for_period(target_period)
-            self.icon_label.setPixmap(icon.pixmap(ICON_SIZE, ICON_SIZE).scaled(ICON_SIZE, ICON_SIZE, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+            target_time = datetime.now() + timedelta(minutes=value)
+            self.set_period_icon(self.get_time_period(target_time))
         except Exception as e:
-            self.log_message(f"Error in icon animation: {str(e)}")
+            self.log_message(f"Error in icon animation: {str(e)}", "ERROR")
 
-    def update_time_label(self, value):
+    def on_time_input_changed(self, value):
+        self.render_scheduler.invalidate(RenderScheduler.LABEL | RenderScheduler.COLORS | RenderScheduler.ICON)
+        self.persist()
+
+    def render(self, flags, value=None):
+        if not hasattr(self, 'time_input'):
+            return
+        if value is None:
+            value = self.time_input.value()
         target = self.get_shutdown_time(value)
-        text = f"Shutdown at {self.format_time(target)}"
-        self.time_value_label.setText(text)
-        self.update_background_color()
-        _, text_color = self.get_smooth_colors(target)
-        text_color_str = f'font-size: 18px; font-weight: 600; color: {self.rgb_to_string(text_color)}; margin-bottom: 8px;'
-        self.time_value_label.setStyleSheet(text_color_str)
-        self.update_sun_moon_animation(value)
+        entry = self.color_palette.at(target)
+        if flags & RenderScheduler.TICKS:
+            self.rebuild_slider_labels()
+        if flags & RenderScheduler.LABEL:
+            when = self.format_time(target) if value < MINUTES_IN_DAY else self.format_occurrence(target)
+            self.time_value_label.setText(f"Shutdown at {when}")
+            self.update_repeat_preview()
+        if flags & RenderScheduler.COLORS:
+            self.update_background_color(entry)
+        if flags & RenderScheduler.ICON:
+            self.update_sun_moon_animation(value)
+
+    def update_time_label(self, value):
+        self.render(RenderScheduler.LABEL | RenderScheduler.COLORS | RenderScheduler.ICON, value)
 
     def update_slider_labels(self):
-        while self.ticks_layout.count():
-            item = self.ticks_layout.takeAt(0)
-            widget = item.widget()
-            if widget: widget.deleteLater()
-        for i in range(SLIDER_TICK_COUNT):
-            offset = int(i * MINUTES_IN_DAY / (SLIDER_TICK_COUNT - 1))
-            label_dt = datetime.now() + timedelta(minutes=offset)
-            label = QLabel(self.format_time(label_dt))
-            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            
-            label.setStyleSheet("font-size: 12px;")
-            self.ticks_layout.addWidget(label, 1)
-        self.update_background_color()
+        self.render(RenderScheduler.TICKS | RenderScheduler.COLORS)
+
+    def rebuild_slider_labels(self):
+        self.time_input.set_origin(datetime.now())
 
     def check_minute_change(self):
+        if self.tray_mode:
+            self.update_tray()
+            return
         current_minute = datetime.now().minute
         if current_minute != self.last_minute:
-            self.update_time_label(self.time_input.value())
-            self.update_slider_labels()
+            self.render_scheduler.invalidate(RenderScheduler.ALL)
             self.last_minute = current_minute
 
     def mousePressEvent(self, event):
@@ -503,78 +1698,697 @@ class ShutdownApp(QMainWindow):
             self.move(event.globalPosition().toPoint() - self.offset)
             event.accept()
 
-    def initiate_shutdown(self):
+    def on_action_changed(self, index):
+        self.shutdown_button.setText(f"Schedule {self.action_combo.currentText()}")
+        self.persist()
+
+    def on_repeat_changed(self, index=None):
+        mode = self.repeat_combo.currentData()
+        self.cron_input.setVisible(mode == "custom")
+        self.skip_dates_input.setVisible(mode != "once")
+        self.repeat_preview.setVisible(mode != "once")
+        self.update_repeat_preview()
+
+    def current_rule(self):
+        """Returns the compiled rule for the repeat controls, or None for a
+        one-off job. Raises ValueError for an invalid expression or date."""
+        mode = self.repeat_combo.currentData() if hasattr(self, 'repeat_combo') else "once"
+        if mode == "once":
+            return None
+        if mode == "custom":
+            expression = self.cron_input.text()
+        else:
+            target = self.get_shutdown_time()
+            template = DAILY if mode == "daily" else WEEKDAYS
+            expression = template.format(hour=target.hour, minute=target.minute)
+        return compile_rule(expression, parse_exclusions(self.skip_dates_input.text()))
+
+    def format_occurrence(self, dt):
+        return f"{dt:%a %d %b} {self.format_time(dt)}"
+
+    def update_repeat_preview(self):
+        if not hasattr(self, 'repeat_preview') or not self.repeat_preview.isVisibleTo(self):
+            return
+        try:
+            rule = self.current_rule()
+        except ValueError as e:
+            self.repeat_preview.setText(f"Invalid rule: {e}")
+            return
+        fires = rule.preview(datetime.now(), PREVIEW_COUNT)
+        if fires:
+            self.repeat_preview.setText("Next: " + " · ".join(self.format_occurrence(dt) for dt in fires))
+        else:
+            self.repeat_preview.setText("This rule never fires.")
+
+    def on_idle_toggled(self, checked):
+        if not checked:
+            if self.idle_watcher is not None:
+                self.idle_watcher.stop()
+            self.idle_status.setVisible(False)
+            return
+        if self.idle_watcher is None:
+            source = create_metrics_source()
+            if source is None:
+                self.log_message("Idle detection is not supported on this system.", "WARNING")
+                self.idle_checkbox.setChecked(False)
+                return
+            detector = IdleDetector(source, self.idle_minutes_input.value() * 60)
+            self.idle_watcher = IdleWatcher(detector, self.idle_sampled.emit, self.idle_reached.emit)
+        if self.idle_watcher.is_running():
+            # The window was rebuilt from the tray; the watcher kept going.
+            self.idle_status.setVisible(True)
+            return
+        self.idle_watcher.start()
+        self.idle_status.setText("Waiting for the first sample...")
+        self.idle_status.setVisible(True)
+        self.log_message(f"Watching for {self.idle_minutes_input.value()} idle minutes.")
+
+    def on_idle_minutes_changed(self, minutes):
+        if self.idle_watcher is not None:
+            self.idle_watcher.detector.idle_seconds = minutes * 60
+        self.persist()
+
+    def on_idle_sampled(self, sample):
+        if not hasattr(self, 'idle_checkbox') or not self.idle_checkbox.isChecked():
+            return
+        state = f"Idle for {int(sample.idle_seconds // 60)} min" if sample.idle_seconds > 0 else "Busy"
+        self.idle_status.setText(
+            f"{state} · CPU {sample.cpu_percent:.0f}% · disk {sample.disk_rate / 1024:.0f} KB/s · "
+            f"network {sample.net_rate / 1024:.0f} KB/s"
+        )
+
+    def on_idle_reached(self):
+        if hasattr(self, 'idle_checkbox'):
+            if not self.idle_checkbox.isChecked():
+                return
+            self.idle_checkbox.setChecked(False)
+            action = self.action_combo.currentData()
+        else:
+            if not self.saved_setting("idle_enabled", False):
+                return
+            self.store.state["settings"]["idle_enabled"] = False
+            self.persist()
+            action = self.saved_setting("action", "shutdown")
+        minutes = int(self.idle_watcher.detector.idle_seconds // 60)
+        self.log_message(f"Idle for {minutes} minutes.")
+        target_time = datetime.now() + timedelta(seconds=IDLE_GRACE_SECONDS)
+        self.schedule_job(action, target_time, IDLE_GRACE_SECONDS, note=f"Idle for {minutes} minutes")
+
+    def initiate_shutdown(self, action=None):
+        if not action:
+            action = self.action_combo.currentData()
+        try:
+            rule = self.current_rule()
+        except ValueError as e:
+            self.log_message(f"Invalid repeat rule: {e}", "WARNING")
+            QMessageBox.warning(self, "Warning", f"Invalid repeat rule: {e}")
+            return None
+        if rule is not None:
+            return self.schedule_recurring(action, rule)
+        target_time, seconds_until = shutdown_target(self.time_input.value())
+        return self.schedule_job(action, target_time, seconds_until)
+
+    def schedule_recurring(self, action, rule, note=""):
         try:
-            res = subprocess.run(["shutdown", "/a"], capture_output=True, creationflags=subprocess.CREATE_NO_WINDOW)
-            if res.returncode == 0:
-                self.log_message("A shutdown was already pending and has been canceled.")
-            now = datetime.now()
-            offset_min = self.time_input.value()
-            target_time = now + timedelta(minutes=offset_min)
-            target_time = target_time.replace(second=0, microsecond=0)
-            seconds_until = int((target_time - now).total_seconds())
+            job = self.jobs.add_recurring(action, rule, note)
+        except ValueError as e:
+            self.log_message(f"Invalid repeat rule: {e}", "WARNING")
+            QMessageBox.warning(self, "Warning", f"Invalid repeat rule: {e}")
+            return None
+        next_fire = datetime.fromtimestamp(job.deadline)
+        self.log_message(f"Scheduled recurring {job.label.lower()} ({rule}), next at {self.format_occurrence(next_fire)}")
+        return job
+
+    def schedule_job(self, action, target_time, seconds_until=None, note=""):
+        if seconds_until is None:
+            seconds_until = int((target_time - datetime.now()).total_seconds())
+        job = self.jobs.add(action, target_time.timestamp(), note)
+        if action == "shutdown":
             self.log_message(
                 f"Initiating system shutdown at {self.format_time(target_time)} "
                 f"(in {seconds_until} seconds)"
             )
-            subprocess.run(["shutdown", "/s", "/t", str(seconds_until)], creationflags=subprocess.CREATE_NO_WINDOW)
-            self.progress.setVisible(True)
-            self.progress.setMaximum(seconds_until)
-            self.progress.setValue(0)
-            self.progress_timer = QTimer()
-            self.progress_timer.timeout.connect(self.update_progress)
-            self.progress_timer.start(1000)
-            self.progress_start_time = now
-            self.progress_end_time = target_time
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Error",
-                f"An error occurred: {str(e)}"
+        else:
+            self.log_message(
+                f"Scheduled {job.label.lower()} at {self.format_time(target_time)} "
+                f"(in {seconds_until} seconds)"
+            )
+        return job
+
+    def on_jobs_changed(self):
+        self.refresh_progress()
+        self.sync_system_job()
+        self.arm_hooks()
+        self.update_cancel_button()
+        self.persist()
+
+    def update_cancel_button(self):
+        if not hasattr(self, 'cancel_button'):
+            return
+        job = self.jobs.peek()
+        self.cancel_button.setText(f"Cancel {job.label if job is not None else 'Shutdown'}")
+
+    def sync_system_job(self):
+        job = self.jobs.peek(SYSTEM_ACTIONS)
+        current = self._system_job
+        if job is current:
+            return
+        # Once the current job's OS countdown has run out there is nothing to
+        # release, and aborting now could stop it; the next job is armed
+        # without an abort.
+        elapsed = current is not None and not current.active and current.deadline <= time.time()
+        self._system_job = job
+        if job is None:
+            if not elapsed:
+                self.shutdown_worker.submit("release", current, run_cancel)
+            return
+        seconds = max(0, int(job.deadline - time.time()))
+        self.shutdown_worker.submit("schedule", (job, None if elapsed else current), run_schedule,
+                                    seconds, job.action, not elapsed)
+
+    def load_hooks(self):
+        from shutdown_hooks import HookPipeline, load_pipeline
+        try:
+            self.hooks = load_pipeline()
+        except ValueError as e:
+            self.log_message(f"Pre-shutdown hooks disabled: {e}", "WARNING")
+            self.hooks = HookPipeline()
+        if self.hooks:
+            self.log_message(
+                f"Loaded {len(self.hooks)} pre-shutdown hook(s); "
+                f"they start {self.hooks.lead_time():.0f} seconds before a shutdown."
+            )
+        self.arm_hooks()
+
+    def arm_hooks(self):
+        """Starts the hooks once the next shutdown is within their lead time,
+        or arms a timer for that moment. Also stops a run whose shutdown was
+        canceled or moved."""
+        self._hook_timer.stop()
+        if not self.hooks:
+            return
+        job = self.jobs.peek(HOOK_ACTIONS)
+        key = None if job is None else (job.id, job.deadline)
+        if self.hook_run is not None and self.hook_run.is_running() and key != self._hook_key:
+            self.hook_run.cancel()
+            self.log_message("Pre-shutdown hooks stopped: the shutdown was canceled or moved.", "WARNING")
+        if job is None or key == self._hook_key:
+            return
+        remaining = job.deadline - time.time()
+        start_in = remaining - self.hooks.lead_time()
+        if start_in > 0:
+            self._hook_timer.start(min(int(start_in * 1000) + 1, MAX_JOB_TIMER_INTERVAL_MS))
+            return
+        self._hook_key = key
+        if remaining < self.hooks.lead_time() - 1:
+            self.log_message(
+                f"Only {max(0, int(remaining))} seconds left before the {job.label.lower()}; "
+                "pre-shutdown hooks may be cut short.",
+                "WARNING",
             )
+        self.log_message(f"Running {len(self.hooks)} pre-shutdown hook(s).")
+        self.hook_run = self.hooks.start(
+            max(0.0, remaining), self.hook_output.emit, self.hook_result.emit, self.hooks_finished.emit
+        )
+
+    def on_hook_output(self, name, line):
+        self.log_message(f"[{name}] {line}")
+
+    def on_hook_result(self, result):
+        message = f"Hook {result.name} {result.status} after {result.elapsed:.1f} s"
+        if result.error:
+            message += f" ({result.error})"
+        self.log_message(message, "INFO" if result.status == "ok" else "WARNING")
+
+    def on_hooks_finished(self, results):
+        from shutdown_hooks import format_report
+        lines = format_report(results, self.hooks)
+        if lines:
+            self.log_message("Pre-shutdown hook timings:\n" + "\n".join(lines))
+
+    def on_shutdown_job_finished(self, kind, context, result):
+        if kind == "schedule":
+            if isinstance(result, ShutdownResult):
+                # The backend raised, so there is no separate abort result.
+                result = (result, result)
+            self.on_schedule_finished(context, *result)
+        elif kind == "cancel":
+            self.on_cancel_finished(result)
+        elif kind == "release":
+            if not result.ok and result.error is not None:
+                self.log_message(f"Error: {result.error}", "ERROR")
+        elif kind == "forwarded-cancel":
+            if result.ok:
+                self.log_message("Shutdown has been canceled.")
+                context.respond(0, "Shutdown has been canceled.")
+            else:
+                context.respond(1, error=f"Error: {result.error}" if result.error is not None else NOTHING_TO_CANCEL)
+        elif kind == "execute":
+            if not result.ok:
+                self.log_message(f"Failed to {context.label.lower()}: {result.describe()}", "ERROR")
+
+    def on_schedule_finished(self, context, aborted, scheduled):
+        job, replaced = context
+        if aborted is not None and aborted.ok and replaced is None:
+            self.log_message("A shutdown was already pending and has been canceled.")
+        if scheduled.ok:
+            return
+        self.log_message(f"Failed to schedule {job.label.lower()}: {scheduled.describe()}", "ERROR")
+        if self._system_job is job:
+            self._system_job = None
+        self.jobs.cancel(job.id)
+        QMessageBox.critical(
+            self,
+            "Error",
+            f"An error occurred: {scheduled.describe()}"
+        )
+
+    def on_job_due(self, job):
+        if job.action in SYSTEM_ACTIONS:
+            self.log_message(f"{job.label} time reached.")
+        elif job.action == "reminder":
+            self.log_message(f"Reminder: {job.note or 'scheduled reminder'}")
+            if self.tray_mode:
+                self.tray_icon.showMessage("Reminder", job.note or "Scheduled reminder")
+                return
+            box = QMessageBox(QMessageBox.Icon.Information, "Reminder", job.note or "Scheduled reminder", parent=self)
+            box.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+            box.open()
+        else:
+            self.log_message(f"Starting {job.label.lower()}.")
+            self.shutdown_worker.submit("execute", job, run_action, job.action)
+
+    def refresh_progress(self):
+        if self.tray_mode:
+            self.update_tray()
+            return
+        job = self.jobs.peek()
+        if job is self._progress_job:
+            if job is not None:
+                self.update_progress()
+            return
+        self._progress_job = job
+        if job is None:
+            self.hide_progress_bar()
+            return
+        total = max(1, int(job.deadline - job.created))
+        self.progress_start_time = datetime.fromtimestamp(job.created)
+        self.progress_end_time = datetime.fromtimestamp(job.deadline)
+        self.progress.setVisible(True)
+        self.progress.setMaximum(total)
+        self.progress.setValue(0)
+        self.styles.set(self.progress, Styles.PROGRESS_BAR)
+        self.clock.start_countdown(max(0, int(job.deadline - time.time())), total)
 
     def hide_progress_bar(self):
-        self.progress.setVisible(False)
-        if hasattr(self, 'progress_timer'):
-            self.progress_timer.stop()
-
-    def update_progress(self):
-        now = datetime.now()
-        total = int((self.progress_end_time - self.progress_start_time).total_seconds())
-        elapsed = int((now - self.progress_start_time).total_seconds())
-        remaining = max(0, total - elapsed)
-        self.progress.setValue(elapsed)
-        self.progress.setStyleSheet("QProgressBar { color: #222; font-weight: bold; font-size: 16px; background: #e6e6e6; border-radius: 22px; border: 2px solid #bdbdbd; text-align: center; } QProgressBar::chunk { background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #4f8cff, stop:1 #a084e8); border-radius: 22px; margin: 0px; }")
-        self.progress.setFormat(f"{remaining} seconds left")
-        if elapsed >= total:
-            self.progress_timer.stop()
-            self.progress.setStyleSheet(Styles.MAIN_WINDOW)
+        if hasattr(self, 'progress'):
+            self.progress.setVisible(False)
+        self.clock.stop_countdown()
+
+    def update_progress(self, remaining=None):
+        if remaining is None:
+            remaining = self.clock.remaining_seconds()
+            if remaining is None:
+                return
+        total = self.clock.countdown_total
+        self.progress.setValue(total - remaining)
+        job = self._progress_job
+        if job is None or job.action == "shutdown":
+            text = f"{remaining} seconds left"
+        else:
+            text = f"{job.label} in {remaining} seconds"
+        queued = len(self.jobs) - 1
+        if queued > 0:
+            text += f" (+{queued} queued)"
+        self.progress.setFormat(text)
+        if remaining <= 0:
+            self.styles.set(self.progress, Styles.MAIN_WINDOW)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.isMinimized():
+            self.clock.resume()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.clock.pause()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            if self.isMinimized():
+                self.clock.pause()
+            elif self.isVisible():
+                self.clock.resume()
 
     def cancel_shutdown(self):
-        try:
-            subprocess.run(["shutdown", "/a"], check=True, creationflags=subprocess.CREATE_NO_WINDOW)
+        job = self.jobs.peek()
+        if job is None:
+            # Nothing queued here, but a shutdown may be pending from elsewhere.
+            self.shutdown_worker.submit("cancel", None, run_cancel)
+            return
+        self.cancel_job(job)
+
+    def cancel_job(self, job):
+        self.jobs.cancel(job.id)
+        if job.rule is not None:
+            self.log_message(f"Recurring {job.label.lower()} ({job.rule}) has been canceled.")
+        elif job.action == "shutdown":
+            self.log_message("Shutdown has been canceled.")
+        else:
+            self.log_message(f"{job.label} at {self.format_time(datetime.fromtimestamp(job.deadline))} has been canceled.")
+        self.render_scheduler.invalidate(RenderScheduler.TICKS | RenderScheduler.COLORS)
+
+    def on_cancel_finished(self, result):
+        if result.ok:
             self.log_message("Shutdown has been canceled.")
             self.hide_progress_bar()
-            self.update_slider_labels()
-        except subprocess.CalledProcessError:
-            self.log_message("Failed to cancel shutdown - No shutdown was scheduled.")
+            self.render_scheduler.invalidate(RenderScheduler.TICKS | RenderScheduler.COLORS)
+        elif result.error is not None:
+            self.log_message(f"Error: {result.error}", "ERROR")
+        else:
+            self.log_message("Failed to cancel shutdown - No shutdown was scheduled.", "WARNING")
             QMessageBox.warning(
                 self,
                 "Warning",
                 "No shutdown was scheduled to cancel."
             )
-        except Exception as e:
-            self.log_message(f"Error: {str(e)}")
-    def log_message(self, message):
-        if hasattr(self, 'console'):
-            self.console.append(f"> {message}")
+
+    def start_instance_server(self):
+        """Makes this window the single instance; False if one already runs."""
+        server = InstanceServer(self.backend.name, self.instance_command.emit)
+        if not server.start():
+            return False
+        self.instance_server = server
+        return True
+
+    def bring_to_front(self):
+        if self.tray_mode:
+            self.show_from_tray()
+            return
+        if self.isHidden() or self.isMinimized():
+            self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
+    def enter_tray_mode(self):
+        """Collapses the app to a tray icon while a schedule is pending.
+
+        The widgets, decoded icons, stylesheets and log document are
+        released; the job queue, the instance server, hooks and idle watching
+        keep running, and only the minute timer wakes up to refresh the
+        tooltip. show_from_tray() builds the window again.
+        """
+        if self.tray_mode:
+            return
+        self.save_state()
+        self.tray_mode = True
+        self.hide()
+        self.release_view()
+        self.show_tray_icon()
+        self.clock.stop_countdown()
+        self.clock.resume()
+        QTimer.singleShot(0, self.release_memory)
+        self.log_message("Minimized to the system tray.")
+
+    def release_view(self):
+        """Deletes the central widget tree and forgets every attribute that
+        points into it, plus the caches only the window uses."""
+        central = self.takeCentralWidget()
+        for name, value in list(vars(self).items()):
+            owner = value
+            while isinstance(owner, QObject) and not isinstance(owner, QWidget):
+                owner = owner.parent()
+            if isinstance(owner, QWidget) and (owner is central or central.isAncestorOf(owner)):
+                delattr(self, name)
+        central.deleteLater()
+        self.setStyleSheet("")
+        self._progress_job = None
+        self._icon_key = None
+        self._time_strings.clear()
+        self.assets = None
+        self.icons = PeriodIconCache()
+        self.styles = StyleManager()
+
+    def release_memory(self):
+        QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+        trim_process_memory()
+
+    def show_from_tray(self, *_):
+        if self.tray_mode:
+            self.assets = load_asset_bundle()
+            self.icons = PeriodIconCache(bundle=self.assets, on_error=self.on_asset_error)
+            self.build_view()
+            self.build_deferred_view()
+            self.tray_mode = False
+            self.refresh_progress()
+            self.update_cancel_button()
+            self.tray_icon.hide()
+        self.bring_to_front()
+
+    def show_tray_icon(self):
+        if self.tray_icon is None:
+            self.tray_icon = QSystemTrayIcon(self.windowIcon(), self)
+            menu = QMenu(self)
+            self.tray_cancel_action = menu.addAction("Cancel Shutdown")
+            self.tray_cancel_action.triggered.connect(self.cancel_shutdown)
+            self.tray_extend_actions = []
+            for minutes in TRAY_EXTEND_MINUTES:
+                action = menu.addAction(f"Extend by {minutes} minutes")
+                action.triggered.connect(partial(self.extend_next_job, minutes))
+                self.tray_extend_actions.append(action)
+            menu.addSeparator()
+            menu.addAction("Show window").triggered.connect(self.show_from_tray)
+            menu.addAction("Quit").triggered.connect(self.quit_from_tray)
+            self.tray_icon.setContextMenu(menu)
+            self.tray_icon.activated.connect(self.on_tray_activated)
+        self.update_tray()
+        self.tray_icon.show()
+
+    def on_tray_activated(self, reason):
+        if reason in (QSystemTrayIcon.ActivationReason.Trigger, QSystemTrayIcon.ActivationReason.DoubleClick):
+            self.show_from_tray()
+
+    def update_tray(self):
+        if self.tray_icon is None:
+            return
+        job = self.jobs.peek()
+        if job is None:
+            status = "Nothing scheduled"
+        else:
+            when = datetime.fromtimestamp(job.deadline)
+            at = self.format_time(when) if when.date() == datetime.now().date() else self.format_occurrence(when)
+            status = f"{job.label} at {at}, {format_remaining(job.deadline - time.time())}"
+            queued = len(self.jobs) - 1
+            if queued > 0:
+                status += f" (+{queued} queued)"
+        self.tray_icon.setToolTip(f"{self.windowTitle()}\n{status}")
+        self.tray_cancel_action.setText(f"Cancel {job.label if job is not None else 'Shutdown'}")
+        for action in self.tray_extend_actions:
+            action.setEnabled(job is not None and job.rule is None)
+
+    def extend_next_job(self, minutes, *_):
+        """Moves the next one-off job back by `minutes`."""
+        job = self.jobs.peek()
+        if job is None or job.rule is not None:
+            return
+        target_time = datetime.fromtimestamp(job.deadline) + timedelta(minutes=minutes)
+        # Queue the replacement before cancelling, so the system job goes
+        # straight from one to the other: a single run_schedule aborts the old
+        # OS countdown and sets the new one, with no release in between.
+        self.jobs.add(job.action, target_time.timestamp(), job.note)
+        self.jobs.cancel(job.id)
+        self.log_message(f"{job.label} extended to {self.format_time(target_time)}")
+
+    def quit_from_tray(self, *_):
+        self.close()
+        QApplication.quit()
+
+    def on_instance_command(self, request):
+        """Runs a command forwarded by a second launch against this window's
+        queue, so there is only one pending schedule."""
+        if not request.argv or request.argv == ["show"]:
+            self.bring_to_front()
+            request.respond()
+            return
+        try:
+            command, args = parse_command(request.argv)
+        except SystemExit:
+            request.respond(2, error="Invalid command.")
+            return
+        job = self.jobs.peek(SYSTEM_ACTIONS)
+        if command == "status":
+            if job is None:
+                request.respond(1, NOTHING_SCHEDULED)
+            else:
+                request.respond(0, status_message(datetime.fromtimestamp(math.ceil(job.deadline)), job.action))
+        elif command == "cancel":
+            if job is None:
+                self.shutdown_worker.submit("forwarded-cancel", request, run_cancel)
+                return
+            self.cancel_job(job)
+            request.respond(0, "Shutdown has been canceled.")
+        else:
+            target_time, seconds_until = target_for(args)
+            self.schedule_job(args.action, target_time, seconds_until)
+            request.respond(0, scheduled_message(args.action, target_time, seconds_until))
+
+    def closeEvent(self, event):
+        if self.tray_icon is not None:
+            self.tray_icon.hide()
+        if self.instance_server is not None:
+            self.instance_server.stop()
+            self.instance_server = None
+        if self.idle_watcher is not None:
+            self.idle_watcher.stop()
+        if hasattr(self, 'fleet_dialog'):
+            self.fleet_dialog.shutdown()
+        if self.hook_run is not None:
+            self.hook_run.cancel()
+        if self._persist_timer.isActive():
+            self.save_state(wait=True)
+        self.store.close()
+        self.shutdown_worker.shutdown()
+        self.system_log.close_file()
+        super().closeEvent(event)
+
+    def saved_setting(self, key, default):
+        value = self.store.state["settings"].get(key, default)
+        return value if isinstance(value, type(default)) else default
+
+    def saved_opacity(self):
+        return min(max(self.saved_setting("opacity", int(WINDOW_OPACITY * 100)), 50), 100)
+
+    def restore_state(self):
+        error = self.store.take_error()
+        if error:
+            self.log_message(error, "WARNING")
+        restored, missed = restore_jobs(self.jobs.engine, self.store.state["jobs"], time.time())
+        for action, when in missed:
+            self.log_message(
+                f"{ACTIONS.get(action, action)} at {when:%Y-%m-%d} {self.format_time(when)} passed while the app was closed.",
+                "INFO" if action in SYSTEM_ACTIONS else "WARNING",
+            )
+        if restored:
+            self.jobs.rearm()
+            self.refresh_progress()
+            self.update_cancel_button()
+            self.log_message(f"Restored {len(restored)} scheduled job(s).")
+
+    def resume_system_job(self):
+        job = self.jobs.peek(SYSTEM_ACTIONS)
+        if job is not None and self._system_job is None:
+            pending = self.backend.status()
+            if pending is not None and abs(pending.timestamp() - job.deadline) <= SYSTEM_JOB_MATCH_SECONDS:
+                # The OS countdown outlived the previous session; keep it.
+                self._system_job = job
+        self.sync_system_job()
+
+    def persist(self, *_):
+        if not self._persist_timer.isActive():
+            self._persist_timer.start(PERSIST_DELAY_MS)
+
+    def snapshot_state(self):
+        settings = dict(self.store.state["settings"])
+        settings.update(time_format=self.time_format_mode, opacity=round(self.windowOpacity() * 100))
+        if hasattr(self, 'time_input'):
+            settings.update(
+                offset=self.time_input.value(),
+                timeline_zoom=self.time_input.zoom_index(),
+                action=self.action_combo.currentData(),
+            )
+        if hasattr(self, 'repeat_combo'):
+            settings.update(
+                repeat=self.repeat_combo.currentData(),
+                cron=self.cron_input.text(),
+                skip_dates=self.skip_dates_input.text(),
+            )
+        if hasattr(self, 'idle_checkbox'):
+            settings.update(
+                idle_enabled=self.idle_checkbox.isChecked(),
+                idle_minutes=self.idle_minutes_input.value(),
+            )
+        if hasattr(self, 'fleet_dialog'):
+            settings.update(fleet_hosts=self.fleet_dialog.hosts_input.text())
+        return {"settings": settings, "jobs": [job_record(job) for job in self.jobs.jobs()]}
+
+    def save_state(self, wait=False):
+        self._persist_timer.stop()
+        error = self.store.take_error()
+        if error:
+            self.log_message(error, "WARNING")
+        state = self.snapshot_state()
+        if wait:
+            self.store.close()
+            self.store.save(state)
+        else:
+            self.store.save_async(state)
+
+    def log_message(self, message, level="INFO"):
+        self.system_log.append(message, level)
+        if hasattr(self, 'console') and not self._log_flush_pending:
+            self._log_flush_pending = True
+            QTimer.singleShot(0, self.flush_log)
+
+    def flush_log(self):
+        self._log_flush_pending = False
+        if not hasattr(self, 'console') or not self.system_log.has_unflushed():
+            return
+        self.console.appendPlainText("\n".join(format_record(r) for r in self.system_log.drain()))
+
+# Handlers and timer callbacks timed when hot-path profiling is on.
+HOT_PATHS = (
+    (ShutdownApp, ("on_time_input_changed", "render", "update_background_color", "update_sun_moon_animation",
+                   "rebuild_slider_labels", "update_repeat_preview", "check_minute_change", "update_progress",
+                   "save_state", "flush_log", "arm_hooks")),
+    (RenderScheduler, ("flush",)),
+    (ClockService, ("_on_minute_timer", "_on_countdown_timer")),
+    (JobScheduler, ("_on_timer",)),
+    (FleetDialog, ("refresh",)),
+    (BackgroundWidget, ("paintEvent",)),
+    (TimelinePicker, ("mouseMoveEvent", "wheelEvent", "paintEvent")),
+)
+
+def enable_hot_path_profiling(recorder=None):
+    """Wraps every HOT_PATHS method in a timer; call before building the
+    window. Returns the recorder; recorder.restore() undoes it."""
+    recorder = recorder if recorder is not None else HotPathRecorder()
+    for cls, names in HOT_PATHS:
+        recorder.instrument(cls, names)
+    return recorder
 
 def main():
+    import argparse
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--profile-startup', action='store_true')
+    parser.add_argument('--profile-hot-paths', nargs='?', const='1', metavar='FILE')
+    parser.add_argument('--log-file')
+    options, _ = parser.parse_known_args()
+    hot_paths_file = hot_paths_output(options.profile_hot_paths or os.environ.get(HOT_PATHS_ENV_VAR), state_dir())
+    hot_paths = enable_hot_path_profiling() if hot_paths_file else None
+    profiler = StartupProfiler()
+    profiler.mark("imports")
     app = QApplication([])
+    backend = create_backend()
+    if backend is None:
+        QMessageBox.critical(None, "Unsupported OS", "This application can only run on Windows.")
+        sys.exit()
     app.setStyle('Fusion')
-    window = ShutdownApp()
+    profiler.mark("QApplication")
+    window = ShutdownApp(backend, profiler, options.log_file, hot_paths=hot_paths)
+    if not window.start_instance_server():
+        # Another instance started first; let it handle this launch.
+        forward_command(backend.name, ["show"])
+        sys.exit(0)
     window.show()
-    sys.exit(app.exec())
+    profiler.mark("show")
+    if options.profile_startup:
+        window.startup_finished.connect(lambda: print(profiler.report(), flush=True))
+    code = app.exec()
+    if hot_paths is not None:
+        hot_paths.dump(hot_paths_file)
+        print(f"Hot-path timings written to {hot_paths_file}", flush=True)
+    sys.exit(code)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,168 @@
+"""Packs the images the window uses into one pre-scaled bundle.
+
+    python src/asset_bundle.py            # rebuild assets/bundle.dat
+    python src/asset_bundle.py --list     # show what is inside
+
+Each image is stored once per size the app draws it at, as its own small
+PNG, after a JSON index. The app reads the whole file with a single read and
+decodes only the entries it asks for. Add new theme art to MANIFEST and
+rebuild.
+"""
+
+import json
+import os
+import struct
+import sys
+
+BUNDLE_MAGIC = b"MSSA"
+BUNDLE_VERSION = 1
+BUNDLE_PATH = "assets/bundle.dat"
+# Every entry is stored in this format; passing it to the decoder skips
+# probing the other image plugins.
+ENTRY_FORMAT = "PNG"
+HEADER = struct.Struct("<4sHI")
+# Period icons are drawn at 100 px; 200 px covers 2x displays, and other
+# ratios scale down from the nearest larger size.
+PERIOD_ICON_SIZES = (100, 200)
+WINDOW_ICON_SIZES = (16, 24, 32, 48)
+# (entry name, source path relative to the repository, sizes in pixels)
+MANIFEST = (
+    ("period/morning", "assets/images/morning.png", PERIOD_ICON_SIZES),
+    ("period/day", "assets/images/day.png", PERIOD_ICON_SIZES),
+    ("period/evening", "assets/images/evening.png", PERIOD_ICON_SIZES),
+    ("period/night", "assets/images/night.png", PERIOD_ICON_SIZES),
+    ("app-icon", "assets/icons/icon.ico", WINDOW_ICON_SIZES),
+)
+
+
+def encode_bundle(entries):
+    """entries: iterable of (name, size, width, height, png bytes)."""
+    index, blobs, offset = {}, [], 0
+    for name, size, width, height, data in entries:
+        index.setdefault(name, []).append([size, offset, len(data), width, height])
+        blobs.append(data)
+        offset += len(data)
+    for sizes in index.values():
+        sizes.sort()
+    header = json.dumps(index, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(header)) + header + b"".join(blobs)
+
+
+class AssetBundle:
+    """Read-only view of a bundle built by build_bundle().
+
+    The file is read once, in one call; blob() hands out zero-copy slices of
+    that buffer. Raises ValueError for a file that is not a bundle.
+    """
+
+    def __init__(self, data):
+        if len(data) < HEADER.size:
+            raise ValueError("truncated asset bundle")
+        magic, version, index_size = HEADER.unpack_from(data)
+        if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+            raise ValueError("not an asset bundle")
+        start = HEADER.size + index_size
+        try:
+            index = json.loads(bytes(data[HEADER.size:start]).decode("utf-8"))
+        except ValueError:
+            raise ValueError("damaged asset bundle index")
+        self._data = memoryview(data)
+        self._start = start
+        self._index = {name: [tuple(entry) for entry in sizes] for name, sizes in index.items()}
+        for sizes in self._index.values():
+            for _, offset, length, _, _ in sizes:
+                if start + offset + length > len(data):
+                    raise ValueError("truncated asset bundle")
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb", buffering=0) as f:
+            data = bytearray(os.fstat(f.fileno()).st_size)
+            if f.readinto(data) != len(data):
+                raise ValueError("truncated asset bundle")
+        return cls(data)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def names(self):
+        return sorted(self._index)
+
+    def sizes(self, name):
+        return [entry[0] for entry in self._index[name]]
+
+    def best_size(self, name, side):
+        """The smallest stored size of at least `side`, else the largest."""
+        sizes = self.sizes(name)
+        return next((size for size in sizes if size >= side), sizes[-1])
+
+    def blob(self, name, size):
+        for entry_size, offset, length, _, _ in self._index[name]:
+            if entry_size == size:
+                return self._data[self._start + offset:self._start + offset + length]
+        raise KeyError(f"{name}@{size}")
+
+    def dimensions(self, name, size):
+        for entry_size, _, _, width, height in self._index[name]:
+            if entry_size == size:
+                return width, height
+        raise KeyError(f"{name}@{size}")
+
+    @property
+    def size_in_bytes(self):
+        return len(self._data)
+
+
+def build_bundle(root, manifest=MANIFEST):
+    """Scales every MANIFEST image to each of its sizes (keeping the aspect
+    ratio) and returns the encoded bundle. Needs PyQt6."""
+    from PyQt6.QtCore import QBuffer, QByteArray, QIODevice, Qt
+    from PyQt6.QtGui import QImageReader
+
+    entries = []
+    for name, source, sizes in manifest:
+        reader = QImageReader(os.path.join(root, source))
+        original = reader.read()
+        if original.isNull():
+            raise ValueError(f"Could not load {source}: {reader.errorString()}")
+        for size in sizes:
+            image = original
+            if image.width() > size or image.height() > size:
+                image = image.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio,
+                                     Qt.TransformationMode.SmoothTransformation)
+            data = QByteArray()
+            buffer = QBuffer(data)
+            buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+            image.save(buffer, ENTRY_FORMAT, 9)
+            buffer.close()
+            entries.append((name, size, image.width(), image.height(), bytes(data)))
+    return encode_bundle(entries)
+
+
+def main(argv=None):
+    import argparse
+    root = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    parser = argparse.ArgumentParser(prog="asset_bundle", description="Build the packed asset bundle.")
+    parser.add_argument("--output", default=os.path.join(root, BUNDLE_PATH))
+    parser.add_argument("--list", action="store_true", help="list the entries of an existing bundle")
+    args = parser.parse_args(argv)
+    if not args.list:
+        from PyQt6.QtGui import QGuiApplication
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        app = QGuiApplication([])  # noqa: F841
+        data = build_bundle(root)
+        tmp_path = args.output + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, args.output)
+    bundle = AssetBundle.load(args.output)
+    for name in bundle.names():
+        for size in bundle.sizes(name):
+            width, height = bundle.dimensions(name, size)
+            print(f"{name + '@' + str(size):24} {width:4d}x{height:<4d} {len(bundle.blob(name, size)):7d} bytes")
+    print(f"{args.output}: {bundle.size_in_bytes} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+"""Sends schedule, cancel and status commands to many hosts running
+fleet_agent.py.
+
+    python src/fleet.py --hosts hosts.txt schedule --in 30m
+    python src/fleet.py --hosts hosts.txt status
+
+The shared token never goes over the wire. Each connection starts with a
+random challenge from the agent, and every request carries an HMAC of that
+challenge and the request under the token, so a sniffed request is useless
+on any other connection. Requests are authenticated, not encrypted.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import namedtuple
+
+DEFAULT_PORT = 47800
+TOKEN_ENV_VAR = "SHUTDOWN_SCHEDULER_FLEET_TOKEN"
+DEFAULT_CONCURRENCY = 64
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_RETRIES = 2
+RETRY_BACKOFF = 0.2
+# Idle connections kept open for reuse; beyond this they are closed after use
+# so a large fleet cannot exhaust file descriptors.
+DEFAULT_POOL_SIZE = 256
+MAX_MESSAGE_BYTES = 64 * 1024
+COMMANDS = ("schedule", "cancel", "status")
+# Without --verbose only this many failures are printed; the rest are counted.
+MAX_REPORTED_FAILURES = 20
+
+
+def encode_message(message):
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def decode_message(line):
+    message = json.loads(line.decode("utf-8"))
+    if not isinstance(message, dict):
+        raise ValueError("expected a JSON object")
+    return message
+
+
+def request_mac(token, challenge, request_id, key, command, args):
+    """The signature a request on the connection that sent `challenge` needs."""
+    payload = json.dumps([challenge, request_id, key, command, args], sort_keys=True, separators=(",", ":"))
+    return hmac.new(token.encode("utf-8"), payload.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def parse_host(text, default_port=DEFAULT_PORT):
+    """'lab-01', 'lab-01:48000' or '[::1]:48000' -> (host, port)."""
+    text = text.strip()
+    if text.startswith("["):
+        host, _, rest = text[1:].partition("]")
+        return host, int(rest[1:]) if rest.startswith(":") else default_port
+    if text.count(":") == 1:
+        host, port = text.split(":")
+        return host, int(port)
+    return text, default_port
+
+
+def read_hosts(path):
+    with open(path, encoding="utf-8") as f:
+        lines = (line.split("#", 1)[0].strip() for line in f)
+        return [parse_host(line) for line in lines if line]
+
+
+def read_token(token=None):
+    token = token or os.environ.get(TOKEN_ENV_VAR, "")
+    if not token:
+        raise ValueError(f"no fleet token; set {TOKEN_ENV_VAR}")
+    return token
+
+
+class HostResult(namedtuple("HostResult", ["host", "code", "output", "error", "attempts", "elapsed"])):
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return self.code == 0
+
+    @property
+    def reachable(self):
+        return self.code is not None
+
+    def describe(self):
+        return self.error or self.output or f"exit code {self.code}"
+
+
+class FleetProgress:
+    """Aggregated counts for one fleet run; no per-host state is kept for
+    the hosts that succeeded."""
+
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.ok = 0
+        self.failed = 0
+        self.unreachable = 0
+        self.started = time.perf_counter()
+
+    def add(self, result):
+        self.done += 1
+        if result.ok:
+            self.ok += 1
+        elif result.reachable:
+            self.failed += 1
+        else:
+            self.unreachable += 1
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def summary(self):
+        text = f"{self.done}/{self.total} hosts · {self.ok} ok"
+        if self.failed:
+            text += f" · {self.failed} failed"
+        if self.unreachable:
+            text += f" · {self.unreachable} unreachable"
+        return text + f" · {self.elapsed():.1f} s"
+
+
+class AgentConnection:
+    """One persistent connection to an agent; requests on it are serialized
+    and it reconnects after any error."""
+
+    def __init__(self, address, token):
+        self.address = address
+        self.token = token
+        self.reader = None
+        self.writer = None
+        self.challenge = None
+        self.last_id = 0
+        self.lock = asyncio.Lock()
+        self.connect_count = 0
+
+    @property
+    def is_open(self):
+        return self.writer is not None and not self.writer.is_closing()
+
+    async def request(self, key, command, args):
+        if not self.is_open:
+            self.reader, self.writer = await asyncio.open_connection(*self.address, limit=MAX_MESSAGE_BYTES)
+            self.connect_count += 1
+            greeting = await self.reader.readline()
+            if not greeting:
+                raise ConnectionError("connection closed by agent")
+            self.challenge = str(decode_message(greeting).get("challenge", ""))
+            self.last_id = 0
+        self.last_id += 1
+        message = {"id": self.last_id, "key": key, "command": command, "args": args,
+                   "mac": request_mac(self.token, self.challenge, self.last_id, key, command, args)}
+        self.writer.write(encode_message(message))
+        await self.writer.drain()
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("connection closed by agent")
+        return decode_message(line)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class FleetController:
+    """Runs one command against every host with at most `concurrency`
+    requests in flight.
+
+    Connections are pooled per host and reused by later runs on the same
+    event loop. Each attempt is bounded by `timeout`; failed attempts are
+    retried with exponential backoff. Every attempt at one request carries
+    the same key, and the agent answers a key it has seen with the reply it
+    already gave, so a retry after a lost reply cannot cancel or schedule
+    twice. Hosts that never answer come back as a HostResult with code None.
+    """
+
+    def __init__(self, hosts, token, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT,
+                 retries=DEFAULT_RETRIES, pool_size=DEFAULT_POOL_SIZE):
+        self.hosts = [parse_host(h) if isinstance(h, str) else tuple(h) for h in hosts]
+        self.token = token
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.pool_size = pool_size
+        self._pool = {}
+        self._key_prefix = secrets.token_hex(8)
+        self._request_ids = 0
+
+    def schedule(self, minutes=None, at=None, action="shutdown", on_result=None):
+        args = {"action": action}
+        if minutes is not None:
+            args["minutes"] = minutes
+        else:
+            args["at"] = at
+        return self.run("schedule", args, on_result)
+
+    def cancel(self, on_result=None):
+        return self.run("cancel", {}, on_result)
+
+    def status(self, on_result=None):
+        return self.run("status", {}, on_result)
+
+    async def run(self, command, args, on_result=None):
+        if command not in COMMANDS:
+            raise ValueError(f"Unknown command: {command!r}")
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def one(address):
+            async with semaphore:
+                result = await self._call(address, command, args)
+            if on_result is not None:
+                on_result(result)
+            return result
+
+        return await asyncio.gather(*(one(address) for address in self.hosts))
+
+    async def _call(self, address, command, args):
+        host = f"{address[0]}:{address[1]}"
+        start = time.perf_counter()
+        error = None
+        self._request_ids += 1
+        key = f"{self._key_prefix}-{self._request_ids}"
+        for attempt in range(1, self.retries + 2):
+            connection = self._pool.get(address)
+            if connection is None:
+                connection = self._pool[address] = AgentConnection(address, self.token)
+            try:
+                async with connection.lock:
+                    reply = await asyncio.wait_for(connection.request(key, command, args), self.timeout)
+                self._release(address, connection)
+                return HostResult(host, int(reply.get("code", 1)), reply.get("output", ""),
+                                  reply.get("error", ""), attempt, time.perf_counter() - start)
+            except (OSError, ValueError, TypeError, asyncio.TimeoutError) as e:
+                connection.close()
+                error = "timed out" if isinstance(e, asyncio.TimeoutError) else str(e) or type(e).__name__
+                if attempt <= self.retries:
+                    await asyncio.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+        return HostResult(host, None, "", f"unreachable: {error}", self.retries + 1, time.perf_counter() - start)
+
+    def _release(self, address, connection):
+        if len(self._pool) > self.pool_size and sum(c.is_open for c in self._pool.values()) > self.pool_size:
+            connection.close()
+
+    def connect_count(self):
+        return sum(c.connect_count for c in self._pool.values())
+
+    def close(self):
+        for connection in self._pool.values():
+            connection.close()
+        self._pool.clear()
+
+
+class FleetRunner:
+    """An asyncio loop on a daemon thread, so a GUI can start fleet runs and
+    keep the controller's connection pool alive between them."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="fleet", daemon=True)
+        self._thread.start()
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call(self, fn, *args):
+        self.loop.call_soon_threadsafe(fn, *args)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(1.0)
+
+
+def build_parser():
+    from headless import parse_clock_time, parse_duration
+    parser = argparse.ArgumentParser(prog="fleet", description="Schedule or cancel shutdowns on many hosts.")
+    parser.add_argument("command", choices=COMMANDS)
+    parser.add_argument("--hosts", required=True, metavar="FILE", help="one host[:port] per line")
+    when = parser.add_mutually_exclusive_group()
+    when.add_argument("--in", dest="in_minutes", type=parse_duration, metavar="DURATION")
+    when.add_argument("--at", dest="at_time", type=parse_clock_time, metavar="HH:MM")
+    parser.add_argument("--action", choices=("shutdown", "restart"), default="shutdown")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per attempt")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES)
+    parser.add_argument("--verbose", action="store_true", help="print every host's reply")
+    return parser
+
+
+async def run_cli(args):
+    controller = FleetController(read_hosts(args.hosts), read_token(), args.concurrency, args.timeout, args.retries)
+    progress = FleetProgress(len(controller.hosts))
+
+    def report(result):
+        progress.add(result)
+        if result.ok and not (args.verbose or args.command == "status"):
+            return
+        if not result.ok and not args.verbose and progress.done - progress.ok > MAX_REPORTED_FAILURES:
+            return
+        print(f"{result.host}: {result.describe()}", file=sys.stdout if result.ok else sys.stderr)
+
+    try:
+        if args.command == "schedule":
+            at = None if args.at_time is None else "%02d:%02d" % args.at_time
+            await controller.schedule(args.in_minutes, at, args.action, report)
+        else:
+            await controller.run(args.command, {}, report)
+    finally:
+        controller.close()
+    print(progress.summary())
+    return 0 if progress.ok == progress.total else 1
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "schedule" and args.in_minutes is None and args.at_time is None:
+        parser.error("schedule needs --in DURATION or --at HH:MM")
+    try:
+        return asyncio.run(run_cli(args))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
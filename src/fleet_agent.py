@@ -0,0 +1,234 @@
+"""Per-host agent for fleet.py.
+
+Runs fleet commands with the same semantics as the command line: if a window
+is open on this host the command is handed to it, otherwise it goes straight
+to the shutdown backend.
+
+    python src/fleet_agent.py --host 0.0.0.0 --port 47800
+    python src/fleet_agent.py --stand-in 200 --port 0 --hosts-out hosts.txt   # local testing
+
+The agent listens on the loopback interface unless --host says otherwise.
+Every connection gets a fresh challenge and every request must carry its
+HMAC under the shared token (see fleet.request_mac), with request ids
+increasing on the connection, so a captured request cannot be replayed.
+Replies are remembered by request key, so a controller retrying a request
+whose reply was lost gets that reply instead of running the command again.
+"""
+
+import argparse
+import asyncio
+import hmac
+import random
+import secrets
+import sys
+from collections import OrderedDict
+
+from fleet import DEFAULT_PORT, MAX_MESSAGE_BYTES, decode_message, encode_message, read_token, request_mac
+from headless import build_parser as build_command_parser, execute, parse_command
+from shutdown_backend import FakeShutdownBackend, create_backend
+
+DEFAULT_HOST = "127.0.0.1"
+CHALLENGE_BYTES = 16
+# Request keys whose replies are kept for retries; the oldest are dropped.
+REPLY_CACHE_SIZE = 4096
+
+
+def command_argv(command, args):
+    """Turns a fleet request into the equivalent command-line arguments."""
+    argv = [command]
+    if command == "schedule":
+        if "minutes" in args:
+            argv += ["--in", f"{int(args['minutes'])}m"]
+        elif "at" in args:
+            argv += ["--at", str(args["at"])]
+        argv += ["--action", str(args.get("action", "shutdown"))]
+    return argv
+
+
+class BackendHandler:
+    """Runs commands against this host's backend on a worker thread."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._parser = build_command_parser()
+
+    def run(self, argv):
+        from single_instance import forward_command
+        try:
+            command, args = parse_command(argv, self._parser)
+        except SystemExit:
+            return 2, "", "invalid command"
+        reply = forward_command(self.backend.name, argv)
+        if reply is not None:
+            return reply
+        return execute(self.backend, command, args)
+
+    async def __call__(self, argv):
+        return await asyncio.get_running_loop().run_in_executor(None, self.run, argv)
+
+
+class StandInHandler:
+    """A simulated host for testing on one machine: an in-memory fake backend
+    behind an asynchronous delay, so hundreds fit in one process."""
+
+    def __init__(self, latency=0.02, jitter=0.5, failure_rate=0.0, seed=None):
+        self.backend = FakeShutdownBackend()
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self._parser = build_command_parser()
+        self._random = random.Random(seed)
+
+    async def __call__(self, argv):
+        if self.latency:
+            await asyncio.sleep(self.latency * (1 + self._random.uniform(-self.jitter, self.jitter)))
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            return 1, "", "simulated failure"
+        try:
+            command, args = parse_command(argv, self._parser)
+        except SystemExit:
+            return 2, "", "invalid command"
+        return execute(self.backend, command, args)
+
+
+class ReplyCache:
+    """Replies by request key, as the tasks producing them, so a retry that
+    arrives while the first attempt is still running waits for the same
+    result."""
+
+    def __init__(self, size=REPLY_CACHE_SIZE):
+        self.size = size
+        self._replies = OrderedDict()
+
+    def get_or_run(self, key, run):
+        task = self._replies.get(key)
+        if task is not None:
+            self._replies.move_to_end(key)
+            return task
+        task = self._replies[key] = asyncio.ensure_future(run())
+        if len(self._replies) > self.size:
+            self._replies.popitem(last=False)
+        return task
+
+
+def authorized(request, token, challenge, last_id):
+    request_id = request.get("id")
+    if not isinstance(request_id, int) or isinstance(request_id, bool) or request_id <= last_id:
+        return False
+    if not isinstance(request.get("key"), str):
+        return False
+    try:
+        expected = request_mac(token, challenge, request_id, request["key"], request.get("command"),
+                               request.get("args"))
+    except (TypeError, ValueError):
+        return False
+    return hmac.compare_digest(str(request.get("mac", "")).encode(), expected.encode())
+
+
+async def run_request(handler, request):
+    try:
+        argv = command_argv(str(request.get("command")), request.get("args") or {})
+        return await handler(argv)
+    except (TypeError, ValueError) as e:
+        return 2, "", f"invalid request: {e}"
+
+
+async def handle_connection(reader, writer, handler, token, replies):
+    challenge = secrets.token_hex(CHALLENGE_BYTES)
+    last_id = 0
+    try:
+        writer.write(encode_message({"challenge": challenge}))
+        await writer.drain()
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                request = decode_message(line)
+            except ValueError:
+                writer.write(encode_message({"code": 2, "error": "malformed request"}))
+                break
+            if not authorized(request, token, challenge, last_id):
+                writer.write(encode_message({"id": request.get("id"), "code": 2, "error": "unauthorized"}))
+                break
+            last_id = request["id"]
+            task = replies.get_or_run(request["key"], lambda: run_request(handler, request))
+            # Shielded: a dropped connection must not cancel a command that a
+            # retry will ask for again.
+            code, output, error = await asyncio.shield(task)
+            writer.write(encode_message({"id": request.get("id"), "code": code, "output": output, "error": error}))
+            await writer.drain()
+    except (ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(handler, token, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    replies = ReplyCache()
+    return await asyncio.start_server(
+        lambda r, w: handle_connection(r, w, handler, token, replies), host, port, limit=MAX_MESSAGE_BYTES,
+    )
+
+
+async def serve_stand_ins(count, token, host=DEFAULT_HOST, port=0, latency=0.02, failure_rate=0.0):
+    """Starts `count` simulated agents; returns (servers, [(host, port)])."""
+    servers, addresses = [], []
+    for i in range(count):
+        server = await serve(StandInHandler(latency, failure_rate=failure_rate, seed=i), token, host,
+                             port + i if port else 0)
+        servers.append(server)
+        addresses.append(server.sockets[0].getsockname()[:2])
+    return servers, addresses
+
+
+async def run_agent(args):
+    token = read_token()
+    if args.stand_in:
+        servers, addresses = await serve_stand_ins(args.stand_in, token, args.host, args.port, args.latency,
+                                                   args.failure_rate)
+        if args.hosts_out:
+            with open(args.hosts_out, "w", encoding="utf-8") as f:
+                f.writelines(f"{host}:{port}\n" for host, port in addresses)
+        if args.port:
+            print(f"{len(servers)} stand-in agents on {addresses[0][0]}:{addresses[0][1]}-{addresses[-1][1]}", flush=True)
+        else:
+            print(f"{len(servers)} stand-in agents on {addresses[0][0]}, ephemeral ports", flush=True)
+    else:
+        backend = create_backend(args.backend)
+        if backend is None:
+            print("This application can only run on Windows.", file=sys.stderr)
+            return 2
+        servers = [await serve(BackendHandler(backend), token, args.host, args.port)]
+        print(f"Agent listening on {args.host}:{args.port} ({backend.name} backend)", flush=True)
+    try:
+        await asyncio.gather(*(server.serve_forever() for server in servers))
+    finally:
+        for server in servers:
+            server.close()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="fleet_agent", description="Accept fleet commands for this host.")
+    parser.add_argument("--host", default=DEFAULT_HOST,
+                        help="address to listen on (default: %(default)s; use 0.0.0.0 to accept the fleet)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--backend", choices=("windows", "fake"), help="override the shutdown backend")
+    parser.add_argument("--stand-in", type=int, metavar="N",
+                        help="run N simulated hosts on consecutive ports (or ephemeral ones with --port 0)")
+    parser.add_argument("--hosts-out", metavar="FILE", help="write the stand-ins' addresses as a hosts file")
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated command latency (stand-ins)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="simulated failure rate (stand-ins)")
+    args = parser.parse_args(argv)
+    try:
+        return asyncio.run(run_agent(args))
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Command-line interface that schedules, cancels and reports shutdowns
+without importing PyQt6."""
+
+import argparse
+import re
+import sys
+from datetime import datetime
+
+from shutdown_backend import (
+    TIMED_ACTIONS, backend_name, create_backend, run_cancel, run_schedule, shutdown_target, shutdown_target_at,
+)
+
+COMMANDS = ("schedule", "cancel", "status")
+COMMAND_FLAGS = ("--in", "--at", "--cancel", "--status")
+DURATION_PATTERN = re.compile(r"^(?:(\d+)h)?(?:(\d+)m)?$")
+NOTHING_SCHEDULED = "No shutdown is scheduled."
+NOTHING_TO_CANCEL = "Failed to cancel shutdown - No shutdown was scheduled."
+
+
+def is_headless_invocation(argv):
+    return any(arg in COMMANDS or arg.split("=", 1)[0] in COMMAND_FLAGS for arg in argv)
+
+
+def parse_duration(text):
+    """Parses '90', '90m', '2h' or '1h30m' into whole minutes."""
+    text = text.strip().lower()
+    if text.isdigit():
+        minutes = int(text)
+    else:
+        match = DURATION_PATTERN.match(text)
+        if not match or not any(match.groups()):
+            raise argparse.ArgumentTypeError(f"invalid duration: {text!r} (use e.g. 90m, 2h or 1h30m)")
+        minutes = int(match.group(1) or 0) * 60 + int(match.group(2) or 0)
+    if minutes < 1:
+        raise argparse.ArgumentTypeError("duration must be at least one minute")
+    return minutes
+
+
+def parse_clock_time(text):
+    try:
+        parsed = datetime.strptime(text.strip(), "%H:%M")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid time: {text!r} (use HH:MM)")
+    return parsed.hour, parsed.minute
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="ModernShutdownScheduler",
+        description="Schedule or cancel a system shutdown without opening the window.",
+    )
+    parser.add_argument("command", nargs="?", choices=COMMANDS)
+    when = parser.add_mutually_exclusive_group()
+    when.add_argument("--in", dest="in_minutes", type=parse_duration, metavar="DURATION",
+                      help="shut down after DURATION, e.g. 90m, 2h or 1h30m")
+    when.add_argument("--at", dest="at_time", type=parse_clock_time, metavar="HH:MM",
+                      help="shut down at the next HH:MM")
+    when.add_argument("--cancel", action="store_true", help="cancel a pending shutdown")
+    when.add_argument("--status", action="store_true", help="show the pending shutdown, if any")
+    parser.add_argument("--action", choices=tuple(TIMED_ACTIONS), default="shutdown",
+                        help="what to do at the scheduled time (default: shutdown)")
+    parser.add_argument("--backend", choices=("windows", "fake"), help="override the shutdown backend")
+    return parser
+
+
+def format_time(dt):
+    return dt.strftime("%Y-%m-%d %H:%M")
+
+
+def scheduled_message(action, target_time, seconds_until):
+    return f"Initiating system {action} at {format_time(target_time)} (in {seconds_until} seconds)"
+
+
+def status_message(pending, action="shutdown"):
+    seconds_left = max(0, int((pending - datetime.now()).total_seconds()))
+    return f"{action.capitalize()} scheduled at {format_time(pending)} ({seconds_left} seconds left)"
+
+
+# schedule, cancel and status return (exit code, stdout text, stderr text).
+def schedule(backend, target_time, seconds_until, action="shutdown"):
+    aborted, scheduled = run_schedule(backend, seconds_until, action)
+    replaced = "A shutdown was already pending and has been canceled.\n" if aborted.ok else ""
+    if not scheduled.ok:
+        return 1, replaced.rstrip(), f"Failed to schedule {action}: {scheduled.describe()}"
+    return 0, replaced + scheduled_message(action, target_time, seconds_until), ""
+
+
+def cancel(backend):
+    result = run_cancel(backend)
+    if result.ok:
+        return 0, "Shutdown has been canceled.", ""
+    if result.error is not None:
+        return 1, "", f"Error: {result.error}"
+    return 1, "", NOTHING_TO_CANCEL
+
+
+def status(backend):
+    pending = backend.pending()
+    if pending is None:
+        return 1, NOTHING_SCHEDULED, ""
+    return 0, status_message(pending.time, pending.action), ""
+
+
+def execute(backend, command, args):
+    if command == "cancel":
+        return cancel(backend)
+    if command == "status":
+        return status(backend)
+    target_time, seconds_until = target_for(args)
+    return schedule(backend, target_time, seconds_until, args.action)
+
+
+def print_reply(code, output, error):
+    if output:
+        print(output)
+    if error:
+        print(error, file=sys.stderr)
+    return code
+
+
+def parse_command(argv, parser=None):
+    """Returns (command, args); exits through parser.error() on bad input."""
+    parser = parser or build_parser()
+    args = parser.parse_args(argv)
+    command = args.command
+    if command is None:
+        if args.cancel:
+            command = "cancel"
+        elif args.status:
+            command = "status"
+        elif args.in_minutes is not None or args.at_time is not None:
+            command = "schedule"
+        else:
+            parser.error("nothing to do; use --in, --at, --cancel or --status")
+    if command == "schedule" and args.in_minutes is None and args.at_time is None:
+        parser.error("schedule needs --in DURATION or --at HH:MM")
+    if command != "schedule" and (args.in_minutes is not None or args.at_time is not None):
+        parser.error(f"--in and --at cannot be used with {command}")
+    return command, args
+
+
+def target_for(args):
+    if args.in_minutes is not None:
+        return shutdown_target(args.in_minutes)
+    return shutdown_target_at(*args.at_time)
+
+
+def forward(args, argv):
+    """Hands the command to a running window, if there is one; that window
+    owns the pending schedule. Returns the exit code or None."""
+    name = backend_name(args.backend)
+    if name is None:
+        return None
+    from single_instance import forward_command
+    reply = forward_command(name, argv)
+    if reply is None:
+        return None
+    return print_reply(*reply)
+
+
+def activate_running_instance():
+    """Asks a running window to come to the front; True if there was one."""
+    name = backend_name()
+    if name is None:
+        return False
+    from single_instance import forward_command
+    return forward_command(name, ["show"]) is not None
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    command, args = parse_command(argv)
+    code = forward(args, argv)
+    if code is not None:
+        return code
+
+    backend = create_backend(args.backend)
+    if backend is None:
+        print("This application can only run on Windows.", file=sys.stderr)
+        return 2
+    return print_reply(*execute(backend, command, args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
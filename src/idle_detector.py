@@ -0,0 +1,394 @@
+import os
+import platform
+import threading
+import time
+from array import array
+from collections import namedtuple
+
+IDLE_SOURCE_ENV_VAR = "SHUTDOWN_SCHEDULER_IDLE_SOURCE"
+IDLE_CPU_PERCENT = 10.0
+IDLE_DISK_BYTES_PER_SECOND = 1024 * 1024
+IDLE_NET_BYTES_PER_SECOND = 64 * 1024
+MIN_SAMPLE_INTERVAL = 5.0
+MAX_SAMPLE_INTERVAL = 60.0
+# Above this multiple of a threshold the machine is clearly busy and the
+# interval backs off; nearer the thresholds it samples at the base rate.
+BUSY_FACTOR = 3.0
+
+# Cumulative counter slots filled by a metrics source.
+CPU_BUSY, CPU_TOTAL, DISK_BYTES, NET_BYTES = range(4)
+COUNTER_SLOTS = 4
+
+IdleSample = namedtuple("IdleSample", ["cpu_percent", "disk_rate", "net_rate", "idle_seconds", "interval"])
+
+
+class MetricsSource:
+    """Fills a COUNTER_SLOTS array with cumulative counters: CPU busy and
+    total time, disk bytes and network bytes transferred. Only differences
+    between two reads matter, so any monotonic units work. A slot left at 0
+    counts as idle, so a source that cannot measure all three must raise
+    OSError when it is created rather than report a transfer as quiet."""
+
+    name = "base"
+
+    def read(self, counters, now):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class ProcMetricsSource(MetricsSource):
+    """Linux counters from /proc/stat, /proc/diskstats and /proc/net/dev.
+
+    The files stay open and are re-read with preadv into one preallocated
+    buffer, so a sample opens nothing and allocates little beyond the
+    parsing itself.
+    """
+
+    name = "proc"
+    BUFFER_SIZE = 64 * 1024
+    SECTOR_BYTES = 512
+
+    def __init__(self, root="/proc"):
+        self._buffer = bytearray(self.BUFFER_SIZE)
+        self._stat = os.open(os.path.join(root, "stat"), os.O_RDONLY)
+        self._diskstats = os.open(os.path.join(root, "diskstats"), os.O_RDONLY)
+        self._netdev = os.open(os.path.join(root, "net", "dev"), os.O_RDONLY)
+        try:
+            self._disks = frozenset(
+                name.encode() for name in os.listdir("/sys/block")
+                if not name.startswith(("loop", "ram", "zram", "dm-", "md"))
+            )
+        except OSError:
+            self._disks = None
+
+    def _load(self, fd):
+        size = os.preadv(fd, [self._buffer], 0)
+        while size == len(self._buffer):
+            self._buffer = bytearray(2 * len(self._buffer))
+            size = os.preadv(fd, [self._buffer], 0)
+        return size
+
+    def read(self, counters, now):
+        size = self._load(self._stat)
+        fields = self._buffer[:self._buffer.index(b"\n", 0, size)].split()
+        total = sum(int(v) for v in fields[1:9])
+        idle = int(fields[4]) + int(fields[5])
+        counters[CPU_BUSY] = total - idle
+        counters[CPU_TOTAL] = total
+
+        sectors = 0
+        size = self._load(self._diskstats)
+        for line in self._buffer[:size].splitlines():
+            fields = line.split()
+            if len(fields) >= 10 and (self._disks is None or bytes(fields[2]) in self._disks):
+                sectors += int(fields[5]) + int(fields[9])
+        counters[DISK_BYTES] = sectors * self.SECTOR_BYTES
+
+        transferred = 0
+        size = self._load(self._netdev)
+        for line in self._buffer[:size].splitlines()[2:]:
+            name, _, rest = line.partition(b":")
+            if name.strip() == b"lo":
+                continue
+            fields = rest.split()
+            if len(fields) >= 9:
+                transferred += int(fields[0]) + int(fields[8])
+        counters[NET_BYTES] = transferred
+
+    def close(self):
+        for fd in (self._stat, self._diskstats, self._netdev):
+            os.close(fd)
+
+
+class WindowsMetricsSource(MetricsSource):
+    """CPU time from GetSystemTimes; disk and network bytes from the raw
+    values of the PDH counters behind Disk Bytes/sec and Bytes Total/sec,
+    which are cumulative byte counts. Raises OSError when the counters
+    cannot be opened."""
+
+    name = "windows"
+    DISK_COUNTER = r"\PhysicalDisk(_Total)\Disk Bytes/sec"
+    NET_COUNTER = r"\Network Interface(*)\Bytes Total/sec"
+    PDH_MORE_DATA = 0x800007D2
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        class PdhRawCounter(ctypes.Structure):
+            _fields_ = [
+                ("CStatus", wintypes.DWORD),
+                ("TimeStamp", wintypes.FILETIME),
+                ("FirstValue", ctypes.c_longlong),
+                ("SecondValue", ctypes.c_longlong),
+                ("MultiCount", wintypes.DWORD),
+            ]
+
+        class PdhRawCounterItem(ctypes.Structure):
+            _fields_ = [("szName", wintypes.LPWSTR), ("RawValue", PdhRawCounter)]
+
+        self._ctypes = ctypes
+        self._item_type = PdhRawCounterItem
+        self._get_system_times = ctypes.windll.kernel32.GetSystemTimes
+        self._times = [wintypes.FILETIME() for _ in range(3)]
+        self._refs = [ctypes.byref(t) for t in self._times]
+        self._pdh = ctypes.windll.pdh
+        for fn in ("PdhOpenQueryW", "PdhAddEnglishCounterW", "PdhCollectQueryData",
+                   "PdhGetRawCounterValue", "PdhGetRawCounterArrayW", "PdhCloseQuery"):
+            getattr(self._pdh, fn).restype = wintypes.DWORD
+        self._query = wintypes.HANDLE()
+        self._check(self._pdh.PdhOpenQueryW(None, None, ctypes.byref(self._query)), "PdhOpenQueryW")
+        try:
+            self._disk = self._add_counter(self.DISK_COUNTER)
+            self._net = self._add_counter(self.NET_COUNTER)
+            self._raw = PdhRawCounter()
+            self._raw_ref = ctypes.byref(self._raw)
+            self._size = wintypes.DWORD()
+            self._count = wintypes.DWORD()
+            self._items = ctypes.create_string_buffer(4096)
+            # A query that cannot be read now never will be.
+            self._check(self._pdh.PdhCollectQueryData(self._query), "PdhCollectQueryData")
+            self._check(self._pdh.PdhGetRawCounterValue(self._disk, None, self._raw_ref), "PdhGetRawCounterValue")
+            if self._net_bytes() is None:
+                raise OSError(f"Could not read {self.NET_COUNTER}")
+        except OSError:
+            self.close()
+            raise
+
+    @staticmethod
+    def _check(status, what):
+        if status != 0:
+            raise OSError(f"{what} failed with PDH status 0x{status:08X}")
+
+    def _add_counter(self, path):
+        counter = self._ctypes.c_void_p()
+        self._check(self._pdh.PdhAddEnglishCounterW(self._query, path, None, self._ctypes.byref(counter)),
+                    f"PdhAddEnglishCounterW({path})")
+        return counter
+
+    def _net_bytes(self):
+        """Sum over every interface instance, or None if it cannot be read."""
+        ctypes = self._ctypes
+        self._size.value = len(self._items)
+        status = self._pdh.PdhGetRawCounterArrayW(self._net, ctypes.byref(self._size), ctypes.byref(self._count),
+                                                  self._items)
+        if status == self.PDH_MORE_DATA:
+            self._items = ctypes.create_string_buffer(self._size.value)
+            status = self._pdh.PdhGetRawCounterArrayW(self._net, ctypes.byref(self._size),
+                                                      ctypes.byref(self._count), self._items)
+        if status != 0:
+            return None
+        items = ctypes.cast(self._items, ctypes.POINTER(self._item_type))
+        return sum(items[i].RawValue.FirstValue for i in range(self._count.value))
+
+    @staticmethod
+    def _value(filetime):
+        return (filetime.dwHighDateTime << 32) | filetime.dwLowDateTime
+
+    def read(self, counters, now):
+        if not self._get_system_times(*self._refs):
+            return
+        idle, kernel, user = (self._value(t) for t in self._times)
+        # Kernel time includes idle time.
+        counters[CPU_BUSY] = kernel + user - idle
+        counters[CPU_TOTAL] = kernel + user
+        if self._pdh.PdhCollectQueryData(self._query) != 0:
+            return
+        if self._pdh.PdhGetRawCounterValue(self._disk, None, self._raw_ref) == 0:
+            counters[DISK_BYTES] = self._raw.FirstValue
+        transferred = self._net_bytes()
+        if transferred is not None:
+            counters[NET_BYTES] = transferred
+
+    def close(self):
+        if self._query:
+            self._pdh.PdhCloseQuery(self._query)
+            self._query = None
+
+
+class SyntheticMetricsSource(MetricsSource):
+    """Scripted activity for tests and benchmarks.
+
+    segments is a sequence of (seconds, cpu_fraction, disk_rate, net_rate)
+    counted from `start` (by default the first read); the last segment lasts
+    forever. Counters are integrated against the `now`
+    passed to read(), so a virtual clock can replay hours in milliseconds.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, segments=((0, 0.0, 0, 0),), start=None):
+        self.segments = tuple(segments)
+        self.start = start
+        self._totals = array("d", bytes(8 * COUNTER_SLOTS))
+        self._last = start
+
+    def _rates(self, t):
+        elapsed = t - self.start
+        for seconds, cpu, disk, net in self.segments[:-1]:
+            if elapsed < seconds:
+                return cpu, disk, net
+            elapsed -= seconds
+        return self.segments[-1][1:]
+
+    def read(self, counters, now):
+        if self.start is None:
+            self.start = self._last = now
+        totals = self._totals
+        # Integrate in whole seconds so segment changes land where expected.
+        t = self._last
+        while t < now:
+            step = min(1.0, now - t)
+            cpu, disk, net = self._rates(t)
+            totals[CPU_BUSY] += cpu * step
+            totals[CPU_TOTAL] += step
+            totals[DISK_BYTES] += disk * step
+            totals[NET_BYTES] += net * step
+            t += step
+        self._last = now
+        counters[:] = totals
+
+
+def create_metrics_source(name=None):
+    if name is None:
+        name = os.environ.get(IDLE_SOURCE_ENV_VAR)
+    if name is None:
+        if platform.system() == "Windows":
+            name = "windows"
+        elif os.path.exists("/proc/stat"):
+            name = "proc"
+    try:
+        if name == "proc":
+            return ProcMetricsSource()
+        if name == "windows":
+            # Without disk and network counters a download would look idle.
+            return WindowsMetricsSource()
+    except (OSError, AttributeError):
+        # AttributeError: ctypes.windll outside Windows.
+        return None
+    if name == "synthetic":
+        return SyntheticMetricsSource()
+    return None
+
+
+class IdleDetector:
+    """Decides when the machine has stayed under the CPU, disk and network
+    thresholds for idle_seconds.
+
+    Each sample turns the difference between two cumulative counter reads
+    into rates; the two counter arrays are allocated once and swapped. While
+    the machine is idle or close to a threshold it samples every
+    min_interval; while it is clearly busy the interval doubles up to
+    max_interval, since the idle clock cannot start until the load drops.
+    """
+
+    def __init__(self, source, idle_seconds, cpu_percent=IDLE_CPU_PERCENT, disk_rate=IDLE_DISK_BYTES_PER_SECOND,
+                 net_rate=IDLE_NET_BYTES_PER_SECOND, min_interval=MIN_SAMPLE_INTERVAL,
+                 max_interval=MAX_SAMPLE_INTERVAL, clock=time.monotonic):
+        self.source = source
+        self.idle_seconds = idle_seconds
+        self.thresholds = (cpu_percent, disk_rate, net_rate)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.clock = clock
+        self._prev = array("d", bytes(8 * COUNTER_SLOTS))
+        self._cur = array("d", bytes(8 * COUNTER_SLOTS))
+        self.sample_count = 0
+        self.reset()
+
+    def reset(self):
+        self._last = None
+        self.idle_since = None
+        self.interval = self.min_interval
+        self.cpu_percent = self.disk_rate = self.net_rate = 0.0
+
+    def idle_for(self, now=None):
+        if self.idle_since is None:
+            return 0.0
+        return (self.clock() if now is None else now) - self.idle_since
+
+    def sample(self, now=None):
+        """Reads the counters once; returns True when idle_seconds is reached."""
+        if now is None:
+            now = self.clock()
+        cur, prev = self._cur, self._prev
+        self.source.read(cur, now)
+        self.sample_count += 1
+        last, self._last = self._last, now
+        self._cur, self._prev = prev, cur
+        if last is None or now <= last:
+            return False
+        elapsed = now - last
+        cpu_total = cur[CPU_TOTAL] - prev[CPU_TOTAL]
+        self.cpu_percent = 100.0 * (cur[CPU_BUSY] - prev[CPU_BUSY]) / cpu_total if cpu_total > 0 else 0.0
+        self.disk_rate = (cur[DISK_BYTES] - prev[DISK_BYTES]) / elapsed
+        self.net_rate = (cur[NET_BYTES] - prev[NET_BYTES]) / elapsed
+        cpu_limit, disk_limit, net_limit = self.thresholds
+        load = max(self.cpu_percent / cpu_limit, self.disk_rate / disk_limit, self.net_rate / net_limit)
+
+        if load > 1.0:
+            self.idle_since = None
+            if load >= BUSY_FACTOR:
+                self.interval = min(self.max_interval, self.interval * 2)
+            else:
+                self.interval = self.min_interval
+            return False
+        if self.idle_since is None:
+            # The whole window just measured was quiet.
+            self.idle_since = last
+        self.interval = self.min_interval
+        remaining = self.idle_seconds - (now - self.idle_since)
+        if remaining <= 0:
+            return True
+        self.interval = min(self.interval, remaining)
+        return False
+
+    def snapshot(self, now=None):
+        return IdleSample(self.cpu_percent, self.disk_rate, self.net_rate, self.idle_for(now), self.interval)
+
+
+class IdleWatcher:
+    """Runs an IdleDetector on a daemon thread.
+
+    on_sample(IdleSample) is called after every sample and on_idle() once
+    the idle time is reached, after which the thread stops. Both run on the
+    watcher thread; a GUI hands them on with queued signals.
+    """
+
+    def __init__(self, detector, on_sample=None, on_idle=None):
+        self.detector = detector
+        self.on_sample = on_sample
+        self.on_idle = on_idle
+        self._stop = threading.Event()
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running():
+            return
+        self._stop.clear()
+        self.detector.reset()
+        self.detector.sample()
+        self._thread = threading.Thread(target=self._run, name="idle-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+
+    def _run(self):
+        detector = self.detector
+        while not self._stop.wait(detector.interval):
+            reached = detector.sample()
+            if self.on_sample is not None:
+                self.on_sample(detector.snapshot())
+            if reached:
+                if self.on_idle is not None:
+                    self.on_idle()
+                return
@@ -0,0 +1,149 @@
+from collections import namedtuple
+
+MINUTES_IN_DAY = 24 * 60
+COLOR_TRANSITION_MINUTES = 240
+MORNING_COLOR = (255, 200, 120)
+DAY_COLOR = (255, 255, 255)
+EVENING_COLOR = (255, 140, 70)
+NIGHT_COLOR = (0, 0, 0)
+BLUE_COLOR = (79, 140, 255)
+ORANGE_COLOR = (220, 140, 60)
+RED_COLOR = (255, 60, 60)
+LAVENDER_COLOR = (100, 100, 200)
+LIGHT_TEXT_COLOR = (255, 255, 255)
+DARK_TEXT_COLOR = (50, 50, 50)
+
+# (start minute, from color, to color). Before the first keyframe the first
+# "from" color is held, between transitions the previous "to" color is held.
+BACKGROUND_KEYFRAMES = (
+    (5 * 60, NIGHT_COLOR, MORNING_COLOR),
+    (8 * 60, MORNING_COLOR, DAY_COLOR),
+    (19 * 60, DAY_COLOR, EVENING_COLOR),
+    (22 * 60, EVENING_COLOR, NIGHT_COLOR),
+)
+TEXT_KEYFRAMES = (
+    (5 * 60, LIGHT_TEXT_COLOR, DARK_TEXT_COLOR),
+    (8 * 60, DARK_TEXT_COLOR, DARK_TEXT_COLOR),
+    (19 * 60, DARK_TEXT_COLOR, LIGHT_TEXT_COLOR),
+    (22 * 60, LIGHT_TEXT_COLOR, LIGHT_TEXT_COLOR),
+)
+SLIDER_KEYFRAMES = (
+    (5 * 60, LAVENDER_COLOR, ORANGE_COLOR),
+    (8 * 60, ORANGE_COLOR, BLUE_COLOR),
+    (19 * 60, BLUE_COLOR, RED_COLOR),
+    (22 * 60, RED_COLOR, LAVENDER_COLOR),
+)
+# (start hour, period name), evaluated like the keyframes above.
+PERIODS = (
+    (5, "morning"),
+    (8, "day"),
+    (19, "evening"),
+    (22, "night"),
+)
+
+PaletteEntry = namedtuple(
+    "PaletteEntry",
+    ["bg", "text", "slider", "bg_str", "text_str", "slider_str", "period"],
+)
+
+
+def interpolate_color(color1, color2, factor):
+    r = int(color1[0] * (1 - factor) + color2[0] * factor)
+    g = int(color1[1] * (1 - factor) + color2[1] * factor)
+    b = int(color1[2] * (1 - factor) + color2[2] * factor)
+    return r, g, b
+
+
+def rgb_to_string(rgb_tuple):
+    return f"rgb({rgb_tuple[0]}, {rgb_tuple[1]}, {rgb_tuple[2]})"
+
+
+def evaluate_keyframes(keyframes, total_minutes, transition_minutes=COLOR_TRANSITION_MINUTES):
+    if total_minutes < keyframes[0][0]:
+        return tuple(keyframes[0][1])
+    for start, from_color, to_color in keyframes:
+        if total_minutes < start:
+            return tuple(from_color)
+        if total_minutes < start + transition_minutes:
+            if from_color == to_color:
+                return tuple(from_color)
+            progress = (total_minutes - start) / transition_minutes
+            return interpolate_color(from_color, to_color, progress)
+    return tuple(keyframes[-1][2])
+
+
+def period_for_hour(hour, periods=PERIODS):
+    name = periods[-1][1]
+    for start, period in periods:
+        if hour < start:
+            break
+        name = period
+    return name
+
+
+class Palette:
+    """Time-of-day colors as a per-minute lookup table.
+
+    Each minute of the day is evaluated once, on first use or all at once via
+    compile(); identical colors and strings share one object, so a query is a
+    single list index regardless of how many keyframes were supplied.
+    """
+
+    def __init__(self, background=BACKGROUND_KEYFRAMES, text=TEXT_KEYFRAMES,
+                 slider=SLIDER_KEYFRAMES, periods=PERIODS,
+                 transition_minutes=COLOR_TRANSITION_MINUTES, lazy=False):
+        self.transition_minutes = transition_minutes
+        self._background = sorted(background, key=lambda k: k[0])
+        self._text = sorted(text, key=lambda k: k[0])
+        self._slider = sorted(slider, key=lambda k: k[0])
+        self._periods = sorted(periods, key=lambda p: p[0])
+        self._colors = {}
+        self._strings = {}
+        self._interned = {}
+        self._entries = [None] * MINUTES_IN_DAY
+        if not lazy:
+            self.compile()
+
+    def compile(self):
+        for minute in range(MINUTES_IN_DAY):
+            if self._entries[minute] is None:
+                self._build(minute)
+        return self
+
+    def _build(self, minute):
+        colors = self._colors
+        strings = self._strings
+        bg = evaluate_keyframes(self._background, minute, self.transition_minutes)
+        fg = evaluate_keyframes(self._text, minute, self.transition_minutes)
+        sl = evaluate_keyframes(self._slider, minute, self.transition_minutes)
+        bg = colors.setdefault(bg, bg)
+        fg = colors.setdefault(fg, fg)
+        sl = colors.setdefault(sl, sl)
+        for color in (bg, fg, sl):
+            if color not in strings:
+                strings[color] = rgb_to_string(color)
+        entry = PaletteEntry(
+            bg, fg, sl, strings[bg], strings[fg], strings[sl],
+            period_for_hour(minute // 60, self._periods),
+        )
+        entry = self._entries[minute] = self._interned.setdefault(entry, entry)
+        return entry
+
+    def __len__(self):
+        return len(self._entries)
+
+    def entry(self, total_minutes):
+        minute = total_minutes % MINUTES_IN_DAY
+        return self._entries[minute] or self._build(minute)
+
+    def at(self, time_obj):
+        minute = time_obj.hour * 60 + time_obj.minute
+        return self._entries[minute] or self._build(minute)
+
+    def distinct_entries(self):
+        return len({id(e) for e in self.compile()._entries})
+
+
+# Built lazily so importing the module stays cheap; the GUI compiles the rest
+# of the table once the first frame is up.
+DEFAULT_PALETTE = Palette(lazy=True)
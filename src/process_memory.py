@@ -0,0 +1,60 @@
+"""Resident memory of this process, and handing freed memory back to the OS.
+
+Freeing widgets and pixmaps returns their memory to the C allocator, which
+usually keeps it mapped; trim() asks it (and on Windows the memory manager)
+to give it back so the saving shows up in the working set.
+"""
+
+import ctypes
+import gc
+import os
+import sys
+
+
+def resident_bytes():
+    """The current resident set (working set on Windows), or None when it
+    cannot be read on this platform."""
+    if sys.platform == "win32":
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return None
+        return counters.WorkingSetSize
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def trim():
+    """Collects garbage and returns free heap pages to the OS where the
+    platform allows it. Returns whether the platform reports that anything
+    was handed back."""
+    gc.collect()
+    if sys.platform == "win32":
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        return bool(ctypes.windll.kernel32.SetProcessWorkingSetSize(process, ctypes.c_size_t(-1), ctypes.c_size_t(-1)))
+    if sys.platform.startswith("linux"):
+        try:
+            return bool(ctypes.CDLL("libc.so.6").malloc_trim(0))
+        except (OSError, AttributeError):
+            return False
+    return False
@@ -0,0 +1,186 @@
+import calendar
+import functools
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from itertools import islice
+
+MINUTES_IN_DAY = 24 * 60
+# Weekday/date combinations repeat every 28 years between 1901 and 2099, so a
+# rule that has not matched within that window never will (e.g. 30 February).
+MAX_SEARCH_YEARS = 28
+YEAR_CACHE_SIZE = 4
+PREVIEW_COUNT = 5
+
+CRON_ALIASES = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+MONTH_NAMES = {name: i for i, name in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), 1)}
+WEEKDAY_NAMES = {name: i for i, name in enumerate(("sun", "mon", "tue", "wed", "thu", "fri", "sat"))}
+DAILY = "{minute} {hour} * * *"
+WEEKDAYS = "{minute} {hour} * * 1-5"
+
+
+def parse_field(text, low, high, names=None):
+    """Expands one cron field ('*', '1-5', '*/15', 'mon,wed') into a frozenset."""
+    names = names or {}
+
+    def value(token):
+        token = token.strip().lower()
+        number = names[token] if token in names else int(token) if token.isdigit() else None
+        if number is None or not low <= number <= high:
+            raise ValueError(f"invalid value {token!r} (expected {low}-{high})")
+        return number
+
+    values = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            if not step_text.isdigit() or int(step_text) < 1:
+                raise ValueError(f"invalid step {step_text!r}")
+            step = int(step_text)
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (value(token) for token in part.split("-", 1))
+            if start > end:
+                raise ValueError(f"invalid range {part!r}")
+        else:
+            start = value(part)
+            end = high if step > 1 else start
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+def parse_exclusions(text):
+    """Parses '2026-12-24, 2026-12-31' into a frozenset of dates."""
+    dates = set()
+    for token in text.replace(";", ",").split(","):
+        token = token.strip()
+        if not token:
+            continue
+        try:
+            dates.add(date.fromisoformat(token))
+        except ValueError:
+            raise ValueError(f"invalid date {token!r} (use YYYY-MM-DD)")
+    return frozenset(dates)
+
+
+class RecurrenceRule:
+    """A cron-like 'minute hour day-of-month month day-of-week' rule.
+
+    The rule is compiled into a sorted tuple of fire minutes within a day and,
+    per calendar year (built lazily and cached), a sorted list of the matching
+    day ordinals with excluded dates already removed. next_fire() is then two
+    binary searches instead of a minute-by-minute scan. Like cron, when both
+    day-of-month and day-of-week are restricted a day matching either fires.
+    Times are local wall-clock times.
+    """
+
+    def __init__(self, expression, exclusions=()):
+        expression = " ".join(expression.split())
+        fields = CRON_ALIASES.get(expression.lower(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"expected 5 fields (minute hour day month weekday), got {len(fields)}")
+        self.expression = expression
+        minutes = parse_field(fields[0], 0, 59)
+        hours = parse_field(fields[1], 0, 23)
+        self.days_of_month = parse_field(fields[2], 1, 31)
+        self.months = tuple(sorted(parse_field(fields[3], 1, 12, MONTH_NAMES)))
+        weekdays = parse_field(fields[4], 0, 7, WEEKDAY_NAMES)
+        self.weekdays = frozenset(d % 7 for d in weekdays)
+        self.any_day_of_month = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+        self.exclusions = frozenset(exclusions)
+        self.times = tuple(sorted(h * 60 + m for h in hours for m in minutes))
+        self._years = {}
+
+    def __repr__(self):
+        return f"RecurrenceRule({self.expression!r})"
+
+    def __str__(self):
+        return self.expression
+
+    @classmethod
+    def daily(cls, hour, minute, exclusions=()):
+        return cls(DAILY.format(hour=hour, minute=minute), exclusions)
+
+    @classmethod
+    def weekdays(cls, hour, minute, exclusions=()):
+        return cls(WEEKDAYS.format(hour=hour, minute=minute), exclusions)
+
+    def next_fire(self, after):
+        """Returns the first fire time strictly after `after`, or None."""
+        ordinal = after.toordinal()
+        if self._day_matches(ordinal):
+            i = bisect_right(self.times, after.hour * 60 + after.minute)
+            if i < len(self.times):
+                return self._at(ordinal, self.times[i])
+        ordinal = self._next_day(ordinal)
+        return None if ordinal is None else self._at(ordinal, self.times[0])
+
+    def iter_fires(self, after):
+        fire = self.next_fire(after)
+        while fire is not None:
+            yield fire
+            fire = self.next_fire(fire)
+
+    def preview(self, after, count=PREVIEW_COUNT):
+        return list(islice(self.iter_fires(after), count))
+
+    @staticmethod
+    def _at(ordinal, minute_of_day):
+        return datetime.fromordinal(ordinal) + timedelta(minutes=minute_of_day)
+
+    def _day_matches(self, ordinal):
+        days = self._days(date.fromordinal(ordinal).year)
+        i = bisect_left(days, ordinal)
+        return i < len(days) and days[i] == ordinal
+
+    def _next_day(self, ordinal):
+        year = date.fromordinal(ordinal).year
+        for y in range(year, year + MAX_SEARCH_YEARS + 1):
+            days = self._days(y)
+            i = bisect_right(days, ordinal)
+            if i < len(days):
+                return days[i]
+        return None
+
+    def _days(self, year):
+        days = self._years.get(year)
+        if days is not None:
+            return days
+        days = []
+        for month in self.months:
+            first_weekday, length = calendar.monthrange(year, month)
+            first = date(year, month, 1).toordinal()
+            for dom in range(1, length + 1):
+                # calendar counts Monday as 0, cron counts Sunday as 0.
+                if self._matches(dom, (first_weekday + dom) % 7):
+                    days.append(first + dom - 1)
+        if self.exclusions:
+            days = [o for o in days if date.fromordinal(o) not in self.exclusions]
+        if len(self._years) >= YEAR_CACHE_SIZE:
+            del self._years[next(iter(self._years))]
+        self._years[year] = days
+        return days
+
+    def _matches(self, day_of_month, weekday):
+        dom_ok = day_of_month in self.days_of_month
+        dow_ok = weekday in self.weekdays
+        if self.any_day_of_month or self.any_weekday:
+            return dom_ok and dow_ok
+        return dom_ok or dow_ok
+
+
+@functools.lru_cache(maxsize=256)
+def compile_rule(expression, exclusions=frozenset()):
+    """Returns a shared RecurrenceRule; rules are immutable once compiled."""
+    return RecurrenceRule(expression, exclusions)
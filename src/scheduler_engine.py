@@ -0,0 +1,172 @@
+import heapq
+import itertools
+import time
+from datetime import datetime
+
+ACTIONS = {
+    "shutdown": "Shutdown",
+    "restart": "Restart",
+    "hibernate": "Hibernate",
+    "logoff": "Log off",
+    "reminder": "Reminder",
+}
+# Actions the OS can count down itself (shutdown /t); the earliest of these is
+# handed to the backend so it still happens if the app is closed.
+SYSTEM_ACTIONS = ("shutdown", "restart")
+COMPACT_MIN_STALE = 64
+
+
+class ScheduledJob:
+    __slots__ = ("deadline", "id", "action", "note", "created", "active", "rule")
+
+    def __init__(self, deadline, job_id, action, note="", created=None, rule=None):
+        self.deadline = deadline
+        self.id = job_id
+        self.action = action
+        self.note = note
+        self.created = time.time() if created is None else created
+        self.active = True
+        # A recurring job is only ever armed for its next occurrence; the
+        # following one is added when this one fires.
+        self.rule = rule
+
+    def __lt__(self, other):
+        return (self.deadline, self.id) < (other.deadline, other.id)
+
+    def __repr__(self):
+        return f"ScheduledJob(id={self.id}, action={self.action!r}, deadline={self.deadline:.0f})"
+
+    @property
+    def label(self):
+        return ACTIONS.get(self.action, self.action)
+
+
+class SchedulerEngine:
+    """Timed jobs ordered by deadline (wall-clock epoch seconds).
+
+    Jobs sit in one global heap and in a heap per action, so the earliest job
+    overall or of a given action is an O(1) peek and adding a job is
+    O(log n). Cancelling only marks the job inactive; stale heap entries are
+    skipped when they surface and the heaps are rebuilt once stale entries
+    outnumber live ones, which keeps cancellation amortized O(log n).
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._by_action = {}
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._stale = 0
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def __contains__(self, job_id):
+        return job_id in self._jobs
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def add(self, action, deadline, note="", rule=None, created=None):
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown action: {action!r}")
+        job = ScheduledJob(deadline, next(self._ids), action, note, created, rule)
+        self._jobs[job.id] = job
+        heapq.heappush(self._heap, job)
+        heapq.heappush(self._by_action.setdefault(action, []), job)
+        return job
+
+    def add_recurring(self, action, rule, note="", now=None):
+        """Arms the next occurrence of `rule` (see recurrence.RecurrenceRule)."""
+        if now is None:
+            now = time.time()
+        fire = rule.next_fire(datetime.fromtimestamp(now))
+        if fire is None:
+            raise ValueError(f"{rule} never fires")
+        return self.add(action, fire.timestamp(), note, rule)
+
+    def cancel(self, job_id):
+        job = self._jobs.pop(job_id, None)
+        if job is None:
+            return None
+        self._retire(job)
+        return job
+
+    def clear(self):
+        jobs = list(self._jobs.values())
+        self._jobs.clear()
+        self._heap.clear()
+        self._by_action.clear()
+        self._stale = 0
+        for job in jobs:
+            job.active = False
+        return jobs
+
+    def peek(self, actions=None):
+        if actions is None:
+            return self._top(self._heap)
+        best = None
+        for action in actions:
+            job = self._top(self._by_action.get(action))
+            if job is not None and (best is None or job < best):
+                best = job
+        return best
+
+    def next_deadline(self):
+        job = self._top(self._heap)
+        return None if job is None else job.deadline
+
+    def pop_due(self, now=None):
+        if now is None:
+            now = time.time()
+        due = []
+        heap = self._heap
+        while heap:
+            job = heap[0]
+            if not job.active:
+                heapq.heappop(heap)
+                self._stale -= 1
+                continue
+            if job.deadline > now:
+                break
+            heapq.heappop(heap)
+            del self._jobs[job.id]
+            job.active = False
+            # Still referenced by its action heap, which skips it lazily.
+            self._stale += 1
+            due.append(job)
+        for job in due:
+            if job.rule is not None:
+                # Occurrences missed while asleep are skipped, not replayed.
+                fire = job.rule.next_fire(datetime.fromtimestamp(max(job.deadline, now)))
+                if fire is not None:
+                    self.add(job.action, fire.timestamp(), job.note, job.rule)
+        self._maybe_compact()
+        return due
+
+    def jobs(self):
+        return sorted(self._jobs.values())
+
+    def _retire(self, job):
+        job.active = False
+        self._stale += 2
+        self._maybe_compact()
+
+    def _top(self, heap):
+        while heap and not heap[0].active:
+            heapq.heappop(heap)
+            self._stale -= 1
+        return heap[0] if heap else None
+
+    def _maybe_compact(self):
+        if self._stale < COMPACT_MIN_STALE or self._stale < 2 * len(self._jobs):
+            return
+        live = list(self._jobs.values())
+        self._heap = live[:]
+        heapq.heapify(self._heap)
+        self._by_action = {}
+        for job in live:
+            self._by_action.setdefault(job.action, []).append(job)
+        for heap in self._by_action.values():
+            heapq.heapify(heap)
+        self._stale = 0
@@ -0,0 +1,273 @@
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+BACKEND_ENV_VAR = "SHUTDOWN_SCHEDULER_BACKEND"
+FAKE_LATENCY_ENV_VAR = "SHUTDOWN_SCHEDULER_FAKE_LATENCY"
+APP_DIR_NAME = "ModernShutdownScheduler"
+TIMED_ACTIONS = {"shutdown": "/s", "restart": "/r"}
+IMMEDIATE_ACTIONS = {"hibernate": "/h", "logoff": "/l"}
+
+
+class ShutdownResult(namedtuple("ShutdownResult", ["action", "returncode", "output", "error", "elapsed"])):
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return self.error is None and self.returncode == 0
+
+    def describe(self):
+        if self.error is not None:
+            return self.error
+        return self.output.strip() or f"exit code {self.returncode}"
+
+
+# A pending OS countdown as recorded by the backend: when and what.
+PendingShutdown = namedtuple("PendingShutdown", ["time", "action"])
+
+
+def state_dir():
+    if platform.system() == "Windows":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+    return os.path.join(base, APP_DIR_NAME)
+
+
+def shutdown_target(offset_minutes, now=None):
+    """Returns (target_time, seconds_until) for a shutdown offset_minutes from
+    now, rounded down to the start of the minute like the slider shows it."""
+    if now is None:
+        now = datetime.now()
+    target_time = (now + timedelta(minutes=offset_minutes)).replace(second=0, microsecond=0)
+    return target_time, int((target_time - now).total_seconds())
+
+
+def shutdown_target_at(hour, minute, now=None):
+    """Returns (target_time, seconds_until) for the next hour:minute."""
+    if now is None:
+        now = datetime.now()
+    target_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target_time <= now:
+        target_time += timedelta(days=1)
+    return target_time, int((target_time - now).total_seconds())
+
+
+class ShutdownBackend:
+    """Performs the OS-level shutdown commands.
+
+    Implementations block until the command has finished and never raise;
+    failures are reported through the returned ShutdownResult. The OS has no
+    way to ask for a pending shutdown, so when state_path is set successful
+    calls are recorded there for status().
+    """
+
+    name = "base"
+
+    def __init__(self, state_path=None):
+        self.state_path = state_path
+
+    def abort(self):
+        raise NotImplementedError
+
+    def schedule(self, seconds, action="shutdown"):
+        """Starts an OS countdown for one of the TIMED_ACTIONS."""
+        raise NotImplementedError
+
+    def execute(self, action):
+        """Runs one of the IMMEDIATE_ACTIONS right away."""
+        raise NotImplementedError
+
+    def status(self):
+        """Returns the recorded pending shutdown as a datetime, or None."""
+        pending = self.pending()
+        return None if pending is None else pending.time
+
+    def pending(self):
+        """Returns the recorded PendingShutdown, or None."""
+        if self.state_path is None:
+            return None
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                record = json.load(f)
+            deadline = float(record["deadline"])
+            # Files written before the action was recorded were all shutdowns.
+            action = record.get("action", "shutdown")
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+        if deadline <= time.time() or action not in TIMED_ACTIONS:
+            return None
+        return PendingShutdown(datetime.fromtimestamp(math.ceil(deadline)), action)
+
+    def _record(self, result, deadline=None, action=None):
+        if self.state_path is None or not result.ok:
+            return result
+        try:
+            if deadline is None:
+                os.remove(self.state_path)
+            else:
+                os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+                with open(self.state_path, "w", encoding="utf-8") as f:
+                    json.dump({"deadline": deadline, "action": action}, f)
+        except OSError:
+            pass
+        return result
+
+    def _timed(self, action, fn):
+        start = time.perf_counter()
+        try:
+            returncode, output = fn()
+            error = None
+        except Exception as e:
+            returncode, output, error = None, "", str(e)
+        return ShutdownResult(action, returncode, output, error, time.perf_counter() - start)
+
+
+class WindowsShutdownBackend(ShutdownBackend):
+    name = "windows"
+
+    def _run(self, args):
+        res = subprocess.run(args, capture_output=True, text=True, creationflags=subprocess.CREATE_NO_WINDOW)
+        return res.returncode, (res.stdout or "") + (res.stderr or "")
+
+    def abort(self):
+        return self._record(self._timed("abort", lambda: self._run(["shutdown", "/a"])))
+
+    def schedule(self, seconds, action="shutdown"):
+        deadline = time.time() + seconds
+        args = ["shutdown", TIMED_ACTIONS[action], "/t", str(seconds)]
+        return self._record(self._timed(action, lambda: self._run(args)), deadline, action)
+
+    def execute(self, action):
+        return self._timed(action, lambda: self._run(["shutdown", IMMEDIATE_ACTIONS[action]]))
+
+
+class FakeShutdownBackend(ShutdownBackend):
+    """In-memory backend that records calls instead of shutting anything down.
+
+    latency is slept on every call to mimic process start-up; actions listed
+    in failures, or picked at failure_rate, return a non-zero code.
+    """
+
+    name = "fake"
+
+    def __init__(self, latency=0.0, failures=(), failure_rate=0.0, seed=None, state_path=None):
+        super().__init__(state_path)
+        self.latency = latency
+        self.failures = set(failures)
+        self.failure_rate = failure_rate
+        self.calls = []
+        self.pending_deadline = None
+        self.pending_action = None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _should_fail(self, action):
+        return action in self.failures or (self.failure_rate and self._random.random() < self.failure_rate)
+
+    def _abort(self):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls.append(("abort",))
+            if self._should_fail("abort"):
+                return 1, "simulated failure"
+            if self.status() is None:
+                return 1116, "Unable to abort the system shutdown because no shutdown was in progress."
+            self.pending_deadline = None
+            return 0, ""
+
+    def _schedule(self, seconds, action):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls.append(("schedule", seconds, action))
+            if self._should_fail("schedule") or self._should_fail(action):
+                return 1, "simulated failure"
+            if self.status() is not None:
+                return 1190, "A system shutdown has already been scheduled."
+            self.pending_deadline = time.time() + seconds
+            self.pending_action = action
+            return 0, ""
+
+    def abort(self):
+        return self._record(self._timed("abort", self._abort))
+
+    def schedule(self, seconds, action="shutdown"):
+        if action not in TIMED_ACTIONS:
+            raise ValueError(f"{action!r} cannot be scheduled by the OS")
+        result = self._timed(action, lambda: self._schedule(seconds, action))
+        return self._record(result, self.pending_deadline, self.pending_action)
+
+    def _execute(self, action):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls.append(("execute", action))
+            if self._should_fail(action):
+                return 1, "simulated failure"
+            return 0, ""
+
+    def execute(self, action):
+        if action not in IMMEDIATE_ACTIONS:
+            raise ValueError(f"{action!r} is not an immediate action")
+        return self._timed(action, lambda: self._execute(action))
+
+    def pending(self):
+        if self.pending_deadline is None and self.state_path is not None:
+            recorded = super().pending()
+            if recorded is not None:
+                self.pending_deadline, self.pending_action = recorded.time.timestamp(), recorded.action
+        if self.pending_deadline is not None and self.pending_deadline <= time.time():
+            self.pending_deadline = None
+        if self.pending_deadline is None:
+            return None
+        return PendingShutdown(datetime.fromtimestamp(math.ceil(self.pending_deadline)), self.pending_action)
+
+
+def run_schedule(backend, seconds, action="shutdown", replace=True):
+    """Replaces any pending shutdown with `action` in `seconds`.
+
+    Returns (abort_result, schedule_result); a successful abort means a
+    previously pending shutdown was canceled. With replace=False nothing is
+    aborted and abort_result is None.
+    """
+    if not replace:
+        return None, backend.schedule(seconds, action)
+    return backend.abort(), backend.schedule(seconds, action)
+
+
+def run_action(backend, action):
+    return backend.execute(action)
+
+
+def run_cancel(backend):
+    return backend.abort()
+
+
+def backend_name(name=None):
+    """Resolves the backend create_backend() would use, without creating it."""
+    if name is None:
+        name = os.environ.get(BACKEND_ENV_VAR)
+    if name is None:
+        name = "windows" if platform.system() == "Windows" else None
+    return name
+
+
+def create_backend(name=None):
+    name = backend_name(name)
+    if name == "windows":
+        return WindowsShutdownBackend(state_path=os.path.join(state_dir(), "pending.json"))
+    if name == "fake":
+        return FakeShutdownBackend(
+            latency=float(os.environ.get(FAKE_LATENCY_ENV_VAR, "0")),
+            state_path=os.path.join(state_dir(), "pending-fake.json"),
+        )
+    return None
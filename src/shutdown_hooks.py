@@ -0,0 +1,426 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+HOOKS_FILE_ENV_VAR = "SHUTDOWN_SCHEDULER_HOOKS_FILE"
+HOOKS_FILE_NAME = "hooks.json"
+DEFAULT_HOOK_TIMEOUT = 60.0
+MAX_HOOK_WORKERS = 8
+# Output beyond this many lines per hook is counted, not passed on.
+MAX_OUTPUT_LINES = 200
+# Hooks start this much earlier than their worst case strictly needs, to
+# cover process start-up and the OS countdown's one-second granularity.
+HOOK_MARGIN_SECONDS = 10.0
+
+OK, FAILED, TIMED_OUT, SKIPPED, CANCELED = "ok", "failed", "timed out", "skipped", "canceled"
+
+HookResult = namedtuple("HookResult", ["name", "status", "code", "started", "elapsed", "error"])
+
+
+class Hook:
+    """One pre-shutdown step: a shell command or argument list, or a Python
+    callable taking (log, stop_event).
+
+    Commands run in their own process group and are killed, children and
+    all, when they overrun. A thread cannot be killed, so an overrunning
+    callable has its stop event set and is abandoned.
+    """
+
+    __slots__ = ("name", "command", "func", "after", "timeout", "cwd")
+
+    def __init__(self, name, command=None, func=None, after=(), timeout=DEFAULT_HOOK_TIMEOUT, cwd=None):
+        if (command is None) == (func is None):
+            raise ValueError(f"hook {name!r} needs exactly one of a command or a function")
+        if timeout <= 0:
+            raise ValueError(f"hook {name!r} needs a positive timeout")
+        self.name = name
+        self.command = command
+        self.func = func
+        self.after = tuple(after)
+        self.timeout = float(timeout)
+        self.cwd = cwd
+
+    def __repr__(self):
+        return f"Hook({self.name!r}, after={self.after!r}, timeout={self.timeout:g})"
+
+
+def python_command(target):
+    """'package.module:function' -> a command running it in a fresh interpreter."""
+    module, sep, function = target.partition(":")
+    if not sep or not module or not function:
+        raise ValueError(f"expected module:function, got {target!r}")
+    if getattr(sys, "frozen", False):
+        raise ValueError("Python hooks need a Python interpreter; use a script instead")
+    code = "import importlib, sys; m, f = sys.argv[1].split(':'); getattr(importlib.import_module(m), f)()"
+    return [sys.executable, "-u", "-c", code, target]
+
+
+def hook_from_record(record, base_dir=None):
+    """Builds a Hook from one hooks.json entry:
+    {"name", "command" | "python", "after": [...], "timeout": seconds}."""
+    if not isinstance(record, dict) or not isinstance(record.get("name"), str):
+        raise ValueError(f"bad hook entry: {record!r}")
+    name = record["name"]
+    if "python" in record:
+        command = python_command(str(record["python"]))
+    else:
+        command = record.get("command")
+        if not isinstance(command, (str, list)) or not command:
+            raise ValueError(f"hook {name!r} needs a command or a python entry")
+    after = record.get("after", ())
+    if isinstance(after, str):
+        after = (after,)
+    try:
+        timeout = float(record.get("timeout", DEFAULT_HOOK_TIMEOUT))
+    except (TypeError, ValueError):
+        raise ValueError(f"hook {name!r} has a bad timeout")
+    return Hook(name, command=command, after=after, timeout=timeout, cwd=base_dir)
+
+
+def hooks_path():
+    from shutdown_backend import state_dir
+    return os.environ.get(HOOKS_FILE_ENV_VAR) or os.path.join(state_dir(), HOOKS_FILE_NAME)
+
+
+def load_pipeline(path=None):
+    """Reads hooks.json; a missing file is an empty pipeline. Raises
+    ValueError for an invalid file."""
+    path = path or hooks_path()
+    pipeline = HookPipeline()
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return pipeline
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Could not read {path}: {e}")
+    records = data.get("hooks") if isinstance(data, dict) else data
+    if not isinstance(records, list):
+        raise ValueError(f"{path} should hold a list of hooks")
+    base_dir = os.path.dirname(os.path.abspath(path))
+    for record in records:
+        pipeline.add(hook_from_record(record, base_dir))
+    pipeline.validate()
+    return pipeline
+
+
+class HookPipeline:
+    """Hooks with dependencies, run as a DAG.
+
+    A hook starts as soon as every hook named in its `after` has finished,
+    whatever their outcome: the order matters for shutdown, but a failed
+    cache flush is no reason not to stop services. Independent hooks run in
+    parallel on up to max_workers threads.
+    """
+
+    def __init__(self, hooks=(), max_workers=MAX_HOOK_WORKERS):
+        self.hooks = {}
+        self.max_workers = max_workers
+        for hook in hooks:
+            self.add(hook)
+
+    def __len__(self):
+        return len(self.hooks)
+
+    def add(self, hook):
+        if hook.name in self.hooks:
+            raise ValueError(f"duplicate hook {hook.name!r}")
+        self.hooks[hook.name] = hook
+        return hook
+
+    def order(self):
+        """Hook names in a dependency-respecting order; raises ValueError for
+        an unknown dependency or a cycle."""
+        for hook in self.hooks.values():
+            for name in hook.after:
+                if name not in self.hooks:
+                    raise ValueError(f"hook {hook.name!r} runs after unknown hook {name!r}")
+        order, state = [], {}
+
+        def visit(name, path):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError("hook cycle: " + " -> ".join(path + [name]))
+            state[name] = "visiting"
+            for dep in self.hooks[name].after:
+                visit(dep, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.hooks:
+            visit(name, [])
+        return order
+
+    def validate(self):
+        self.order()
+
+    def lead_time(self):
+        """Seconds before the deadline the hooks must start so that even the
+        slowest chain finishes in time: the longest path of timeouts plus a
+        margin. 0 with no hooks."""
+        if not self.hooks:
+            return 0.0
+        finish = {}
+        for name in self.order():
+            hook = self.hooks[name]
+            finish[name] = hook.timeout + max((finish[dep] for dep in hook.after), default=0.0)
+        return max(finish.values()) + HOOK_MARGIN_SECONDS
+
+    def start(self, budget=None, on_output=None, on_result=None, on_finished=None):
+        """Starts every hook on a background thread and returns the HookRun.
+
+        No hook runs past `budget` seconds from now. on_output(name, line),
+        on_result(HookResult) and on_finished(results) are called from worker
+        threads; a GUI hands them on with queued signals.
+        """
+        run = HookRun(self, budget, on_output, on_result, on_finished)
+        run.start()
+        return run
+
+    def run(self, budget=None, on_output=None, on_result=None):
+        """Blocking form of start(); returns the results."""
+        run = self.start(budget, on_output, on_result)
+        return run.wait()
+
+
+class HookRun:
+    """One execution of a HookPipeline."""
+
+    def __init__(self, pipeline, budget, on_output, on_result, on_finished):
+        self.pipeline = pipeline
+        self.budget = budget
+        self.on_output = on_output
+        self.on_result = on_result
+        self.on_finished = on_finished
+        self.results = []
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._processes = {}
+        self._thread = None
+        self._t0 = None
+
+    def start(self):
+        self._t0 = time.monotonic()
+        self._deadline = None if self.budget is None else self._t0 + self.budget
+        self._thread = threading.Thread(target=self._run, name="shutdown-hooks", daemon=True)
+        self._thread.start()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.results
+
+    def cancel(self):
+        """Stops waiting for hooks and kills any running commands."""
+        self._stop.set()
+        with self._lock:
+            processes = list(self._processes.values())
+        for process in processes:
+            kill_process_tree(process)
+
+    def _run(self):
+        hooks = self.pipeline.hooks
+        order = self.pipeline.order()
+        waiting = {name: set(hooks[name].after) for name in order}
+        dependents = {name: [] for name in order}
+        for name in order:
+            for dep in hooks[name].after:
+                dependents[dep].append(name)
+        ready = [name for name in order if not waiting[name]]
+        for name in ready:
+            del waiting[name]
+        executor = ThreadPoolExecutor(max_workers=self.pipeline.max_workers, thread_name_prefix="shutdown-hook")
+        running = {}
+        try:
+            while ready or running:
+                settled = []
+                for name in ready:
+                    remaining = self._remaining()
+                    now = time.monotonic() - self._t0
+                    if self._stop.is_set():
+                        self._finish(HookResult(name, CANCELED, None, now, 0.0, None))
+                    elif remaining is not None and remaining <= 0:
+                        self._finish(HookResult(name, SKIPPED, None, now, 0.0, "no time left before the deadline"))
+                    else:
+                        running[executor.submit(self._call, hooks[name])] = name
+                        continue
+                    settled.append(name)
+                if running and not settled:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._finish(future.result())
+                        settled.append(running.pop(future))
+                ready = []
+                for name in settled:
+                    for dependent in dependents[name]:
+                        deps = waiting[dependent]
+                        deps.discard(name)
+                        if not deps:
+                            del waiting[dependent]
+                            ready.append(dependent)
+        finally:
+            executor.shutdown(wait=False)
+            if self.on_finished is not None:
+                self.on_finished(self.results)
+
+    def _finish(self, result):
+        self.results.append(result)
+        if self.on_result is not None:
+            self.on_result(result)
+
+    def _remaining(self):
+        if self._deadline is None:
+            return None
+        return self._deadline - time.monotonic()
+
+    def _call(self, hook):
+        started = time.monotonic()
+        limit = hook.timeout
+        remaining = self._remaining()
+        if remaining is not None:
+            limit = min(limit, remaining)
+        try:
+            if hook.func is not None:
+                status, code, error = self._call_function(hook, limit)
+            else:
+                status, code, error = self._call_command(hook, limit)
+        except Exception as e:
+            status, code, error = FAILED, None, str(e) or type(e).__name__
+        if self._stop.is_set() and status != OK:
+            status, error = CANCELED, None
+        return HookResult(hook.name, status, code, started - self._t0, time.monotonic() - started, error)
+
+    def _log(self, name, line):
+        if self.on_output is not None:
+            self.on_output(name, line)
+
+    def _call_function(self, hook, limit):
+        outcome = []
+        stop = threading.Event()
+
+        def target():
+            try:
+                hook.func(lambda line: self._log(hook.name, str(line)), stop)
+                outcome.append(None)
+            except Exception as e:
+                outcome.append(e)
+
+        thread = threading.Thread(target=target, name=f"hook-{hook.name}", daemon=True)
+        thread.start()
+        give_up = time.monotonic() + limit
+        while thread.is_alive() and not self._stop.is_set() and time.monotonic() < give_up:
+            thread.join(min(0.1, max(0.0, give_up - time.monotonic())))
+        if thread.is_alive():
+            stop.set()
+            return TIMED_OUT, None, f"still running after {limit:.1f} s"
+        error = outcome[0] if outcome else None
+        if error is not None:
+            return FAILED, None, str(error) or type(error).__name__
+        return OK, 0, None
+
+    def _call_command(self, hook, limit):
+        if self._stop.is_set():
+            return CANCELED, None, None
+        process = subprocess.Popen(
+            hook.command, shell=isinstance(hook.command, str), cwd=hook.cwd,
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, errors="replace", **process_group_options(),
+        )
+        with self._lock:
+            self._processes[hook.name] = process
+        timed_out = threading.Event()
+
+        def expire():
+            timed_out.set()
+            kill_process_tree(process)
+
+        timer = threading.Timer(max(0.0, limit), expire)
+        timer.daemon = True
+        timer.start()
+        dropped = 0
+        try:
+            for count, line in enumerate(process.stdout):
+                if count < MAX_OUTPUT_LINES:
+                    self._log(hook.name, line.rstrip("\r\n"))
+                else:
+                    dropped += 1
+            if dropped:
+                self._log(hook.name, f"({dropped} more lines not shown)")
+            code = process.wait()
+        finally:
+            timer.cancel()
+            process.stdout.close()
+            with self._lock:
+                self._processes.pop(hook.name, None)
+        if timed_out.is_set():
+            return TIMED_OUT, code, f"killed after {limit:.1f} s"
+        if code != 0:
+            return FAILED, code, f"exit code {code}"
+        return OK, code, None
+
+
+def process_group_options():
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def kill_process_tree(process):
+    if process.poll() is not None:
+        return
+    try:
+        if os.name == "nt":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)], capture_output=True,
+                           creationflags=subprocess.CREATE_NO_WINDOW)
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        pass
+    try:
+        process.kill()
+    except OSError:
+        pass
+
+
+def critical_path(results, pipeline):
+    """Names of the chain of hooks that finished last, each waiting on the
+    dependency that finished last before it."""
+    by_name = {r.name: r for r in results}
+    if not by_name:
+        return []
+
+    def end(name):
+        r = by_name.get(name)
+        return r.started + r.elapsed if r is not None else 0.0
+
+    name = max(by_name, key=end)
+    path = [name]
+    while pipeline.hooks[name].after:
+        name = max(pipeline.hooks[name].after, key=end)
+        path.append(name)
+    path.reverse()
+    return path
+
+
+def format_report(results, pipeline):
+    """Per-hook timing table; '*' marks the chain that decided the total."""
+    if not results:
+        return []
+    slowest = set(critical_path(results, pipeline))
+    total = max(r.started + r.elapsed for r in results)
+    lines = [f"  {'hook':<20}{'status':<11}{'start':>8}{'took':>8}"]
+    for r in sorted(results, key=lambda r: (r.started, r.name)):
+        mark = "*" if r.name in slowest else " "
+        lines.append(f"{mark} {r.name:<20}{r.status:<11}{r.started:>7.1f}s{r.elapsed:>7.1f}s")
+    lines.append(f"  total {total:.1f} s")
+    return lines
@@ -0,0 +1,162 @@
+import json
+import os
+import platform
+import secrets
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+from shutdown_backend import APP_DIR_NAME, state_dir
+
+# How long a forwarding launch waits for the running window to answer.
+REPLY_TIMEOUT = 5.0
+INSTANCE_ERRORS = (OSError, EOFError, ValueError, AuthenticationError)
+
+
+def instance_paths(backend_name):
+    """Returns (address, family, key_path) for one backend's instance.
+
+    The key file holds a random authkey written by the running instance. Only
+    the user who can read their own state directory can talk to it, and
+    without the file there is no instance to try.
+    """
+    key_path = os.path.join(state_dir(), f"instance-{backend_name}.key")
+    if platform.system() == "Windows":
+        user = os.environ.get("USERNAME", "user")
+        return rf"\\.\pipe\{APP_DIR_NAME}-{user}-{backend_name}", "AF_PIPE", key_path
+    return os.path.join(state_dir(), f"instance-{backend_name}.sock"), "AF_UNIX", key_path
+
+
+def forward_command(backend_name, argv, timeout=REPLY_TIMEOUT):
+    """Sends argv to the running instance.
+
+    Returns (code, output, error), or None when no instance is running. With
+    no instance this costs one failed open(), so a first launch is not slowed
+    down.
+    """
+    address, family, key_path = instance_paths(backend_name)
+    try:
+        with open(key_path, "rb") as f:
+            authkey = f.read()
+        with Client(address, family, authkey=authkey) as conn:
+            conn.send_bytes(json.dumps({"argv": list(argv)}).encode("utf-8"))
+            if not conn.poll(timeout):
+                return 1, "", "The running instance did not respond."
+            reply = json.loads(conn.recv_bytes().decode("utf-8"))
+    except INSTANCE_ERRORS:
+        return None
+    return int(reply.get("code", 1)), reply.get("output", ""), reply.get("error", "")
+
+
+class InstanceRequest:
+    """A command forwarded by another launch, answered with respond()."""
+
+    def __init__(self, argv):
+        self.argv = argv
+        self.reply = None
+        self._done = threading.Event()
+
+    def respond(self, code=0, output="", error=""):
+        self.reply = {"code": code, "output": output, "error": error}
+        self._done.set()
+
+    def wait(self, timeout):
+        if not self._done.wait(timeout):
+            return {"code": 1, "output": "", "error": "The running instance did not respond."}
+        return self.reply
+
+
+class InstanceServer:
+    """Accepts forwarded commands for the first instance on a local socket
+    (a named pipe on Windows).
+
+    handler(request) is called on the server thread for every command and
+    must eventually call request.respond(), typically after handing the
+    request to the GUI thread.
+    """
+
+    def __init__(self, backend_name, handler):
+        self.backend_name = backend_name
+        self.handler = handler
+        self.request_count = 0
+        self._listener = None
+        self._thread = None
+        self._authkey = secrets.token_bytes(32)
+        self._stopping = False
+
+    def start(self):
+        """Claims the instance address.
+
+        Returns False if another instance already holds it; a socket left by a
+        crashed instance is removed and claimed.
+        """
+        address, family, key_path = instance_paths(self.backend_name)
+        os.makedirs(state_dir(), exist_ok=True)
+        try:
+            self._listener = Listener(address, family, authkey=self._authkey)
+        except OSError:
+            if forward_command(self.backend_name, ["ping"]) is not None:
+                return False
+            if family != "AF_UNIX":
+                return False
+            try:
+                os.remove(address)
+                self._listener = Listener(address, family, authkey=self._authkey)
+            except OSError:
+                return False
+        fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(self._authkey)
+        self._thread = threading.Thread(target=self._serve, name="instance-server", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        if self._listener is None:
+            return
+        self._stopping = True
+        address, family, key_path = instance_paths(self.backend_name)
+        try:
+            os.remove(key_path)
+        except OSError:
+            pass
+        # accept() cannot be interrupted portably; wake it with a connection.
+        try:
+            with Client(address, family, authkey=self._authkey):
+                pass
+        except INSTANCE_ERRORS:
+            pass
+        self._thread.join(1.0)
+        self._listener.close()
+        self._listener = None
+
+    def _serve(self):
+        while not self._stopping:
+            try:
+                conn = self._listener.accept()
+            except INSTANCE_ERRORS:
+                # Usually a client that failed authentication; keep serving.
+                if self._stopping:
+                    break
+                continue
+            with conn:
+                if self._stopping:
+                    break
+                try:
+                    self._handle(conn)
+                except INSTANCE_ERRORS:
+                    pass
+
+    def _handle(self, conn):
+        if not conn.poll(REPLY_TIMEOUT):
+            return
+        message = json.loads(conn.recv_bytes().decode("utf-8"))
+        argv = [str(arg) for arg in message.get("argv", [])]
+        self.request_count += 1
+        if argv == ["ping"]:
+            reply = {"code": 0, "output": "", "error": ""}
+        else:
+            request = InstanceRequest(argv)
+            self.handler(request)
+            reply = request.wait(REPLY_TIMEOUT)
+        conn.send_bytes(json.dumps(reply).encode("utf-8"))
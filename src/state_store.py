@@ -0,0 +1,174 @@
+import json
+import os
+import threading
+import zlib
+from datetime import date, datetime
+
+from recurrence import compile_rule
+
+STATE_MAGIC = "MSS1"
+STATE_VERSION = 1
+STATE_FILE_NAME = "state.dat"
+
+
+def encode_state(state):
+    """Serializes state as a 'MSS1 <crc32>' header line and compact JSON."""
+    payload = json.dumps({"version": STATE_VERSION, **state}, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return f"{STATE_MAGIC} {zlib.crc32(payload):08x}\n".encode("ascii") + payload
+
+
+def decode_state(raw):
+    """Inverse of encode_state; raises ValueError for a damaged file."""
+    header, sep, payload = raw.partition(b"\n")
+    parts = header.split()
+    if not sep or len(parts) != 2 or parts[0] != STATE_MAGIC.encode("ascii"):
+        raise ValueError("not a state file")
+    try:
+        expected = int(parts[1], 16)
+    except ValueError:
+        raise ValueError("bad checksum field")
+    if zlib.crc32(payload) != expected:
+        raise ValueError("checksum mismatch")
+    state = json.loads(payload.decode("utf-8"))
+    if not isinstance(state, dict) or state.pop("version", None) != STATE_VERSION:
+        raise ValueError("unsupported state version")
+    return state
+
+
+def empty_state():
+    return {"settings": {}, "jobs": []}
+
+
+class StateStore:
+    """Schedules and settings persisted in one small file.
+
+    Nothing is read until `state` is first used. Writes go to a temporary file
+    in the same directory, are fsynced and then renamed over the old file, so
+    a crash leaves either the previous or the new state, never half of one. A
+    file that fails its checksum is moved aside to `<path>.corrupt` and the
+    defaults are used. save_async() hands the write to a worker thread; the
+    caller is expected to coalesce changes before calling it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._state = None
+        self._executor = None
+        self._lock = threading.Lock()
+        self.write_count = 0
+        self.error = None
+
+    @property
+    def state(self):
+        if self._state is None:
+            self._state = self.load()
+        return self._state
+
+    def take_error(self):
+        error, self.error = self.error, None
+        return error
+
+    def load(self):
+        try:
+            with open(self.path, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return empty_state()
+        except OSError as e:
+            self.error = f"Could not read {self.path}: {e}"
+            return empty_state()
+        try:
+            state = decode_state(raw)
+        except ValueError as e:
+            self.error = f"Ignoring damaged state file ({e}); it was moved to {self.path}.corrupt"
+            try:
+                os.replace(self.path, self.path + ".corrupt")
+            except OSError:
+                pass
+            return empty_state()
+        for key, value in empty_state().items():
+            if not isinstance(state.get(key), type(value)):
+                state[key] = value
+        return state
+
+    def save(self, state):
+        self._state = state
+        self._write(encode_state(state))
+
+    def save_async(self, state):
+        self._state = state
+        data = encode_state(state)
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="state-store")
+        return self._executor.submit(self._write, data)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _write(self, data):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with self._lock:
+            try:
+                os.makedirs(directory, exist_ok=True)
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+                if hasattr(os, "O_DIRECTORY"):
+                    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+                    try:
+                        os.fsync(fd)
+                    finally:
+                        os.close(fd)
+                self.write_count += 1
+                self.error = None
+            except OSError as e:
+                self.error = f"Could not save {self.path}: {e}"
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+
+def job_record(job):
+    record = {"action": job.action, "deadline": job.deadline, "created": job.created}
+    if job.note:
+        record["note"] = job.note
+    if job.rule is not None:
+        record["rule"] = job.rule.expression
+        if job.rule.exclusions:
+            record["skip"] = sorted(d.isoformat() for d in job.rule.exclusions)
+    return record
+
+
+def restore_jobs(engine, records, now):
+    """Re-adds saved jobs to a SchedulerEngine.
+
+    Returns (restored, missed). One-off jobs whose time passed while the app
+    was closed are dropped and reported as missed; recurring ones are re-armed
+    for their next occurrence after `now`.
+    """
+    restored, missed = [], []
+    for record in records:
+        try:
+            action = record["action"]
+            deadline = float(record["deadline"])
+            note = record.get("note", "")
+            rule = None
+            if record.get("rule"):
+                skip = frozenset(date.fromisoformat(d) for d in record.get("skip", ()))
+                rule = compile_rule(record["rule"], skip)
+            if deadline > now:
+                restored.append(engine.add(action, deadline, note, rule, created=float(record.get("created", now))))
+                continue
+            missed.append((action, datetime.fromtimestamp(deadline)))
+            if rule is not None:
+                restored.append(engine.add_recurring(action, rule, note, now))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return restored, missed
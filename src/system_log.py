@@ -0,0 +1,82 @@
+import logging
+import logging.handlers
+import os
+import queue
+import time
+from collections import deque, namedtuple
+from itertools import islice
+
+LOG_CAPACITY = 500
+LOG_FILE_ENV_VAR = "SHUTDOWN_SCHEDULER_LOG_FILE"
+LOG_FILE_MAX_BYTES = 1024 * 1024
+LOG_FILE_BACKUPS = 3
+LEVELS = {"DEBUG": logging.DEBUG, "INFO": logging.INFO, "WARNING": logging.WARNING, "ERROR": logging.ERROR}
+
+LogRecord = namedtuple("LogRecord", ["created", "level", "message"])
+
+
+def format_record(record):
+    return f"{time.strftime('%H:%M:%S', time.localtime(record.created))} {record.level:<7} {record.message}"
+
+
+class SystemLog:
+    """Fixed-capacity log of the most recent messages.
+
+    Records live in a bounded deque, so memory does not grow with uptime.
+    drain() hands out only what arrived since the previous call, which lets a
+    view append a whole batch at once. An optional rotating file sink is
+    written by a logging.handlers.QueueListener thread, keeping disk I/O off
+    the caller's thread.
+    """
+
+    def __init__(self, capacity=LOG_CAPACITY):
+        self.capacity = capacity
+        self._records = deque(maxlen=capacity)
+        self._unflushed = 0
+        self._logger = None
+        self._listener = None
+
+    def __len__(self):
+        return len(self._records)
+
+    def append(self, message, level="INFO"):
+        record = LogRecord(time.time(), level, message)
+        self._records.append(record)
+        if self._unflushed < self.capacity:
+            self._unflushed += 1
+        if self._logger is not None:
+            self._logger.log(LEVELS.get(level, logging.INFO), message)
+        return record
+
+    def has_unflushed(self):
+        return self._unflushed > 0
+
+    def drain(self):
+        count, self._unflushed = self._unflushed, 0
+        batch = list(islice(reversed(self._records), count))
+        batch.reverse()
+        return batch
+
+    def records(self):
+        return list(self._records)
+
+    def open_file(self, path, max_bytes=LOG_FILE_MAX_BYTES, backups=LOG_FILE_BACKUPS):
+        self.close_file()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)-7s %(message)s"))
+        records = queue.SimpleQueue()
+        self._listener = logging.handlers.QueueListener(records, file_handler)
+        self._listener.start()
+        self._logger = logging.Logger(f"{__name__}.{id(self)}", logging.DEBUG)
+        self._logger.addHandler(logging.handlers.QueueHandler(records))
+
+    def close_file(self):
+        if self._listener is None:
+            return
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+        self._listener = None
+        self._logger = None
@@ -0,0 +1,43 @@
+"""Shared fixtures: the GUI runs offscreen against the fake backend, and
+every test gets its own state folder."""
+
+import os
+import sys
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("XDG_STATE_HOME", tempfile.mkdtemp(prefix="mss-test-"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PyQt6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def make_window(qapp, tmp_path):
+    """Builds ShutdownApp windows on the fake backend, started up and shown,
+    and closes them after the test."""
+    import ModernShutdownScheduler as mss
+    from shutdown_backend import FakeShutdownBackend
+
+    windows = []
+
+    def make(backend=None):
+        window = mss.ShutdownApp(backend or FakeShutdownBackend(),
+                                 state_path=str(tmp_path / f"state{len(windows)}.dat"))
+        windows.append(window)
+        window.show()
+        while not window.startup_complete:
+            qapp.processEvents()
+        return window
+
+    yield make
+    for window in windows:
+        window.close()
+    qapp.processEvents()
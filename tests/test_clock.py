@@ -0,0 +1,97 @@
+"""Counts ClockService wakeups over a simulated hour.
+
+The clock's two QTimers are swapped for fake single-shot timers that fire
+on a simulated clock, so an hour runs in milliseconds and the counts are
+exact. The 1 Hz polling the service replaced woke up once a second for the
+minute check, and once more a second for the progress bar while a
+countdown ran.
+"""
+
+from ModernShutdownScheduler import ClockService
+
+HOUR = 3600
+# Old polling: a 1 s minute check always, plus a 1 s progress timer.
+POLLING_IDLE_PER_HOUR = HOUR
+POLLING_COUNTDOWN_PER_HOUR = 2 * HOUR
+
+
+class SimulatedTime:
+    def __init__(self, start=1_700_000_012.25):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+
+class FakeTimer:
+    def __init__(self, clock, handler):
+        self.clock = clock
+        self.handler = handler
+        self.due = None
+
+    def start(self, ms):
+        self.due = self.clock.now + ms / 1000
+
+    def stop(self):
+        self.due = None
+
+    def isActive(self):
+        return self.due is not None
+
+
+def make_clock(qapp):
+    now = SimulatedTime()
+    clock = ClockService(wall=now, monotonic=now)
+    clock._minute_timer = FakeTimer(now, clock._on_minute_timer)
+    clock._countdown_timer = FakeTimer(now, clock._on_countdown_timer)
+    return clock, now
+
+
+def run_for(clock, now, seconds):
+    end = now.now + seconds
+    while True:
+        timers = [t for t in (clock._minute_timer, clock._countdown_timer) if t.due is not None and t.due <= end]
+        if not timers:
+            break
+        timer = min(timers, key=lambda t: t.due)
+        now.now, timer.due = timer.due, None
+        timer.handler()
+    now.now = end
+
+
+def test_visible_without_countdown_wakes_once_a_minute(qapp):
+    clock, now = make_clock(qapp)
+    minutes = []
+    clock.minute_changed.connect(lambda: minutes.append(now.now))
+    clock.start()
+    run_for(clock, now, HOUR)
+    assert clock.wakeup_count == 60 < POLLING_IDLE_PER_HOUR
+    assert len(minutes) == 60
+    assert all(m % 60 < 1 for m in minutes)
+
+
+def test_countdown_wakes_once_a_second(qapp):
+    clock, now = make_clock(qapp)
+    remaining = []
+    clock.countdown_changed.connect(remaining.append)
+    clock.start()
+    clock.start_countdown(2 * HOUR)
+    # The half second lets the 3600th tick, due just after the hour, land.
+    run_for(clock, now, HOUR + 0.5)
+    assert clock.wakeup_count == HOUR + 60 < POLLING_COUNTDOWN_PER_HOUR
+    assert remaining == list(range(2 * HOUR, HOUR - 1, -1))
+
+
+def test_paused_clock_never_wakes(qapp):
+    clock, now = make_clock(qapp)
+    minutes = []
+    clock.minute_changed.connect(lambda: minutes.append(now.now))
+    clock.start()
+    clock.start_countdown(2 * HOUR)
+    clock.pause()
+    run_for(clock, now, HOUR)
+    assert clock.wakeup_count == 0
+    assert minutes == []
+    clock.resume()
+    assert len(minutes) == 1
+    assert clock.remaining_seconds() == HOUR
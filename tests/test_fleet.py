@@ -0,0 +1,129 @@
+import asyncio
+
+import fleet_agent
+from fleet import FleetController, decode_message, encode_message, request_mac
+from shutdown_backend import TIMED_ACTIONS
+
+TOKEN = "test-token"
+
+
+async def start_agents(count=1, failure_rate=0.0):
+    servers, addresses = await fleet_agent.serve_stand_ins(count, TOKEN, latency=0, failure_rate=failure_rate)
+    return servers, addresses
+
+
+async def stop(servers):
+    for server in servers:
+        server.close()
+        await server.wait_closed()
+
+
+async def raw_connection(address):
+    reader, writer = await asyncio.open_connection(*address)
+    challenge = decode_message(await reader.readline())["challenge"]
+    return reader, writer, challenge
+
+
+async def send(reader, writer, message):
+    writer.write(encode_message(message))
+    await writer.drain()
+    return decode_message(await reader.readline())
+
+
+def signed(challenge, request_id, command="status", args=None, token=TOKEN, key=None):
+    args = {} if args is None else args
+    key = f"test-{request_id}" if key is None else key
+    return {"id": request_id, "key": key, "command": command, "args": args,
+            "mac": request_mac(token, challenge, request_id, key, command, args)}
+
+
+def test_agent_listens_on_loopback_by_default():
+    assert fleet_agent.DEFAULT_HOST == "127.0.0.1"
+
+
+def test_controller_schedules_and_cancels():
+    async def scenario():
+        servers, addresses = await start_agents(3)
+        controller = FleetController(addresses, TOKEN, timeout=2)
+        try:
+            results = await controller.schedule(minutes=30, action="restart")
+            assert [r.code for r in results] == [0, 0, 0]
+            results = await controller.status()
+            assert all(r.output.startswith("Restart scheduled") for r in results)
+            results = await controller.cancel()
+            assert [r.code for r in results] == [0, 0, 0]
+        finally:
+            controller.close()
+            await stop(servers)
+
+    asyncio.run(scenario())
+
+
+def test_requests_need_the_connection_challenge():
+    async def scenario():
+        servers, [address] = await start_agents()
+        try:
+            # The old form: the token itself in the request.
+            reader, writer, _ = await raw_connection(address)
+            reply = await send(reader, writer, {"id": 1, "token": TOKEN, "command": "status", "args": {}})
+            assert reply["error"] == "unauthorized"
+            writer.close()
+
+            reader, writer, challenge = await raw_connection(address)
+            captured = signed(challenge, 1)
+            assert await send(reader, writer, captured) == {"id": 1, "code": 1, "output": "No shutdown is scheduled.",
+                                                             "error": ""}
+            # Replayed on the same connection, or with a wrong token.
+            assert (await send(reader, writer, captured))["error"] == "unauthorized"
+            writer.close()
+            reader, writer, challenge = await raw_connection(address)
+            assert (await send(reader, writer, signed(challenge, 1, token="guess")))["error"] == "unauthorized"
+            writer.close()
+
+            # Replayed on a new connection, which has a different challenge.
+            reader, writer, _ = await raw_connection(address)
+            assert (await send(reader, writer, captured))["error"] == "unauthorized"
+            writer.close()
+        finally:
+            await stop(servers)
+
+    asyncio.run(scenario())
+
+
+def test_retried_request_is_not_run_twice():
+    async def scenario():
+        servers, [address] = await start_agents()
+        try:
+            reader, writer, challenge = await raw_connection(address)
+            await send(reader, writer, signed(challenge, 1, "schedule", {"minutes": 30, "action": "shutdown"},
+                                              key="first"))
+            cancelled = await send(reader, writer, signed(challenge, 2, "cancel", key="cancel"))
+            assert cancelled["code"] == 0
+            await send(reader, writer, signed(challenge, 3, "schedule", {"minutes": 45, "action": "restart"},
+                                              key="second"))
+            writer.close()
+
+            # The cancel again, as a controller resends it when the reply was
+            # lost: same key, signed for a new connection.
+            reader, writer, challenge = await raw_connection(address)
+            replayed = await send(reader, writer, signed(challenge, 1, "cancel", key="cancel"))
+            assert {**replayed, "id": 2} == cancelled
+            status = await send(reader, writer, signed(challenge, 2, key="status"))
+            assert status["output"].startswith("Restart scheduled")
+            writer.close()
+        finally:
+            await stop(servers)
+
+    asyncio.run(scenario())
+
+
+def test_fleet_dialog_offers_only_timed_actions(qapp, make_window):
+    import ModernShutdownScheduler as mss
+
+    window = make_window()
+    window.action_combo.setCurrentIndex(window.action_combo.findData("hibernate"))
+    dialog = mss.FleetDialog(window)
+    actions = [dialog.action_input.itemData(i) for i in range(dialog.action_input.count())]
+    assert actions == list(TIMED_ACTIONS)
+    assert dialog.minutes_input.value() == window.time_input.value()
+    dialog.close()
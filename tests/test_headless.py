@@ -0,0 +1,35 @@
+import json
+
+import headless
+from shutdown_backend import FakeShutdownBackend
+
+
+def run(backend, argv):
+    command, args = headless.parse_command(argv)
+    return headless.execute(backend, command, args)
+
+
+def test_status_reports_the_pending_action(tmp_path):
+    state_path = str(tmp_path / "pending.json")
+    backend = FakeShutdownBackend(state_path=state_path)
+    assert run(backend, ["status"]) == (1, headless.NOTHING_SCHEDULED, "")
+    code, output, _ = run(backend, ["--in", "90m", "--action", "restart"])
+    assert code == 0 and output.startswith("Initiating system restart")
+    code, output, _ = run(backend, ["status"])
+    assert code == 0 and output.startswith("Restart scheduled at")
+
+    # A later process only has the recorded state to go by.
+    code, output, _ = run(FakeShutdownBackend(state_path=state_path), ["status"])
+    assert code == 0 and output.startswith("Restart scheduled at")
+    assert run(backend, ["cancel"])[0] == 0
+    assert run(FakeShutdownBackend(state_path=state_path), ["status"])[0] == 1
+
+
+def test_state_recorded_without_an_action_is_a_shutdown(tmp_path):
+    state_path = tmp_path / "pending.json"
+    backend = FakeShutdownBackend(state_path=str(state_path))
+    run(backend, ["--in", "30m"])
+    record = json.loads(state_path.read_text())
+    state_path.write_text(json.dumps({"deadline": record["deadline"]}))
+    code, output, _ = run(FakeShutdownBackend(state_path=str(state_path)), ["status"])
+    assert code == 0 and output.startswith("Shutdown scheduled at")
@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+from hot_paths import DEFAULT_OUTPUT_NAME, output_path
+
+
+@pytest.mark.parametrize("value", [None, "", "0", "off", "false", "no", "OFF", "No"])
+def test_falsy_values_leave_profiling_off(value, tmp_path):
+    assert output_path(value, str(tmp_path)) is None
+
+
+@pytest.mark.parametrize("value", ["1", "on", "true", "yes", "True"])
+def test_truthy_values_dump_to_the_state_folder(value, tmp_path):
+    assert output_path(value, str(tmp_path)) == os.path.join(str(tmp_path), DEFAULT_OUTPUT_NAME)
+
+
+@pytest.mark.parametrize("value", ["stats.json", os.path.join("out", "hot.json")])
+def test_other_values_are_paths(value, tmp_path):
+    assert output_path(value, str(tmp_path)) == value
+
+
+def test_slider_drag_is_recorded(qapp, make_window):
+    from PyQt6.QtCore import QEvent, QPointF, Qt
+    from PyQt6.QtGui import QMouseEvent
+    from PyQt6.QtWidgets import QApplication
+
+    import ModernShutdownScheduler as mss
+
+    recorder = mss.enable_hot_path_profiling()
+    try:
+        window = make_window()
+        timeline = window.time_input
+        y = timeline.TRACK_TOP + timeline.TRACK_HEIGHT / 2
+
+        def send(kind, x, buttons):
+            button = Qt.MouseButton.LeftButton if kind != QEvent.Type.MouseMove else Qt.MouseButton.NoButton
+            QApplication.sendEvent(timeline, QMouseEvent(kind, QPointF(x, y), QPointF(x, y), button, buttons,
+                                                         Qt.KeyboardModifier.NoModifier))
+
+        send(QEvent.Type.MouseButtonPress, timeline.PADDING + 5, Qt.MouseButton.LeftButton)
+        for x in range(timeline.PADDING + 5, timeline.width() - timeline.PADDING, 5):
+            send(QEvent.Type.MouseMove, x, Qt.MouseButton.LeftButton)
+            qapp.processEvents()
+        send(QEvent.Type.MouseButtonRelease, timeline.width() - timeline.PADDING, Qt.MouseButton.NoButton)
+        window.render_scheduler.flush()
+
+        for name in ("TimelinePicker.mouseMoveEvent", "ShutdownApp.on_time_input_changed", "ShutdownApp.render",
+                     "ShutdownApp.update_background_color"):
+            assert recorder.stats(name).count > 0, name
+        assert "ShutdownApp.on_time_input_changed" in recorder.report()
+    finally:
+        recorder.restore()
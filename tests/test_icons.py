@@ -0,0 +1,46 @@
+import os
+
+import ModernShutdownScheduler as mss
+
+
+def test_resource_path_does_not_depend_on_the_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert os.path.isfile(mss.resource_path(mss.PeriodIconCache.PATHS["day"]))
+
+
+def test_icons_decode_from_the_loose_files(qapp):
+    icons = mss.PeriodIconCache()
+    pixmap = icons.pixmap("day")
+    assert not pixmap.isNull()
+    assert max(pixmap.width(), pixmap.height()) <= mss.ICON_SIZE
+    assert icons.pixmap("day") is pixmap
+
+
+def test_unreadable_icon_is_reported_and_left_empty(qapp):
+    errors = []
+    icons = mss.PeriodIconCache(on_error=errors.append)
+    icons.PATHS = dict(icons.PATHS, night="assets/images/missing.png")
+    assert icons.pixmap("night").isNull()
+    assert icons.pixmap("night").isNull()
+    assert len(errors) == 1 and "missing.png" in errors[0]
+
+
+def damaged_bundle(tmp_path, data):
+    path = tmp_path / "bundle.dat"
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_icons_fall_back_to_loose_files_without_a_usable_bundle(qapp, make_window, tmp_path, monkeypatch):
+    with open(mss.resource_path(mss.BUNDLE_PATH), "rb") as f:
+        real = f.read()
+    for path in (str(tmp_path / "missing.dat"), damaged_bundle(tmp_path, b"not a bundle" * 10),
+                 damaged_bundle(tmp_path, real[:len(real) // 3])):
+        monkeypatch.setattr(mss, "BUNDLE_PATH", path)
+        assert mss.load_asset_bundle() is None
+        window = make_window()
+        assert window.assets is None
+        for period in mss.PeriodIconCache.PATHS:
+            assert not window.icons.pixmap(period).isNull(), (path, period)
+        assert not window.app_icon().isNull()
+        assert not window.icon_label.pixmap().isNull()
@@ -0,0 +1,39 @@
+import idle_detector
+from idle_detector import IdleDetector, SyntheticMetricsSource, create_metrics_source
+
+MINUTE = 60
+
+
+def run(detector, seconds, start=0.0):
+    now = start
+    while now < start + seconds:
+        now += detector.interval
+        if detector.sample(now):
+            return now
+    return None
+
+
+def test_disk_or_network_transfer_keeps_the_machine_busy():
+    for busy in ((0.0, 50 * 1024 * 1024, 0), (0.0, 0, 5 * 1024 * 1024)):
+        source = SyntheticMetricsSource([(30 * MINUTE, *busy), (0, 0.0, 0, 0)], start=0.0)
+        detector = IdleDetector(source, 10 * MINUTE)
+        detector.sample(0.0)
+        reached = run(detector, 2 * 60 * MINUTE)
+        assert reached is not None and reached >= 40 * MINUTE
+
+
+def test_windows_source_that_cannot_read_counters_is_refused(monkeypatch):
+    def unavailable():
+        raise OSError("PdhAddEnglishCounterW failed")
+
+    monkeypatch.setattr(idle_detector, "WindowsMetricsSource", unavailable)
+    assert create_metrics_source("windows") is None
+
+
+def test_idle_mode_is_not_enabled_without_a_source(qapp, make_window, monkeypatch):
+    monkeypatch.setenv(idle_detector.IDLE_SOURCE_ENV_VAR, "unsupported")
+    window = make_window()
+    window.idle_checkbox.setChecked(True)
+    assert not window.idle_checkbox.isChecked()
+    assert window.idle_watcher is None
+    assert any("not supported" in record.message for record in window.system_log.records())
@@ -0,0 +1,79 @@
+from datetime import date, datetime
+
+import pytest
+
+from recurrence import RecurrenceRule, compile_rule, parse_exclusions
+
+# A Monday.
+MONDAY = datetime(2026, 3, 2, 12, 0)
+
+
+def test_daily_rule_fires_later_today_then_tomorrow():
+    rule = RecurrenceRule.daily(18, 30)
+    assert rule.next_fire(MONDAY) == datetime(2026, 3, 2, 18, 30)
+    assert rule.next_fire(datetime(2026, 3, 2, 18, 30)) == datetime(2026, 3, 3, 18, 30)
+
+
+def test_weekdays_rule_skips_the_weekend():
+    rule = RecurrenceRule.weekdays(9, 0)
+    friday_evening = datetime(2026, 3, 6, 20, 0)
+    assert rule.next_fire(friday_evening) == datetime(2026, 3, 9, 9, 0)
+
+
+def test_day_of_month_or_day_of_week_when_both_are_restricted():
+    # Like cron: the 12th of the month (a Thursday here), or any Friday.
+    rule = RecurrenceRule("0 22 12 * fri")
+    fires = rule.preview(datetime(2026, 3, 1), count=5)
+    assert [f.date() for f in fires] == [
+        date(2026, 3, 6), date(2026, 3, 12), date(2026, 3, 13), date(2026, 3, 20), date(2026, 3, 27),
+    ]
+    # With either field left as '*', the other alone decides.
+    assert RecurrenceRule("0 22 12 * *").next_fire(datetime(2026, 3, 1)).date() == date(2026, 3, 12)
+    assert RecurrenceRule("0 22 * * fri").next_fire(datetime(2026, 3, 7)).date() == date(2026, 3, 13)
+
+
+def test_excluded_dates_are_skipped():
+    skip = parse_exclusions("2026-03-03, 2026-03-04")
+    rule = compile_rule("0 18 * * *", skip)
+    assert rule.next_fire(MONDAY.replace(hour=19)) == datetime(2026, 3, 5, 18, 0)
+    assert date(2026, 3, 3) in rule.exclusions
+
+
+def test_fires_roll_over_into_the_next_year():
+    rule = RecurrenceRule("30 8 1 jan *")
+    assert rule.next_fire(datetime(2026, 3, 2)) == datetime(2027, 1, 1, 8, 30)
+    new_years_eve = RecurrenceRule("0 23 31 12 *", {date(2026, 12, 31)})
+    assert new_years_eve.next_fire(datetime(2026, 6, 1)) == datetime(2027, 12, 31, 23, 0)
+    leap_day = RecurrenceRule("0 0 29 2 *")
+    assert leap_day.next_fire(MONDAY) == datetime(2028, 2, 29, 0, 0)
+
+
+def test_a_rule_that_never_matches_returns_none():
+    assert RecurrenceRule("0 0 30 2 *").next_fire(MONDAY) is None
+
+
+def test_aliases_and_sunday_as_seven():
+    assert RecurrenceRule("@weekly").next_fire(MONDAY) == datetime(2026, 3, 8, 0, 0)
+    assert RecurrenceRule("0 0 * * 7").next_fire(MONDAY) == datetime(2026, 3, 8, 0, 0)
+
+
+@pytest.mark.parametrize("expression", [
+    "0 18 * *",
+    "60 18 * * *",
+    "0 24 * * *",
+    "0 18 0 * *",
+    "0 18 * 13 *",
+    "0 18 * * 8",
+    "0 18 * * funday",
+    "*/0 18 * * *",
+    "0 18 5-1 * *",
+    "x 18 * * *",
+])
+def test_invalid_fields_are_rejected(expression):
+    with pytest.raises(ValueError):
+        RecurrenceRule(expression)
+
+
+def test_invalid_exclusion_date_is_rejected():
+    with pytest.raises(ValueError, match="YYYY-MM-DD"):
+        parse_exclusions("2026-02-30")
@@ -0,0 +1,57 @@
+import time
+
+from PyQt6.QtCore import QEventLoop, QTimer
+
+import ModernShutdownScheduler as mss
+from ModernShutdownScheduler import RenderScheduler
+
+
+def test_invalidations_merge_into_one_render(qapp):
+    renders = []
+    scheduler = RenderScheduler(None, renders.append, interval_ms=1000)
+    scheduler.invalidate(RenderScheduler.LABEL)
+    scheduler.invalidate(RenderScheduler.COLORS)
+    scheduler.invalidate(RenderScheduler.LABEL)
+    assert renders == []
+    scheduler.flush()
+    scheduler.flush()
+    assert renders == [RenderScheduler.LABEL | RenderScheduler.COLORS]
+    assert scheduler.invalidation_count == 3
+    assert scheduler.frame_count == 1
+
+
+def test_render_fires_on_the_next_frame(qapp):
+    renders = []
+    scheduler = RenderScheduler(None, renders.append, interval_ms=5)
+    scheduler.invalidate(RenderScheduler.ICON)
+    loop = QEventLoop()
+    QTimer.singleShot(100, loop.quit)
+    loop.exec()
+    assert renders == [RenderScheduler.ICON]
+    assert not scheduler.is_pending()
+
+
+def test_drag_renders_at_most_once_per_frame(qapp, make_window):
+    window = make_window()
+    scheduler = window.render_scheduler
+    window.time_input.setValue(1)
+    scheduler.flush()
+    scheduler.frame_count = scheduler.invalidation_count = 0
+    interval_ms = scheduler._timer.interval()
+
+    start = time.perf_counter()
+    for value in range(2, mss.MINUTES_IN_DAY + 1):
+        window.time_input.setValue(value)
+        qapp.processEvents()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    scheduler.flush()
+
+    # One render per elapsed frame interval, plus the first and the final flush.
+    bound = elapsed_ms / interval_ms + 2
+    assert scheduler.invalidation_count >= mss.MINUTES_IN_DAY - 1
+    assert scheduler.frame_count <= bound
+    assert scheduler.frame_count < mss.MINUTES_IN_DAY
+    # The last value of the drag is the one on screen.
+    shown = window.time_value_label.text()
+    window.update_time_label(mss.MINUTES_IN_DAY)
+    assert window.time_value_label.text() == shown
@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from scheduler_engine import SYSTEM_ACTIONS, SchedulerEngine
+
+JOB_COUNT = 10_000
+NOW = 1_700_000_000.0
+
+
+@pytest.fixture
+def engine():
+    rng = random.Random(7)
+    engine = SchedulerEngine()
+    actions = ("shutdown", "restart", "reminder", "hibernate")
+    for _ in range(JOB_COUNT):
+        engine.add(rng.choice(actions), NOW + rng.randrange(1, 30 * 86400))
+    return engine
+
+
+def order(jobs):
+    return sorted(jobs, key=lambda job: (job.deadline, job.id))
+
+
+def test_jobs_come_out_in_deadline_order(engine):
+    expected = order(engine.jobs())
+    assert engine.peek() is expected[0]
+    due = engine.pop_due(now=NOW + 30 * 86400)
+    assert due == expected
+    assert len(engine) == 0 and engine.peek() is None
+
+
+def test_cancelling_most_jobs_keeps_order_and_per_action_peeks(engine):
+    rng = random.Random(11)
+    jobs = engine.jobs()
+    cancelled = set(job.id for job in rng.sample(jobs, JOB_COUNT * 9 // 10))
+    for job_id in cancelled:
+        assert engine.cancel(job_id) is not None
+    assert engine.cancel(next(iter(cancelled))) is None
+
+    live = order(job for job in jobs if job.id not in cancelled)
+    assert len(engine) == len(live)
+    assert engine.peek() is live[0]
+    assert engine.peek(SYSTEM_ACTIONS) is next(job for job in live if job.action in SYSTEM_ACTIONS)
+    assert engine.peek(("reminder",)) is next(job for job in live if job.action == "reminder")
+    # Compaction drops the stale entries instead of keeping all 10k around.
+    assert len(engine._heap) < 2 * len(live) + 64
+
+    half = live[len(live) // 2].deadline
+    assert engine.pop_due(now=half) == [job for job in live if job.deadline <= half]
+    assert engine.jobs() == [job for job in live if job.deadline > half]
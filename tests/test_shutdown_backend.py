@@ -0,0 +1,135 @@
+import time
+from datetime import datetime, timedelta
+
+from ModernShutdownScheduler import ShutdownWorker
+from shutdown_backend import FakeShutdownBackend, run_action, run_cancel, run_schedule
+from state_store import encode_state
+
+
+def wait_for_worker(qapp, worker, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while worker.pending_jobs and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.001)
+    qapp.processEvents()
+    assert worker.pending_jobs == 0
+
+
+def kinds(calls):
+    return [(c[0],) if c[0] == "abort" else (c[0], c[2]) for c in calls]
+
+
+def test_fake_backend_schedule_cancel_replace():
+    backend = FakeShutdownBackend()
+    aborted, scheduled = run_schedule(backend, 60)
+    assert aborted.returncode == 1116 and scheduled.ok
+    assert backend.status() is not None
+    aborted, scheduled = run_schedule(backend, 120, "restart")
+    assert aborted.ok and scheduled.ok
+    assert run_cancel(backend).ok
+    assert backend.status() is None
+    assert not run_cancel(backend).ok
+    assert backend.calls == [
+        ("abort",), ("schedule", 60, "shutdown"),
+        ("abort",), ("schedule", 120, "restart"),
+        ("abort",), ("abort",),
+    ]
+
+
+def test_window_arms_the_earliest_system_job(qapp, make_window):
+    backend = FakeShutdownBackend()
+    window = make_window(backend)
+    shutdown = window.schedule_job("shutdown", datetime.now() + timedelta(minutes=60))
+    wait_for_worker(qapp, window.shutdown_worker)
+    assert kinds(backend.calls) == [("abort",), ("schedule", "shutdown")]
+    assert 3590 <= backend.calls[-1][1] <= 3600
+
+    # An earlier restart replaces the shutdown's OS countdown.
+    window.schedule_job("restart", datetime.now() + timedelta(minutes=30))
+    wait_for_worker(qapp, window.shutdown_worker)
+    assert kinds(backend.calls[2:]) == [("abort",), ("schedule", "restart")]
+
+    # Canceling it hands the countdown back to the shutdown.
+    window.cancel_shutdown()
+    wait_for_worker(qapp, window.shutdown_worker)
+    assert kinds(backend.calls[4:]) == [("abort",), ("schedule", "shutdown")]
+    assert window.jobs.peek() is shutdown
+
+    # Canceling the last one aborts the countdown.
+    window.cancel_shutdown()
+    wait_for_worker(qapp, window.shutdown_worker)
+    assert kinds(backend.calls[6:]) == [("abort",)]
+    assert backend.status() is None
+
+
+def test_extending_a_job_moves_its_countdown(qapp, make_window):
+    backend = FakeShutdownBackend()
+    window = make_window(backend)
+    window.schedule_job("shutdown", datetime.now() + timedelta(minutes=60))
+    wait_for_worker(qapp, window.shutdown_worker)
+    window.extend_next_job(30)
+    wait_for_worker(qapp, window.shutdown_worker)
+    assert kinds(backend.calls[2:]) == [("abort",), ("schedule", "shutdown")]
+    assert 5390 <= backend.calls[-1][1] <= 5400
+    target = datetime.fromtimestamp(window.jobs.peek().deadline)
+    messages = [r.message for r in window.system_log.records()]
+    assert messages[-1] == f"Shutdown extended to {window.format_time(target)}"
+    assert sum(m.startswith("Initiating") for m in messages) == 1
+
+
+def test_countdown_from_the_last_session_is_kept(qapp, make_window, tmp_path):
+    deadline = int(time.time()) + 3600.9
+    (tmp_path / "state0.dat").write_bytes(encode_state(
+        {"settings": {}, "jobs": [{"action": "shutdown", "deadline": deadline, "created": time.time()}]}))
+    backend = FakeShutdownBackend()
+    # Scheduled a moment after the job was made, so truncated to the second
+    # below, and reported rounded up to a different second than the job's.
+    backend.pending_deadline, backend.pending_action = deadline - 0.95, "shutdown"
+    window = make_window(backend)
+    wait_for_worker(qapp, window.shutdown_worker)
+    assert window.jobs.peek().deadline == deadline
+    assert backend.calls == []
+
+
+def test_worker_reports_a_raising_backend(qapp):
+    worker = ShutdownWorker(FakeShutdownBackend())
+    results = []
+    worker.finished.connect(lambda kind, context, result: results.append((kind, context, result)))
+    worker.submit("execute", "job", run_action, "reminder")
+    wait_for_worker(qapp, worker)
+    worker.shutdown()
+    [(kind, context, result)] = results
+    assert (kind, context) == ("execute", "job")
+    assert not result.ok
+    assert "reminder" in result.describe()
+
+
+def test_next_job_is_armed_after_the_first_one_fires(qapp, make_window):
+    backend = FakeShutdownBackend()
+    window = make_window(backend)
+    fired = []
+    window.jobs.job_due.connect(fired.append)
+    first = window.schedule_job("shutdown", datetime.now() + timedelta(seconds=1.5))
+    window.schedule_job("restart", datetime.now() + timedelta(minutes=30))
+    wait_for_worker(qapp, window.shutdown_worker)
+    assert kinds(backend.calls) == [("abort",), ("schedule", "shutdown")]
+
+    deadline = time.monotonic() + 5
+    while not fired and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+    wait_for_worker(qapp, window.shutdown_worker)
+    assert fired == [first]
+    # The elapsed countdown is not aborted; the restart is armed on its own.
+    assert kinds(backend.calls[2:]) == [("schedule", "restart")]
+    assert backend.status() is not None
+
+    window.cancel_shutdown()
+    wait_for_worker(qapp, window.shutdown_worker)
+    assert kinds(backend.calls[3:]) == [("abort",)]
+    assert backend.status() is None
+
+    # A later job is armed as usual.
+    window.schedule_job("shutdown", datetime.now() + timedelta(minutes=45))
+    wait_for_worker(qapp, window.shutdown_worker)
+    assert kinds(backend.calls[4:]) == [("abort",), ("schedule", "shutdown")]
@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+
+import pytest
+
+from shutdown_hooks import OK, SKIPPED, TIMED_OUT, Hook, HookPipeline
+
+
+def python_hook(name, code, after=(), timeout=10):
+    return Hook(name, command=[sys.executable, "-c", code], after=after, timeout=timeout)
+
+
+def sleeper(name, seconds, after=(), timeout=10, log=None):
+    code = f"import time; time.sleep({seconds})"
+    if log is not None:
+        code = f"open({str(log)!r}, 'a').write({name!r} + '\\n'); " + code
+    return python_hook(name, code, after, timeout)
+
+
+def by_name(results):
+    return {r.name: r for r in results}
+
+
+def alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+@pytest.mark.skipif(os.name == "nt", reason="process groups are killed with taskkill on Windows")
+def test_overrunning_hook_is_killed_with_its_children(tmp_path):
+    pid_file = tmp_path / "child.pid"
+    code = ("import subprocess, sys, time; "
+            "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']); "
+            f"open({str(pid_file)!r}, 'w').write(str(child.pid)); time.sleep(60)")
+    start = time.monotonic()
+    [result] = HookPipeline([python_hook("stuck", code, timeout=1.0)]).run()
+    assert result.status == TIMED_OUT
+    assert time.monotonic() - start < 10
+    child = int(pid_file.read_text())
+    deadline = time.monotonic() + 5
+    while alive(child) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not alive(child)
+
+
+def test_hooks_start_after_their_dependencies(tmp_path):
+    log = tmp_path / "order.log"
+    pipeline = HookPipeline([
+        sleeper("stop-services", 0.1, after=("flush-cache",), log=log),
+        sleeper("flush-cache", 0.1, after=("notify",), log=log),
+        sleeper("notify", 0.1, log=log),
+        sleeper("backup", 0.5, log=log),
+    ])
+    results = by_name(pipeline.run())
+    assert all(r.status == OK for r in results.values())
+    chain = [line for line in log.read_text().split() if line != "backup"]
+    assert chain == ["notify", "flush-cache", "stop-services"]
+    for name, dep in (("flush-cache", "notify"), ("stop-services", "flush-cache")):
+        assert results[name].started >= results[dep].started + results[dep].elapsed
+    # The independent hook runs alongside the chain instead of after it.
+    assert results["backup"].started < results["notify"].started + results["notify"].elapsed
+
+
+def test_unknown_dependency_and_cycle_are_rejected():
+    with pytest.raises(ValueError, match="unknown"):
+        HookPipeline([sleeper("a", 0, after=("missing",))]).validate()
+    with pytest.raises(ValueError, match="cycle"):
+        HookPipeline([sleeper("a", 0, after=("b",)), sleeper("b", 0, after=("a",))]).validate()
+
+
+def test_hooks_past_the_deadline_are_skipped():
+    pipeline = HookPipeline([
+        sleeper("slow", 30, timeout=30),
+        sleeper("after-slow", 0, after=("slow",)),
+    ])
+    start = time.monotonic()
+    results = by_name(pipeline.run(budget=1.0))
+    assert time.monotonic() - start < 10
+    # The budget cuts the first hook short and leaves no time for the next.
+    assert results["slow"].status == TIMED_OUT
+    assert results["after-slow"].status == SKIPPED
+    assert [r.status for r in HookPipeline([sleeper("late", 0)]).run(budget=0)] == [SKIPPED]
@@ -0,0 +1,100 @@
+"""Forwarding between real processes: the first one owns the instance
+socket and later `python` launches hand their commands to it."""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from shutdown_backend import state_dir
+from single_instance import InstanceServer, instance_paths
+from state_store import StateStore
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+SCRIPT = os.path.join(SRC, "ModernShutdownScheduler.py")
+FORWARD = (
+    "import sys; sys.path.insert(0, sys.argv[1]);"
+    "from single_instance import forward_command;"
+    "print(repr(forward_command('test', sys.argv[2:])))"
+)
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="uses AF_UNIX sockets")
+
+
+@pytest.fixture
+def state_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_STATE_HOME", str(tmp_path))
+    return dict(os.environ, QT_QPA_PLATFORM="offscreen", SHUTDOWN_SCHEDULER_BACKEND="fake")
+
+
+def forward_from_child(env, *argv):
+    proc = subprocess.run([sys.executable, "-c", FORWARD, SRC, *argv], env=env,
+                          capture_output=True, text=True, timeout=30)
+    assert proc.returncode == 0, proc.stderr
+    return eval(proc.stdout)
+
+
+def test_second_process_forwards_to_the_first(state_env):
+    received = []
+
+    def handler(request):
+        received.append(request.argv)
+        request.respond(0, f"ran {' '.join(request.argv)}")
+
+    server = InstanceServer("test", handler)
+    assert server.start()
+    try:
+        assert not InstanceServer("test", handler).start()
+        assert forward_from_child(state_env, "status") == (0, "ran status", "")
+        assert received == [["status"]]
+    finally:
+        server.stop()
+    assert forward_from_child(state_env, "status") is None
+    assert not os.path.exists(instance_paths("test")[2])
+
+
+def run_script(env, *args):
+    return subprocess.run([sys.executable, SCRIPT, *args], env=env, capture_output=True, text=True, timeout=60)
+
+
+def saved_jobs(timeout=10.0):
+    """The window's queue as it last persisted it, once it has."""
+    path = os.path.join(state_dir(), "state-fake.dat")
+    deadline = time.monotonic() + timeout
+    while True:
+        jobs = StateStore(path).state["jobs"] if os.path.exists(path) else []
+        if jobs or time.monotonic() > deadline:
+            return jobs
+        time.sleep(0.05)
+
+
+def test_commands_reach_the_running_window(state_env):
+    window = subprocess.Popen([sys.executable, SCRIPT], env=state_env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        key_path = instance_paths("fake")[2]
+        deadline = time.monotonic() + 30
+        while not os.path.exists(key_path):
+            assert window.poll() is None, "the window exited"
+            assert time.monotonic() < deadline, "the window never claimed the instance"
+            time.sleep(0.05)
+
+        proc = run_script(state_env, "schedule", "--in", "90m", "--action", "restart")
+        assert proc.returncode == 0 and "Initiating system restart" in proc.stdout
+        # Queued by the window, not by the launch that asked for it.
+        assert [job["action"] for job in saved_jobs()] == ["restart"]
+        proc = run_script(state_env, "--status")
+        assert proc.returncode == 0 and proc.stdout.startswith("Restart scheduled at")
+        proc = run_script(state_env, "--cancel")
+        assert proc.returncode == 0 and "canceled" in proc.stdout
+        proc = run_script(state_env, "--status")
+        assert proc.returncode == 1
+
+        # A second window only brings the first one to the front.
+        assert run_script(state_env).returncode == 0
+        assert window.poll() is None
+    finally:
+        window.terminate()
+        window.wait(10)
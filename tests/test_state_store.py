@@ -0,0 +1,77 @@
+import os
+from datetime import datetime
+
+import pytest
+
+import state_store
+from scheduler_engine import SchedulerEngine
+from state_store import StateStore, decode_state, encode_state, restore_jobs
+
+NOW = datetime(2026, 3, 2, 12, 0).timestamp()
+STATE = {"settings": {"time_format": "12"}, "jobs": [{"action": "shutdown", "deadline": NOW + 600, "created": NOW}]}
+
+
+def test_state_round_trips(tmp_path):
+    store = StateStore(str(tmp_path / "state.dat"))
+    store.save(STATE)
+    assert StateStore(store.path).state == STATE
+    assert decode_state(encode_state(STATE)) == STATE
+
+
+@pytest.mark.parametrize("damage", [
+    lambda raw: raw[:len(raw) // 2],
+    lambda raw: raw.split(b"\n", 1)[0],
+    lambda raw: b"MSS1 00000000" + raw[13:],
+    lambda raw: b"MSS1 zzzzzzzz" + raw[13:],
+    lambda raw: raw[:-2] + b"0}",
+    lambda raw: b"",
+])
+def test_damaged_file_is_set_aside(tmp_path, damage):
+    path = tmp_path / "state.dat"
+    path.write_bytes(damage(encode_state(STATE)))
+    store = StateStore(str(path))
+    assert store.state == state_store.empty_state()
+    assert "damaged" in store.take_error()
+    assert not path.exists()
+    assert (tmp_path / "state.dat.corrupt").exists()
+
+
+def test_missing_file_is_empty_without_error(tmp_path):
+    store = StateStore(str(tmp_path / "state.dat"))
+    assert store.state == state_store.empty_state()
+    assert store.take_error() is None
+
+
+def test_failed_write_keeps_the_previous_file(tmp_path, monkeypatch):
+    path = tmp_path / "state.dat"
+    store = StateStore(str(path))
+    store.save(STATE)
+    before = path.read_bytes()
+
+    def fail(fd):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(state_store.os, "fsync", fail)
+    store.save({"settings": {}, "jobs": []})
+    assert "disk full" in store.take_error()
+    assert path.read_bytes() == before
+    assert os.listdir(tmp_path) == ["state.dat"]
+    assert store.write_count == 1
+
+
+def test_restore_drops_expired_jobs_and_keeps_future_ones():
+    engine = SchedulerEngine()
+    records = [
+        {"action": "shutdown", "deadline": NOW - 60, "created": NOW - 3600},
+        {"action": "restart", "deadline": NOW + 3600, "created": NOW - 60, "note": "updates"},
+        {"action": "reminder", "deadline": NOW - 30, "rule": "0 9 * * *"},
+        {"action": "shutdown"},
+        {"action": "nonsense", "deadline": NOW + 60},
+    ]
+    restored, missed = restore_jobs(engine, records, NOW)
+    assert [(a, when.timestamp()) for a, when in missed] == [("shutdown", NOW - 60), ("reminder", NOW - 30)]
+    assert [(job.action, job.note) for job in restored] == [("restart", "updates"), ("reminder", "")]
+    assert restored[0].deadline == NOW + 3600
+    # The recurring job is re-armed for its next occurrence: 09:00 tomorrow.
+    assert datetime.fromtimestamp(restored[1].deadline) == datetime(2026, 3, 3, 9, 0)
+    assert len(engine) == 2
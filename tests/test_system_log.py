@@ -0,0 +1,36 @@
+import re
+
+from system_log import LogRecord, SystemLog, format_record
+
+
+def test_record_is_formatted_with_time_and_level():
+    record = LogRecord(0.0, "WARNING", "Low battery")
+    assert re.fullmatch(r"\d\d:\d\d:\d\d WARNING Low battery", format_record(record))
+
+
+def test_capacity_bounds_records_and_drained_batches():
+    log = SystemLog(capacity=3)
+    for i in range(5):
+        log.append(f"message {i}")
+    assert len(log) == 3
+    assert [r.message for r in log.drain()] == ["message 2", "message 3", "message 4"]
+    assert not log.has_unflushed() and log.drain() == []
+    log.append("late", "ERROR")
+    assert [(r.level, r.message) for r in log.drain()] == [("ERROR", "late")]
+
+
+def test_records_are_written_to_the_log_file(tmp_path):
+    path = tmp_path / "logs" / "scheduler.log"
+    log = SystemLog()
+    log.append("before the file")
+    log.open_file(str(path))
+    log.append("Shutdown scheduled", "INFO")
+    log.append("Backend failed", "ERROR")
+    log.append("Unknown level", "TRACE")
+    log.close_file()
+    log.append("after the file")
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [line.split(" ", 2)[2] for line in lines] == [
+        "INFO    Shutdown scheduled", "ERROR   Backend failed", "INFO    Unknown level",
+    ]
+    assert len(log) == 5